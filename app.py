@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import streamlit as st
 
-from ui.sidebar import sidebar_inputs
+from backtest import prefetch
+from ui.sidebar import DEFAULT_CORR_MONTHS, DEFAULT_MONTHS, sidebar_inputs
 import views.backtest_view as bt_v
 import views.correlation_view as corr_v
 import views.data_preview as dp
@@ -13,6 +14,20 @@ st.set_page_config(page_title="IndicLens", layout="wide")
 st.title("📈 IndicLens — 초보 트레이더용 백테스트 & 상관분석")
 st.caption("Binance 데이터 기반")
 
+
+# 기본 심볼 × 주기 캐시 예열 (프로세스당 1개, 시작 시 + 매 봉 마감 직후)
+def _warm(symbol: str, interval: str):
+    bt_v.prefetch(symbol, interval, DEFAULT_MONTHS)
+    corr_v.prefetch(symbol, interval, DEFAULT_CORR_MONTHS)
+
+
+@st.cache_resource(show_spinner=False)
+def _prefetcher() -> prefetch.Prefetcher | None:
+    return prefetch.Prefetcher(_warm).start() if prefetch.enabled() else None
+
+
+_prefetcher()
+
 # 사이드바 입력
 inputs = sidebar_inputs()
 
@@ -33,6 +48,6 @@ with st.expander("ℹ️ 사용 팁"):
         """
         - **룩어헤드 방지**: 시그널은 다음 캔들 시가에 체결되도록 처리되어 있습니다.
         - **수수료/슬리피지**: 수수료 프리셋 — 테이커 0.04%, 메이커 0.02%. 슬리피지는 % 단위(기본 0.50%, 0.25% 단위)로 입력합니다.
-        - **파생데이터 30일 제한**: 바이낸스 공개 히스토리 API 특성상 최근 30일만 제공합니다.
+        - **파생데이터 30일 제한**: 바이낸스 공개 히스토리 API 특성상 최근 30일만 제공합니다. `python -m backtest.archiver`를 주기적으로 실행하면 로컬 저장소에 누적되어 더 긴 기간도 분석할 수 있습니다.
         """
     )
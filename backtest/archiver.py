@@ -0,0 +1,92 @@
+"""
+파생지표 히스토리 아카이버.
+
+바이낸스 파생 히스토리 API(OI, 탑트레이더 롱/숏, 테이커 비율)는 최근 30일만 제공하므로,
+주기적으로 최신 버킷을 받아 로컬 저장소에 누적해 두면 fetch_*_range가 30일보다 긴
+구간을 저장소에서 바로 돌려줄 수 있음. (저장소는 증분 수집이라 매 회차 꼬리만 요청)
+매 회차 끝에 지난 달 파티션을 압축(store.compact)함.
+
+실행 예:
+    python -m backtest.archiver                            # 1회 수집
+    python -m backtest.archiver --every 3600               # 1시간마다 반복
+    python -m backtest.archiver --symbols BTCUSDT SOLUSDT --intervals 5m 1h
+    python -m backtest.archiver --every 3600 --repair      # 수집 후 저장소 구멍도 재수집
+
+cron 예 (매시 5분):
+    5 * * * * cd /path/to/IndicLens && python -m backtest.archiver
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+
+from . import coverage
+from . import data as d
+from . import store
+
+DEFAULT_SYMBOLS = ("BTCUSDT", "ETHUSDT")
+DEFAULT_INTERVALS = ("15m", "1h", "4h", "1d")
+LOOKBACK = pd.Timedelta(days=29, hours=23)  # API가 제공하는 최대 구간
+
+
+def _jobs(symbol: str, intervals) -> list[tuple[str, object]]:
+    end = pd.Timestamp.now(tz="UTC")
+    start = end - LOOKBACK
+    jobs = [("funding", lambda: d.fetch_funding_rate_range(symbol, start, end))]
+    for iv in intervals:
+        jobs += [
+            (f"open_interest/{iv}", lambda iv=iv: d.fetch_open_interest_range(symbol, iv, start, end)),
+            (f"top_ls_accounts/{iv}", lambda iv=iv: d.fetch_top_traders_long_short_range(symbol, iv, start, end, metric="accounts")),
+            (f"top_ls_positions/{iv}", lambda iv=iv: d.fetch_top_traders_long_short_range(symbol, iv, start, end, metric="positions")),
+            (f"taker_ratio/{iv}", lambda iv=iv: d.fetch_taker_buy_sell_range(symbol, iv, start, end)),
+        ]
+    return jobs
+
+
+def collect_once(symbols=DEFAULT_SYMBOLS, intervals=DEFAULT_INTERVALS) -> list[dict]:
+    """심볼 × 주기별 최신 버킷 수집 → 저장소 누적. 실패한 항목은 기록만 하고 계속 진행."""
+    report = []
+    for sym in symbols:
+        for name, job in _jobs(sym.upper(), intervals):
+            try:
+                df = job()
+                report.append({"symbol": sym.upper(), "series": name, "rows": len(df),
+                               "last": df["time"].max() if not df.empty else None, "error": None})
+            except Exception as e:  # 한 항목 실패가 전체 수집을 멈추지 않도록
+                report.append({"symbol": sym.upper(), "series": name, "rows": 0, "last": None, "error": repr(e)})
+    return report
+
+
+def run(symbols=DEFAULT_SYMBOLS, intervals=DEFAULT_INTERVALS, every_sec: float = 0, repair: bool = False):
+    """every_sec > 0이면 그 간격으로 반복, 아니면 1회 수집. repair면 매 회차 구멍 재수집."""
+    while True:
+        t0 = time.time()
+        for row in collect_once(symbols, intervals):
+            status = row["error"] or f"rows={row['rows']:5d} last={row['last']}"
+            print(f"{row['symbol']:10s} {row['series']:22s} {status}")
+        if repair:
+            for row in coverage.repair_all(symbols=symbols):
+                if row.get("error") or row["holes"]:
+                    print(f"{row['symbol']:10s} {row['series']}/{row['key']:14s} repair {row.get('error') or row}")
+        packed = store.compact()
+        if packed:
+            print(f"compacted {packed} sealed partitions")
+        if every_sec <= 0:
+            return
+        time.sleep(max(0.0, every_sec - (time.time() - t0)))
+
+
+def main(argv: list[str] | None = None):
+    p = argparse.ArgumentParser(description="바이낸스 파생지표 히스토리를 로컬 저장소에 누적")
+    p.add_argument("--symbols", nargs="+", default=list(DEFAULT_SYMBOLS))
+    p.add_argument("--intervals", nargs="+", default=list(DEFAULT_INTERVALS))
+    p.add_argument("--every", type=float, default=0, help="반복 간격(초). 0이면 1회 실행")
+    p.add_argument("--repair", action="store_true", help="수집 후 저장소 구멍 재수집 (backtest.coverage)")
+    args = p.parse_args(argv)
+    run(args.symbols, args.intervals, args.every, args.repair)
+
+
+if __name__ == "__main__":
+    main()
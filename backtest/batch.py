@@ -0,0 +1,125 @@
+"""
+여러 심볼 일괄 수집.
+
+심볼 × 시리즈(캔들/펀딩/OI/탑트레이더 롱숏/테이커) 작업을 스레드 풀로 동시에 돌림.
+속도 제한은 client의 전역 리미터를 모든 작업이 공유하므로 심볼 수와 무관하게 한 예산 안에서 동작.
+한 심볼이 실패(상장폐지 → 400 Invalid symbol 등)해도 나머지 심볼은 계속 수집.
+
+사용 예:
+    res = fetch_many(["BTCUSDT", "ETHUSDT", "SOLUSDT"], "1h", start, end)
+    res.frames["BTCUSDT"]["klines"]       # 심볼 → 시리즈 → 프레임
+    res.stack("open_interest")            # [symbol, time, openInterest]
+    res.to_long()                         # [symbol, kind, time, field, value]
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+import requests
+
+from . import data as d
+from . import resample as rs
+
+# 작업 하나가 내부에서 data.MAX_WORKERS개 창을 동시에 받으므로
+# 동시 연결 수 ≈ MAX_WORKERS × data.MAX_WORKERS (client.POOL_SIZE 이내로 유지)
+MAX_WORKERS = 4
+INVALID_SYMBOL_CODE = -1121   # Binance: {"code": -1121, "msg": "Invalid symbol."}
+
+KINDS = {
+    "klines": lambda sym, iv, s, e: rs.fetch_futures_klines_range(sym, iv, s, e),
+    "funding": lambda sym, iv, s, e: d.fetch_funding_rate_range(sym, s, e),
+    "open_interest": lambda sym, iv, s, e: rs.fetch_open_interest_range(sym, iv, s, e),
+    "top_ls_accounts": lambda sym, iv, s, e: rs.fetch_top_traders_long_short_range(sym, iv, s, e, metric="accounts"),
+    "top_ls_positions": lambda sym, iv, s, e: rs.fetch_top_traders_long_short_range(sym, iv, s, e, metric="positions"),
+    "taker_ratio": lambda sym, iv, s, e: rs.fetch_taker_buy_sell_range(sym, iv, s, e),
+}
+
+
+@dataclass
+class BatchResult:
+    frames: dict[str, dict[str, pd.DataFrame]] = field(default_factory=dict)  # {symbol: {kind: df}}
+    errors: dict[str, dict[str, str]] = field(default_factory=dict)           # {symbol: {kind: 오류}}
+
+    @property
+    def failed(self) -> list[str]:
+        """모든 시리즈가 실패한 심볼."""
+        return [s for s in self.errors if not self.frames.get(s)]
+
+    def stack(self, kind: str) -> pd.DataFrame:
+        """한 시리즈를 심볼 컬럼을 붙여 세로로 쌓음."""
+        parts = [df.assign(symbol=sym) for sym, kinds in self.frames.items()
+                 if (df := kinds.get(kind)) is not None and not df.empty]
+        if not parts:
+            return pd.DataFrame(columns=["symbol", "time"])
+        out = pd.concat(parts, ignore_index=True)
+        return out[["symbol", *[c for c in out.columns if c != "symbol"]]]
+
+    def to_long(self) -> pd.DataFrame:
+        """전체 결과를 [symbol, kind, time, field, value] 롱 포맷으로."""
+        parts = []
+        for kind in KINDS:
+            wide = self.stack(kind)
+            if wide.empty:
+                continue
+            long = wide.melt(id_vars=["symbol", "time"], var_name="field", value_name="value")
+            parts.append(long.assign(kind=kind))
+        if not parts:
+            return pd.DataFrame(columns=["symbol", "kind", "time", "field", "value"])
+        out = pd.concat(parts, ignore_index=True)
+        return out[["symbol", "kind", "time", "field", "value"]]
+
+
+def _is_invalid_symbol(e: BaseException) -> bool:
+    # 400은 파라미터 오류 전반에 쓰이므로 바디의 에러 코드까지 확인
+    resp = getattr(e, "response", None)
+    if not isinstance(e, requests.HTTPError) or resp is None or resp.status_code != 400:
+        return False
+    try:
+        body = resp.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and body.get("code") == INVALID_SYMBOL_CODE
+
+
+def fetch_many(
+    symbols: list[str],
+    interval: str,
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    kinds: list[str] | None = None,
+    max_workers: int = MAX_WORKERS,
+) -> BatchResult:
+    """
+    symbols × kinds 동시 수집. kinds 기본값은 KINDS 전체.
+    - 실패는 res.errors[symbol][kind]에 기록하고 계속 진행
+    - 심볼이 400/-1121(Invalid symbol)을 받으면 그 심볼의 남은 작업은 요청 없이 건너뜀
+    """
+    kinds = list(kinds or KINDS)
+    unknown = [k for k in kinds if k not in KINDS]
+    if unknown:
+        raise ValueError(f"Unsupported kinds: {unknown}")
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+
+    res = BatchResult()
+    invalid: set[str] = set()
+
+    def _one(sym: str, kind: str):
+        if sym in invalid:
+            return sym, kind, None, "skipped: invalid symbol"
+        try:
+            return sym, kind, KINDS[kind](sym, interval, start_utc, end_utc), None
+        except Exception as e:  # 한 심볼 실패가 배치 전체를 멈추지 않도록
+            if _is_invalid_symbol(e):
+                invalid.add(sym)
+            return sym, kind, None, repr(e)
+
+    jobs = [(sym, kind) for sym in symbols for kind in kinds]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs) or 1))) as ex:
+        for sym, kind, df, err in ex.map(lambda j: _one(*j), jobs):
+            if err is None:
+                res.frames.setdefault(sym, {})[kind] = df
+            else:
+                res.errors.setdefault(sym, {})[kind] = err
+    return res
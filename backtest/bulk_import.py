@@ -0,0 +1,171 @@
+"""
+바이낸스 공개 데이터 덤프(data.binance.vision) 오프라인 임포터.
+
+다운로드해 둔 월/일 단위 zip(CSV 1개씩 들어 있음)을 압축 해제 없이 스트리밍으로 읽어
+fetch_futures_klines_range / fetch_funding_rate_range 등과 같은 스키마로 저장소에 기록.
+이후 fetch_*_range는 저장분을 그대로 쓰고 API는 꼬리만 요청함.
+
+지원 파일명:
+    BTCUSDT-15m-2024-01.zip / BTCUSDT-15m-2024-01-01.zip  → klines
+    BTCUSDT-fundingRate-2024-01.zip                       → funding
+    BTCUSDT-metrics-2024-01-01.zip                        → OI / 탑트레이더 L/S / 테이커 비율 (5m)
+
+metrics는 5m로 기록하고, 스냅샷 시리즈(OI, L/S)는 앱이 읽는 기준 주기(15m)로도 내려 기록
+(resample.py와 같이 15m 봉 시작 시각의 값). 테이커 비율은 구간 흐름이라 거래량 없이
+합칠 수 없으므로 5m에만 둠.
+
+실행 예:
+    python -m backtest.bulk_import ~/binance-dumps/futures/um
+    python -m backtest.bulk_import ~/binance-dumps/spot --market spot
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import zipfile
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from . import store
+from .data import FUNDING_KEY, PERIOD_MS
+from .resample import BASE_INTERVAL, resample_snapshot
+
+CHUNK_ROWS = 200_000
+METRICS_PERIOD = "5m"
+SNAPSHOT_SERIES = ("open_interest", "top_ls_accounts", "top_ls_positions")   # 기준 주기로도 내려 기록
+
+_NAME_RE = re.compile(
+    r"^(?P<symbol>[A-Z0-9]+)-(?P<kind>\d+[mhdw]|fundingRate|metrics)-(?P<date>\d{4}-\d{2}(?:-\d{2})?)\.zip$"
+)
+
+# (컬럼 위치, 이름) — 헤더 유무와 무관하게 위치로 읽음
+_KLINE_COLS = [(0, "open_time"), (1, "open"), (2, "high"), (3, "low"), (4, "close"), (5, "volume")]
+_FUNDING_COLS = [(0, "calc_time"), (2, "last_funding_rate")]
+_METRICS_COLS = [(0, "create_time"), (2, "sum_open_interest"), (4, "count_toptrader_long_short_ratio"),
+                 (5, "sum_toptrader_long_short_ratio"), (7, "sum_taker_long_short_vol_ratio")]
+
+
+# ---- 스트리밍 리더 ----------------------------------------------------------
+
+def _has_header(zf: zipfile.ZipFile, member: str) -> bool:
+    with zf.open(member) as fh:
+        first = fh.readline().strip()
+    return bool(first) and not first[:1].isdigit()
+
+
+def _iter_csv(path: Path, cols: list[tuple[int, str]], dtypes: dict) -> Iterator[pd.DataFrame]:
+    """zip 안 CSV를 CHUNK_ROWS씩 읽어 yield (메모리에 전체를 풀지 않음)."""
+    with zipfile.ZipFile(path) as zf:
+        for member in zf.namelist():
+            if not member.endswith(".csv"):
+                continue
+            skip = 1 if _has_header(zf, member) else 0
+            with zf.open(member) as fh, pd.read_csv(
+                fh, header=None, skiprows=skip,
+                usecols=[i for i, _ in cols],
+                dtype={i: dtypes[n] for i, n in cols if n in dtypes},
+                chunksize=CHUNK_ROWS,
+            ) as reader:
+                yield from reader
+
+
+def _epoch_ms(raw: np.ndarray) -> np.ndarray:
+    # 2025년 이후 현물 덤프는 마이크로초 단위 → ms로 맞춤
+    raw = raw.astype(np.int64, copy=False)
+    return np.where(raw > 10**14, raw // 1000, raw)
+
+
+def iter_klines(path: Path) -> Iterator[pd.DataFrame]:
+    """klines zip → [time, open, high, low, close, volume] 청크."""
+    dtypes = {"open_time": np.int64, **{n: np.float64 for _, n in _KLINE_COLS[1:]}}
+    for chunk in _iter_csv(path, _KLINE_COLS, dtypes):
+        chunk.columns = [n for _, n in _KLINE_COLS]
+        out = pd.DataFrame({"time": store.from_ms(_epoch_ms(chunk["open_time"].to_numpy()))})
+        for c in ("open", "high", "low", "close", "volume"):
+            out[c] = chunk[c].to_numpy()
+        yield out
+
+
+def iter_funding(path: Path) -> Iterator[pd.DataFrame]:
+    """fundingRate zip → [time, fundingRate] 청크."""
+    dtypes = {"calc_time": np.int64, "last_funding_rate": np.float64}
+    for chunk in _iter_csv(path, _FUNDING_COLS, dtypes):
+        chunk.columns = [n for _, n in _FUNDING_COLS]
+        yield pd.DataFrame({
+            "time": store.from_ms(_epoch_ms(chunk["calc_time"].to_numpy())),
+            "fundingRate": chunk["last_funding_rate"].to_numpy(),
+        })
+
+
+def iter_metrics(path: Path) -> Iterator[dict[str, pd.DataFrame]]:
+    """metrics zip → {저장소 시리즈: 프레임} 청크 (fetch_*_range와 같은 컬럼명)."""
+    dtypes = {n: np.float64 for _, n in _METRICS_COLS[1:]}
+    for chunk in _iter_csv(path, _METRICS_COLS, dtypes):
+        chunk.columns = [n for _, n in _METRICS_COLS]
+        t = pd.Series(pd.to_datetime(chunk["create_time"], utc=True).to_numpy())
+        yield {
+            "open_interest": pd.DataFrame({"time": t, "openInterest": chunk["sum_open_interest"].to_numpy()}),
+            "top_ls_accounts": pd.DataFrame({"time": t, "longShortRatio": chunk["count_toptrader_long_short_ratio"].to_numpy()}),
+            "top_ls_positions": pd.DataFrame({"time": t, "longShortRatio": chunk["sum_toptrader_long_short_ratio"].to_numpy()}),
+            # metrics에는 테이커 거래량이 없음 → 비율만 기록 (저장된 buyVol/sellVol은 그대로 둠)
+            "taker_ratio": pd.DataFrame({"time": t, "buySellRatio": chunk["sum_taker_long_short_vol_ratio"].to_numpy()}),
+        }
+
+
+# ---- 임포트 -----------------------------------------------------------------
+
+def import_file(path: Path, market: str = "futures") -> dict:
+    """zip 1개를 저장소에 기록. 반환: {file, kind, symbol, rows}"""
+    path = Path(path)
+    m = _NAME_RE.match(path.name)
+    if not m:
+        return {"file": path.name, "kind": None, "symbol": None, "rows": 0}
+    symbol, kind = m.group("symbol"), m.group("kind")
+    rows = 0
+
+    if kind == "fundingRate":
+        for df in iter_funding(path):
+            store.write_frame("funding", symbol, FUNDING_KEY, df)
+            rows += len(df)
+    elif kind == "metrics":
+        for frames in iter_metrics(path):
+            for series, df in frames.items():
+                store.write_frame(series, symbol, METRICS_PERIOD, df)
+                if series in SNAPSHOT_SERIES:
+                    snap, _ = resample_snapshot(df, BASE_INTERVAL, [c for c in df.columns if c != "time"])
+                    store.write_frame(series, symbol, BASE_INTERVAL, snap)
+            rows += len(frames["open_interest"])
+    else:
+        if kind not in PERIOD_MS:
+            return {"file": path.name, "kind": kind, "symbol": symbol, "rows": 0}
+        series = "spot_klines" if market == "spot" else "futures_klines"
+        for df in iter_klines(path):
+            store.write_frame(series, symbol, kind, df)
+            rows += len(df)
+
+    return {"file": path.name, "kind": kind, "symbol": symbol, "rows": rows}
+
+
+def import_dir(root: Path, market: str = "futures") -> list[dict]:
+    """root 아래의 모든 zip을 파일명 순(= 날짜 순)으로 임포트."""
+    return [import_file(p, market) for p in sorted(Path(root).rglob("*.zip"), key=lambda p: p.name)]
+
+
+def main(argv: list[str] | None = None):
+    p = argparse.ArgumentParser(description="바이낸스 공개 데이터 zip을 로컬 저장소로 임포트")
+    p.add_argument("root", type=Path, help="zip 파일이 들어 있는 디렉터리")
+    p.add_argument("--market", choices=["futures", "spot"], default="futures",
+                   help="klines 파일의 시장 구분 (펀딩/metrics는 선물 전용)")
+    args = p.parse_args(argv)
+    total = 0
+    for row in import_dir(args.root, args.market):
+        total += row["rows"]
+        print(f"{row['file']:45s} {str(row['kind']):12s} rows={row['rows']}")
+    print(f"total rows={total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,70 @@
 from __future__ import annotations
-import os
+import json
 import time
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
-CACHE_DIR = Path("data/cache")
+from .store import STORE_DIR, save_column, to_ms
+
+CACHE_DIR = STORE_DIR.parent / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def _cache_path(name: str) -> Path:
-    return CACHE_DIR / f"{name}.csv"
+    return CACHE_DIR / name
+
+
+def write_columns(path: Path, df: pd.DataFrame):
+    """DataFrame을 path 아래 컬럼별 .npy + schema.json으로 기록 (datetime은 epoch-ms)."""
+    path.mkdir(parents=True, exist_ok=True)
+    schema = []
+    for i, c in enumerate(df.columns):
+        s = df[c]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            arr, kind = to_ms(s), "datetime"
+        elif pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            arr, kind = s.to_numpy(), "numeric"
+        else:
+            arr, kind = s.astype(str).to_numpy(dtype=str), "string"
+        save_column(path / f"{i}.npy", arr)
+        schema.append({"name": str(c), "kind": kind})
+    # 스키마를 마지막에 기록 → 스키마 파일 mtime이 곧 캐시 시각
+    meta = {"rows": len(df), "columns": schema}
+    (path / "schema.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+
+def read_columns(path: Path, mmap_mode: str | None = "r") -> pd.DataFrame:
+    """write_columns로 기록한 디렉터리 → DataFrame. mmap_mode가 있으면 컬럼을 복사 없이 매핑."""
+    meta = json.loads((path / "schema.json").read_text(encoding="utf-8"))
+    if isinstance(meta, list):  # 행 수를 기록하기 전 포맷
+        meta = {"rows": None, "columns": meta}
+    if meta["rows"] == 0:
+        mmap_mode = None  # 빈 파일은 mmap 불가
+    cols = {}
+    for i, col in enumerate(meta["columns"]):
+        arr = np.load(path / f"{i}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+        cols[col["name"]] = _utc_view(arr) if col["kind"] == "datetime" else arr
+    return pd.DataFrame(cols, copy=False)
+
+
+def _utc_view(ms: np.ndarray) -> pd.DatetimeIndex:
+    # int64 ms → datetime64[ms, UTC]. 공개 API만 사용 (ns 변환 없이 ms 해상도 유지)
+    return pd.DatetimeIndex(ms.view("M8[ms]")).tz_localize("UTC")
 
 
 def save_cache(df: pd.DataFrame, name: str):
-    """DataFrame을 CSV로 저장"""
-    path = _cache_path(name)
-    df.to_csv(path, index=False)
+    """DataFrame을 컬럼별 .npy로 저장 (datetime은 epoch-ms, dtype 유지)"""
+    write_columns(_cache_path(name), df)
 
 
 def load_cache(name: str, max_age_sec: int | None = None) -> pd.DataFrame | None:
     """
     캐시 로드 (없거나 TTL 초과 시 None 반환)
-    - name: 캐시 파일 이름
+    - name: 캐시 이름
     - max_age_sec: 초 단위 TTL (None이면 무제한)
     """
-    path = _cache_path(name)
+    path = _cache_path(name) / "schema.json"
     if not path.exists():
         return None
 
@@ -34,4 +74,4 @@ def load_cache(name: str, max_age_sec: int | None = None) -> pd.DataFrame | None
         if age > max_age_sec:
             return None
 
-    return pd.read_csv(path, parse_dates=["time"])
+    return read_columns(path.parent, mmap_mode="r")
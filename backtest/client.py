@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 로컬 스탠드인 서버로 돌릴 때 환경변수로 교체 (docs/tech_stack.md 참고)
+BASE_SPOT = os.environ.get("BINANCE_BASE", "https://api.binance.com")
+BASE_FUT = os.environ.get("BINANCE_FUTURES_BASE", "https://fapi.binance.com")
+
+# ---- 공용 세션 (keep-alive 커넥션 풀) ---------------------------------------
+# 모든 페치가 같은 세션을 쓰므로 페이지마다 TCP/TLS 핸드셰이크를 반복하지 않음
+
+POOL_SIZE = 16
+
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+
+
+# ---- 바이낸스 weight 기반 토큰 버킷 ------------------------------------------
+
+class WeightLimiter:
+    """
+    토큰 버킷 (capacity weight / window_sec 초)
+    - acquire(weight): 토큰이 모자라면 채워질 때까지 대기
+    - observe(used): 응답 헤더 X-MBX-USED-WEIGHT-1M(서버 집계)로 로컬 잔량 보정
+    - block(sec): 429/418 응답 시 Retry-After 동안 전체 정지
+    """
+
+    def __init__(self, capacity: int, window_sec: float = 60.0, safety: float = 0.9):
+        self.capacity = float(capacity)
+        self.rate = capacity / window_sec
+        self.safety = safety
+        self.tokens = self.capacity * safety
+        self._t = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity * self.safety, self.tokens + (now - self._t) * self.rate)
+        self._t = now
+
+    def acquire(self, weight: int = 1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= weight:
+                        self.tokens -= weight
+                        return
+                    wait = (weight - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(self, used_weight: int):
+        with self._lock:
+            self._refill(time.monotonic())
+            remaining = self.capacity * self.safety - used_weight
+            self.tokens = min(self.tokens, max(remaining, 0.0))
+
+    def block(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+# 호스트/경로별 한도 (바이낸스 공개 문서 기준)
+#   - fapi: 2400 weight / 1분
+#   - api(현물): 6000 weight / 1분
+#   - /futures/data/*: 1000 요청 / 5분 (weight 헤더 없음)
+LIMITERS = {
+    "fapi": WeightLimiter(2400, 60.0),
+    "spot": WeightLimiter(6000, 60.0),
+    "futures_data": WeightLimiter(1000, 300.0),
+}
+
+
+def _limiter_for(url: str) -> WeightLimiter:
+    parts = urlsplit(url)
+    if parts.path.startswith("/futures/data/"):
+        return LIMITERS["futures_data"]
+    if parts.path.startswith("/api/"):
+        return LIMITERS["spot"]
+    return LIMITERS["fapi"]
+
+
+def kline_weight(limit: int) -> int:
+    """/fapi/v1/klines limit별 weight."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def get_json(url: str, params: dict | None = None, weight: int = 1, timeout: float = 20, retries: int = 3):
+    """
+    공용 세션 + 리미터 경유 GET → JSON.
+    - 429/418: Retry-After(초)만큼 리미터 전체를 멈춘 뒤 재시도
+    - 5xx/연결 오류: 지수 백오프 재시도
+    - 그 외 4xx는 즉시 raise
+    """
+    limiter = _limiter_for(url)
+    for attempt in range(retries + 1):
+        limiter.acquire(weight)
+        try:
+            r = SESSION.get(url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+            continue
+
+        used = r.headers.get("X-MBX-USED-WEIGHT-1M") or r.headers.get("X-MBX-USED-WEIGHT")
+        if used is not None and used.isdigit():
+            limiter.observe(int(used))
+
+        if r.status_code in (418, 429) and attempt < retries:
+            retry_after = r.headers.get("Retry-After")
+            limiter.block(float(retry_after) if retry_after and retry_after.isdigit() else 2.0 ** attempt)
+            continue
+        if r.status_code >= 500 and attempt < retries:
+            time.sleep(0.5 * 2 ** attempt)
+            continue
+
+        r.raise_for_status()
+        return r.json()
+
+
+# INDICLENS_REPLAY가 설정되어 있으면 실제 바이낸스 대신 로컬 스탠드인(backtest/replay.py)으로 응답
+if os.environ.get("INDICLENS_REPLAY"):
+    from .replay import install_from_env
+    install_from_env()
@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 from typing import Iterable
 
+from .store import to_ms
+
 
 def to_log_returns(close: pd.Series, period: int = 1) -> pd.Series:
     """
@@ -12,6 +14,45 @@ def to_log_returns(close: pd.Series, period: int = 1) -> pd.Series:
     return np.log(close / close.shift(period))
 
 
+# ---- int64 epoch-ms 시간 커널 ----
+# 프레임의 time은 datetime64[ms, UTC]라 to_ms가 버퍼 복사 없이 int64로 봄.
+# 병합/탐색은 int64 배열에서 하고, datetime은 화면에 그릴 때만 사용.
+
+def time_ms(times) -> np.ndarray:
+    """time 컬럼(datetime 또는 이미 int64 ms) → 정렬 가정 int64 epoch-ms 배열."""
+    if pd.api.types.is_integer_dtype(getattr(times, "dtype", None)):
+        return np.asarray(times, dtype=np.int64)
+    return to_ms(times)
+
+
+def asof_indices(left_ms: np.ndarray, right_ms: np.ndarray) -> np.ndarray:
+    """left 각 시각에 대해 right에서 그 시각 이하인 마지막 위치 (없으면 -1). merge_asof(backward)와 동일."""
+    return np.searchsorted(right_ms, left_ms, side="right") - 1
+
+
+def asof_values(left_ms: np.ndarray, right_ms: np.ndarray, values) -> np.ndarray:
+    """asof(backward)로 right의 values를 left 시각에 맞춤. 앞선 값이 없으면 NaN."""
+    vals = np.asarray(values, dtype=float)
+    pos = asof_indices(left_ms, right_ms)
+    if not len(vals):
+        return np.full(len(pos), np.nan)
+    out = vals[np.maximum(pos, 0)]
+    out[pos < 0] = np.nan
+    return out
+
+
+def join_indices(left_ms: np.ndarray, right_ms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """정렬·유일한 두 시각 배열의 교집합 위치 (left 위치, right 위치)."""
+    pos = np.searchsorted(left_ms, right_ms, side="left")
+    hit = pos < len(left_ms)
+    hit[hit] = left_ms[pos[hit]] == right_ms[hit]
+    return pos[hit], np.flatnonzero(hit)
+
+
+def _unique(t: np.ndarray) -> bool:
+    return len(t) < 2 or bool((np.diff(t) > 0).all())
+
+
 def align_on_time(
     price_df: pd.DataFrame,
     feature_df: pd.DataFrame,
@@ -20,9 +61,10 @@ def align_on_time(
     how: str = "inner",
 ) -> pd.DataFrame:
     """
-    time 컬럼(KST, tz-aware 가정) 기준으로 두 시계열을 병합.
+    time 컬럼 기준으로 두 시계열을 병합.
     - price_df: columns = [time, open, high, low, close, ...]
     - feature_df: columns = [time, <feature_col>]
+    - inner + 양쪽 time이 정렬/유일하면 int64 교집합으로 병합 (그 외는 pd.merge)
     """
     if feature_col is None:
         # feature_df의 time 제외 첫 번째 수치 컬럼 자동 탐색
@@ -31,6 +73,15 @@ def align_on_time(
             raise ValueError("feature_df에 time 외 수치 컬럼이 없습니다.")
         feature_col = candidates[0]
 
+    pt, ft = time_ms(price_df["time"]), time_ms(feature_df["time"])
+    if how == "inner" and _unique(pt) and _unique(ft):
+        ip, jf = join_indices(pt, ft)
+        return pd.DataFrame({
+            "time": price_df["time"].iloc[ip].reset_index(drop=True),
+            "price": price_df[price_col].to_numpy()[ip],
+            "feature": feature_df[feature_col].to_numpy()[jf],
+        })
+
     p = price_df[["time", price_col]].copy().rename(columns={price_col: "price"})
     f = feature_df[["time", feature_col]].copy().rename(columns={feature_col: "feature"})
 
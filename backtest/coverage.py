@@ -0,0 +1,221 @@
+"""
+저장소 커버리지 인덱스 / 공백 탐지 / 구멍만 재수집.
+
+- 저장된 time을 주기 격자와 비교해 연속 구간(ranges)과 구멍(gaps)을 계산하고
+- meta.json의 "coverage"에 인덱스로 기록 (ranges + 재수집해도 비어 있던 unavailable 구간)
+- repair()는 구멍만 API로 다시 받아 채우고, 그래도 빈 구간은 unavailable로 남겨 반복 요청을 막음
+- data._sync_store도 요청 구간의 빠진 창을 missing()으로 구해 받고, 비어 온 창은 unavailable로 기록
+
+실행 예:
+    python -m backtest.coverage                   # 전체 키 공백 리포트
+    python -m backtest.coverage --repair          # 구멍 재수집
+    python -m backtest.coverage --repair --series futures_klines --symbols BTCUSDT
+"""
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from . import store
+from . import data as d
+
+GAP_TOLERANCE = 0.5   # 간격이 주기 × (1 + 이 값)을 넘으면 구멍 (펀딩 시각의 ms 단위 흔들림 허용)
+
+
+def period_of(series: str, key: str) -> int:
+    return d.FUNDING_PERIOD_MS if series == "funding" else d.PERIOD_MS[key]
+
+
+# ---- 탐지 -------------------------------------------------------------------
+
+def ranges(t: np.ndarray, period_ms: int) -> list[tuple[int, int]]:
+    """정렬된 time → 연속 구간 [(첫 time, 마지막 time), ...]."""
+    if not len(t):
+        return []
+    brk = np.flatnonzero(np.diff(t) > period_ms * (1 + GAP_TOLERANCE))
+    starts = np.r_[0, brk + 1]
+    ends = np.r_[brk, len(t) - 1]
+    return [(int(t[s]), int(t[e])) for s, e in zip(starts, ends)]
+
+
+def _holes(rngs: list[tuple[int, int]], start_ms: int | None, end_ms: int | None,
+           period_ms: int) -> list[tuple[int, int]]:
+    """연속 구간 사이(및 요청 경계 바깥)의 빈 창 [(start_ms, end_ms), ...] — API 요청용 양끝 포함."""
+    out = []
+    if start_ms is not None and rngs and start_ms < rngs[0][0] - period_ms * GAP_TOLERANCE:
+        out.append((start_ms, rngs[0][0] - 1))
+    for (_, a_end), (b_start, _) in zip(rngs, rngs[1:]):
+        out.append((a_end + 1, b_start - 1))
+    if end_ms is not None and rngs and end_ms >= rngs[-1][1] + period_ms * (1 + GAP_TOLERANCE):
+        out.append((rngs[-1][1] + 1, end_ms))
+    if start_ms is not None or end_ms is not None:
+        lo = start_ms if start_ms is not None else -np.inf
+        hi = end_ms if end_ms is not None else np.inf
+        out = [(max(s, lo), min(e, hi)) for s, e in out if e >= lo and s <= hi]
+    return out
+
+
+def _subtract(holes: list[tuple[int, int]], skip: list[list[int]]) -> list[tuple[int, int]]:
+    """holes에서 unavailable 구간을 뺌."""
+    out = []
+    for s, e in holes:
+        pieces = [(s, e)]
+        for us, ue in skip:
+            nxt = []
+            for ps, pe in pieces:
+                if ue < ps or us > pe:
+                    nxt.append((ps, pe))
+                    continue
+                if ps < us:
+                    nxt.append((ps, us - 1))
+                if ue < pe:
+                    nxt.append((ue + 1, pe))
+            pieces = nxt
+        out += pieces
+    return out
+
+
+def scan(series: str, symbol: str, key: str) -> dict:
+    """저장분을 격자와 비교해 coverage 인덱스를 갱신하고 반환."""
+    period = period_of(series, key)
+    with store._lock(series, symbol, key):
+        t = store.read_times(series, symbol, key)
+        rngs = ranges(t, period)
+        cov = store.read_meta(series, symbol, key).get("coverage", {})
+        cov = {"ranges": [list(r) for r in rngs], "unavailable": cov.get("unavailable", []), "rows": int(len(t))}
+        store.write_meta(series, symbol, key, coverage=cov)
+    return cov
+
+
+def gaps(series: str, symbol: str, key: str,
+         start_utc: pd.Timestamp | None = None, end_utc: pd.Timestamp | None = None) -> list[tuple[int, int]]:
+    """재수집이 필요한 구멍 [(start_ms, end_ms)]. unavailable로 기록된 구간은 제외."""
+    cov = scan(series, symbol, key)
+    s_ms = d._ms(start_utc) if start_utc is not None else None
+    e_ms = d._ms(end_utc) if end_utc is not None else None
+    holes = _holes([tuple(r) for r in cov["ranges"]], s_ms, e_ms, period_of(series, key))
+    return _subtract(holes, cov["unavailable"])
+
+
+def missing(series: str, symbol: str, key: str,
+            s_ms: int, e_ms: int, period_ms: int) -> list[tuple[int, int]]:
+    """
+    _sync_store 읽기 경로용: [s_ms, e_ms] 중 저장소에 없는 창 (앞부분, 구멍, 꼬리), unavailable 제외.
+    요청 구간 부근의 time만 읽고 인덱스는 다시 쓰지 않음 (전체 scan은 gaps/repair).
+    꼬리는 마지막 closeTime 이후 전부 (진행 중인 봉도 받도록 허용 오차 없이).
+    """
+    rngs = ranges(store.read_times(series, symbol, key, s_ms - period_ms, e_ms), period_ms)
+    if not rngs:
+        out = [(s_ms, e_ms)]
+    else:
+        out = []
+        if rngs[0][0] >= s_ms + period_ms:
+            out.append((s_ms, rngs[0][0] - 1))
+        out += [(a_end + 1, b_start - 1) for (_, a_end), (b_start, _) in zip(rngs, rngs[1:])]
+        last_close = rngs[-1][1] + period_ms - 1
+        if last_close < e_ms:
+            out.append((last_close + 1, e_ms))
+    skip = store.read_meta(series, symbol, key).get("coverage", {}).get("unavailable", [])
+    return _subtract(out, skip)
+
+
+def still_missing(series: str, symbol: str, key: str,
+                  windows: list[tuple[int, int]], period_ms: int) -> list[tuple[int, int]]:
+    """받아 온 뒤에도 windows 안에 남은 구멍 (주기의 GAP_TOLERANCE배 미만 자투리는 무시)."""
+    out = []
+    for s, e in windows:
+        t = store.read_times(series, symbol, key, s - period_ms, e + period_ms)
+        rngs = ranges(t, period_ms)
+        out += _holes(rngs, s - 1, e + 1, period_ms) if rngs else [(s, e)]
+    return [(s, e) for s, e in out if e - s >= period_ms * GAP_TOLERANCE]
+
+
+def mark_unavailable(series: str, symbol: str, key: str, spans: list[tuple[int, int]]):
+    """다시 받아도 비어 있던 구간을 unavailable에 병합 → 이후 요청/repair에서 건너뜀."""
+    if not spans:
+        return
+    with store._lock(series, symbol, key):
+        cov = store.read_meta(series, symbol, key).get("coverage", {})
+        cov = {**cov, "unavailable": _merge_spans(cov.get("unavailable", []) + [list(r) for r in spans])}
+        store.write_meta(series, symbol, key, coverage=cov)
+
+
+# ---- 재수집 -----------------------------------------------------------------
+
+def repair(series: str, symbol: str, key: str,
+           start_utc: pd.Timestamp | None = None, end_utc: pd.Timestamp | None = None,
+           fetch=None) -> dict:
+    """
+    구멍만 API로 재수집해 저장소에 병합.
+    재수집 후에도 비어 있는 구간(상장 전/거래 중단/API 보존 기간 밖)은 unavailable로 기록.
+    """
+    fetch = fetch or d.api_fetcher(series, symbol, key)
+    holes = gaps(series, symbol, key, start_utc, end_utc)
+    filled = 0
+    for s, e in holes:
+        df = fetch(pd.Timestamp(s, unit="ms", tz="UTC"), pd.Timestamp(e, unit="ms", tz="UTC"))
+        if df is not None and not df.empty:
+            store.write_frame(series, symbol, key, df)
+            filled += len(df)
+
+    cov = scan(series, symbol, key)
+    period = period_of(series, key)
+    remaining = []
+    for s, e in holes:
+        remaining += _holes([tuple(r) for r in cov["ranges"]], s - 1, e + 1, period)
+    remaining = [(s, e) for s, e in remaining if e - s >= period * GAP_TOLERANCE]
+    mark_unavailable(series, symbol, key, remaining)
+    return {"series": series, "symbol": symbol, "key": key,
+            "holes": len(holes), "rows": filled, "unavailable": len(remaining)}
+
+
+def _merge_spans(spans: list[list[int]]) -> list[list[int]]:
+    out: list[list[int]] = []
+    for s, e in sorted(spans):
+        if out and s <= out[-1][1] + 1:
+            out[-1][1] = max(out[-1][1], e)
+        else:
+            out.append([s, e])
+    return out
+
+
+def repair_all(series: str | None = None, symbols=None) -> list[dict]:
+    """저장된 모든 키(또는 series/symbols로 거른 키)의 구멍 재수집. 실패는 기록하고 계속."""
+    wanted = {s.upper() for s in symbols} if symbols else None
+    report = []
+    for ser, sym, key in store.keys(series):
+        if wanted is not None and sym not in wanted:
+            continue
+        try:
+            report.append(repair(ser, sym, key))
+        except Exception as e:  # 한 키 실패가 전체를 멈추지 않도록
+            report.append({"series": ser, "symbol": sym, "key": key, "error": repr(e)})
+    return report
+
+
+def main(argv: list[str] | None = None):
+    p = argparse.ArgumentParser(description="저장소 공백 탐지 / 재수집")
+    p.add_argument("--series")
+    p.add_argument("--symbols", nargs="+")
+    p.add_argument("--repair", action="store_true", help="구멍을 API로 재수집")
+    args = p.parse_args(argv)
+
+    if args.repair:
+        for row in repair_all(args.series, args.symbols):
+            status = row.get("error") or f"holes={row['holes']} rows={row['rows']} unavailable={row['unavailable']}"
+            print(f"{row['series']:18s} {row['symbol']:10s} {row['key']:6s} {status}")
+        return
+    wanted = {s.upper() for s in args.symbols} if args.symbols else None
+    for ser, sym, key in store.keys(args.series):
+        if wanted is not None and sym not in wanted:
+            continue
+        holes = gaps(ser, sym, key)
+        n_ranges = len(store.read_meta(ser, sym, key)["coverage"]["ranges"])
+        missing = sum((e - s + 1) // period_of(ser, key) for s, e in holes)
+        print(f"{ser:18s} {sym:10s} {key:6s} ranges={n_ranges} holes={len(holes)} ~bars={missing}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,45 @@
 from __future__ import annotations
 
 import time
-from typing import List, Dict
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
+import numpy as np
 import pandas as pd
-import requests
 
-BASE_SPOT = "https://api.binance.com"
-BASE_FUT  = "https://fapi.binance.com"
+from . import store
+from .singleflight import Group
+from .client import BASE_SPOT, BASE_FUT, get_json, kline_weight
+
 PERIOD_MS = {
     "5m": 5*60_000, "15m": 15*60_000, "30m": 30*60_000,
     "1h": 60*60_000, "2h": 2*60*60_000, "4h": 4*60*60_000,
     "6h": 6*60*60_000, "12h": 12*60*60_000, "1d": 24*60*60_000,
 }
+FUNDING_PERIOD_MS = 8*60*60_000
+FUNDING_KEY = "events"  # 펀딩은 interval이 없으므로 저장소 키를 고정
+MAX_WORKERS = 4          # 페이지 창 동시 요청 수 (0/1이면 순차)
 
 # ---- 공통 유틸 --------------------------------------------------------------
 
-def _get(url: str, params: dict) -> list[dict]:
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    data = r.json()
+def _get(url: str, params: dict, weight: int = 1) -> list[dict]:
+    data = get_json(url, params, weight=weight)
     # API가 list가 아닌 dict로 줄 수 있는 경우 방어
     if isinstance(data, dict):
         # 히스토리 API는 보통 리스트를 줌. dict가 오면 빈 리스트 취급.
         return data.get("rows", []) if "rows" in data else []
     return data
 
-def _from_ms(ms: int) -> pd.Timestamp:
-    # tz-aware UTC
-    return pd.to_datetime(int(ms), unit="ms", utc=True)
-
 def _dedup_sort(df: pd.DataFrame) -> pd.DataFrame:
     return df.drop_duplicates(subset=["time"]).sort_values("time").reset_index(drop=True)
 
+def _api_window_30d(start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+    """요청 창을 API가 제공하는 '지금 기준 최근 30일'로 자름. 남는 구간이 없으면 None."""
+    s = _clamp_30d(start_utc, pd.Timestamp.now(tz="UTC"))
+    e = _tz_utc(end_utc)
+    return (s, e) if s <= e else None
+
 def _clamp_30d(start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.Timestamp:
     # 바이낸스 공용 히스토리(derivatives) 30일 제한 감안한 안전 클램프
     end_utc = end_utc.tz_convert("UTC") if end_utc.tzinfo else end_utc.tz_localize("UTC")
@@ -45,6 +52,148 @@ def _tz_utc(ts: pd.Timestamp) -> pd.Timestamp:
         return ts.tz_localize("UTC")
     return ts.tz_convert("UTC")
 
+def _run_windows(fn, windows: list, max_workers: int) -> list:
+    """창 목록을 (선택적으로) 병렬 실행하고 결과를 창 순서대로 반환. 속도 제한은 client 리미터가 공유."""
+    if max_workers <= 1 or len(windows) <= 1:
+        return [fn(*w) for w in windows]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as ex:
+        return list(ex.map(lambda w: fn(*w), windows))
+
+def _ms(ts: pd.Timestamp) -> int:
+    return int(_tz_utc(ts).timestamp() * 1000)
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# ---- 응답 파싱 --------------------------------------------------------------
+# 페이지 목록을 미리 할당한 타입 고정 컬럼(time: int64 ms, 값: float64)에 바로 채움.
+# 행 단위 dict/DataFrame을 만들지 않고, 시간 변환도 마지막에 한 번만 벡터로 수행.
+
+def _getter(page: list, key):
+    # 캔들은 list(위치), 파생 히스토리는 dict(이름). 없는 필드는 None → NaN
+    return itemgetter(key) if isinstance(page[0], list) else (lambda r: r.get(key))
+
+def _fill_float(dst: np.ndarray, page: list, key) -> None:
+    get = _getter(page, key)
+    try:
+        dst[:] = np.fromiter((get(r) for r in page), dtype=np.float64, count=len(page))
+    except (TypeError, ValueError):
+        # 빈 문자열 등 숫자가 아닌 값이 섞인 페이지만 느린 경로 (pd.to_numeric coerce와 동일)
+        dst[:] = pd.to_numeric(pd.Series([get(r) for r in page], dtype=object), errors="coerce").to_numpy(np.float64)
+
+def _decode_pages(pages: list[list], time_key, fields: dict[str, object]) -> pd.DataFrame:
+    """
+    페이지(list[list] | list[dict]) → [time, *fields] 프레임.
+    fields: {출력 컬럼명: 응답 필드(위치 또는 이름)}
+    """
+    pages = [p for p in pages if p]
+    n = sum(len(p) for p in pages)
+    t = np.empty(n, dtype=np.int64)
+    cols = {name: np.empty(n, dtype=np.float64) for name in fields}
+    i = 0
+    for page in pages:
+        m = len(page)
+        get = _getter(page, time_key)
+        t[i:i + m] = np.fromiter((get(r) for r in page), dtype=np.int64, count=m)
+        for name, key in fields.items():
+            _fill_float(cols[name][i:i + m], page, key)
+        i += m
+    return _typed_frame(t, cols)
+
+def _typed_frame(t: np.ndarray, cols: dict[str, np.ndarray]) -> pd.DataFrame:
+    """int64 ms + float64 컬럼 → 시간순·time 중복 제거(첫 행 유지) 프레임."""
+    if len(t) > 1 and not (t[1:] > t[:-1]).all():
+        order = np.argsort(t, kind="stable")
+        ts = t[order]
+        keep = np.ones(len(ts), dtype=bool)
+        keep[1:] = ts[1:] != ts[:-1]
+        order = order[keep]
+        t = t[order]
+        cols = {k: v[order] for k, v in cols.items()}
+    return pd.DataFrame({"time": store.from_ms(t), **cols})
+
+
+# ---- 로컬 컬럼 저장소 경유 --------------------------------------------------
+
+# 동시 요청 합치기: 여러 Streamlit 세션이 같은 (엔드포인트, 심볼, 주기, 창)을
+# 동시에 요청하면 한 번만 수집하고 결과를 나눠 가짐
+_FLIGHTS = Group()
+
+def _through_store(
+    series: str,
+    symbol: str,
+    key: str,
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    columns: list[str],
+    period_ms: int,
+    fetch,
+    closed_only: bool = False,
+) -> pd.DataFrame:
+    """
+    _sync_store의 singleflight 래퍼.
+    창은 봉 단위로 내림해 키를 만듦 → 같은 봉 안에서 들어온 요청(now가 몇 초씩 다른)도 합쳐짐.
+    """
+    flight_key = (series, symbol.upper(), key, _ms(start_utc) // period_ms, _ms(end_utc) // period_ms)
+    return _FLIGHTS.do(
+        flight_key,
+        lambda: _sync_store(series, symbol, key, start_utc, end_utc, columns, period_ms, fetch, closed_only),
+    )
+
+def _sync_store(
+    series: str,
+    symbol: str,
+    key: str,
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    columns: list[str],
+    period_ms: int,
+    fetch,
+    closed_only: bool = False,
+) -> pd.DataFrame:
+    """
+    저장소 우선 조회 + 증분 수집.
+    - 요청 구간 안의 저장된 연속 구간을 보고 빠진 창만 fetch(start, end)로 수집 (coverage.missing):
+      앞부분, 저장분 사이 구멍, 마지막 closeTime(= last + period - 1) 이후 꼬리.
+      coverage의 unavailable 구간은 건너뜀
+    - 받아 왔는데도 비어 있는 지난 구간(상장 전/보존 기간 밖 등)은 unavailable로 기록
+    - closed_only: 캔들처럼 마지막 봉이 진행 중일 수 있는 경우, 마감된 봉만 저장
+      (진행 중인 봉은 이번 응답에만 붙이고 다음 갱신 때 다시 받음)
+    """
+    from . import coverage  # coverage가 data를 import → 함수 안에서
+
+    start_utc, end_utc = _tz_utc(start_utc), _tz_utc(end_utc)
+    s_ms, e_ms = _ms(start_utc), _ms(end_utc)
+
+    spans = coverage.missing(series, symbol, key, s_ms, e_ms, period_ms)
+    fetched = [fetch(pd.Timestamp(ws, unit="ms", tz="UTC"), pd.Timestamp(we, unit="ms", tz="UTC"))
+               for ws, we in spans]
+    fetched = [f for f in fetched if f is not None and not f.empty]
+
+    pending: list[pd.DataFrame] = []
+    for f in fetched:
+        if closed_only:
+            closed = store.to_ms(f["time"]) + period_ms <= _now_ms()
+            store.write_frame(series, symbol, key, f[closed])
+            if not closed.all():
+                pending.append(f[~closed])
+        else:
+            store.write_frame(series, symbol, key, f)
+
+    # 최근 봉은 API 반영 지연일 수 있으므로 두 주기 이전까지만 판정
+    cutoff = _now_ms() - 2 * period_ms
+    settled = [(ws, min(we, cutoff)) for ws, we in spans if ws <= cutoff]
+    coverage.mark_unavailable(series, symbol, key, coverage.still_missing(series, symbol, key, settled, period_ms))
+
+    df = store.read_frame(series, symbol, key, start_utc, end_utc, columns=columns)
+    parts = [p for p in [df, *pending] if p is not None and not p.empty]
+    if not parts:
+        return fetched[0] if fetched else pd.DataFrame(columns=["time", *columns])
+    if len(parts) == 1:
+        return parts[0][["time", *columns]].reset_index(drop=True)
+    return _dedup_sort(pd.concat(parts, ignore_index=True)[["time", *columns]])
+
 
 # ---- 현물: KLINES -----------------------------------------------------------
 
@@ -52,6 +201,8 @@ KLINE_COLS = [
     "open_time","open","high","low","close","volume",
     "close_time","qav","num_trades","taker_base","taker_quote","ignore"
 ]
+# 현물/선물 캔들 공통: 출력 컬럼 → 응답 배열 위치
+_KLINE_FIELDS = {c: KLINE_COLS.index(c) for c in ("open", "high", "low", "close", "volume")}
 
 def fetch_klines_range(
     symbol: str,
@@ -59,17 +210,35 @@ def fetch_klines_range(
     start_utc: pd.Timestamp,
     end_utc: pd.Timestamp,
     limit_per_req: int = 1000,
-    sleep_sec: float = 0.06,
+    sleep_sec: float | None = None,
 ) -> pd.DataFrame:
     """
     /api/v3/klines 페이지네이션 (현물)
     tz-aware UTC time 반환: columns [time, open, high, low, close, volume]
+    sleep_sec: 더 이상 쓰지 않음 (요청 간격은 client의 weight 리미터가 조절). 기존 호출 호환용으로만 받음
     """
+    if sleep_sec is not None:
+        warnings.warn("fetch_klines_range(sleep_sec=...)는 무시됩니다 (client 속도 제한 사용)",
+                      DeprecationWarning, stacklevel=2)
+    return _through_store(
+        "spot_klines", symbol, interval, start_utc, end_utc,
+        ["open", "high", "low", "close", "volume"], PERIOD_MS[interval],
+        lambda s, e: _spot_klines_api(symbol, interval, s, e, limit_per_req),
+        closed_only=True,
+    )
+
+def _spot_klines_api(
+    symbol: str,
+    interval: str,
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    limit_per_req: int,
+) -> pd.DataFrame:
     url = f"{BASE_SPOT}/api/v3/klines"
     start_utc = _tz_utc(start_utc)
     end_utc   = _tz_utc(end_utc)
 
-    rows: List[List] = []
+    pages: list[list] = []
     cur = int(start_utc.timestamp() * 1000)
 
     while True:
@@ -80,10 +249,10 @@ def fetch_klines_range(
             "endTime": int(end_utc.timestamp() * 1000),
             "limit": min(limit_per_req, 1000),
         }
-        data = _get(url, params)
+        data = _get(url, params, weight=2)
         if not data:
             break
-        rows.extend(data)
+        pages.append(data)
         last_close = int(data[-1][6])  # close_time
         next_open = last_close + 1
         if next_open <= cur:
@@ -91,17 +260,10 @@ def fetch_klines_range(
         cur = next_open
         if cur > int(end_utc.timestamp() * 1000):
             break
-        time.sleep(sleep_sec)
 
-    if not rows:
+    if not pages:
         return pd.DataFrame(columns=["time","open","high","low","close","volume"])
-
-    df = pd.DataFrame(rows, columns=KLINE_COLS)
-    for c in ["open", "high", "low", "close", "volume"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    df["time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
-    out = df[["time","open","high","low","close","volume"]]
-    return _dedup_sort(out)
+    return _decode_pages(pages, 0, _KLINE_FIELDS)
 
 def fetch_klines_recent_months(symbol: str, interval: str, months: int = 1) -> pd.DataFrame:
     end = pd.Timestamp.now(tz="UTC")
@@ -109,7 +271,9 @@ def fetch_klines_recent_months(symbol: str, interval: str, months: int = 1) -> p
     return fetch_klines_range(symbol, interval, start, end)
 
 
-# ---- 선물 파생지표(최근 30일 제한) ----------------------------------------
+# ---- 선물 파생지표(API는 최근 30일 제한, 저장소는 누적) ---------------------
+# 히스토리 API는 최근 30일만 주지만, 수집한 버킷은 저장소에 쌓이므로
+# (archiver가 주기적으로 꼬리를 채우면) 30일보다 긴 구간도 저장소에서 제공됨.
 
 # period 매핑 (바이낸스 파생 히스토리)
 PERIOD_MAP = {
@@ -131,20 +295,21 @@ def _hist_window_paged(
     start_utc: pd.Timestamp,
     end_utc: pd.Timestamp,
     per_req_limit: int = 500,
-    safety_sleep: float = 0.05,
-) -> list[dict]:
-    """히스토리 API(30일 제한) 안전 수집: 기간창 분할 + limit=500 고정."""
+    max_workers: int = MAX_WORKERS,
+) -> list[list[dict]]:
+    """
+    히스토리 API(30일 제한) 안전 수집: 기간창 분할 + limit=500 고정.
+    창 경계는 미리 정해지므로 max_workers개까지 동시에 요청하고 창 순서대로 페이지 목록으로 반환.
+    """
     start_utc = _tz_utc(start_utc)
     end_utc   = _tz_utc(end_utc)
     start_ms  = int(start_utc.timestamp() * 1000)
     end_ms    = int(end_utc.timestamp() * 1000)
 
     step = PERIOD_MS[period] * per_req_limit  # 500캔들씩 창 자르기
-    rows: list[dict] = []
-    cur = start_ms
+    windows = [(cur, min(cur + step - 1, end_ms)) for cur in range(start_ms, end_ms + 1, step)]
 
-    while cur <= end_ms:
-        wnd_end = min(cur + step - 1, end_ms)
+    def _one(cur: int, wnd_end: int) -> list[dict]:
         params = {
             "symbol": symbol.upper(),
             "period": period,
@@ -152,21 +317,9 @@ def _hist_window_paged(
             "endTime": wnd_end,
             "limit": per_req_limit,
         }
-        try:
-            r = requests.get(url, params=params, timeout=20)
-            if r.status_code == 429:
-                time.sleep(0.2)
-                r = requests.get(url, params=params, timeout=20)
-            r.raise_for_status()
-            data = r.json()
-            if data:
-                rows.extend(data)
-        finally:
-            # 다음 창으로 이동
-            cur = wnd_end + 1
-            if safety_sleep:
-                time.sleep(safety_sleep)
-    return rows
+        return _get(url, params)
+
+    return _run_windows(_one, windows, max_workers)
 
 
 def fetch_open_interest_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
@@ -174,17 +327,19 @@ def fetch_open_interest_range(symbol: str, interval: str, start_utc: pd.Timestam
     period = PERIOD_MAP.get(interval)
     if not period:
         raise ValueError(f"Unsupported interval for OI: {interval}")
-    start_eff = _clamp_30d(start_utc, end_utc)
+    return _through_store(
+        "open_interest", symbol, period, start_utc, end_utc, ["openInterest"], PERIOD_MS[period],
+        lambda s, e: _open_interest_api(url, symbol, period, s, e),
+    )
 
-    rows = _hist_window_paged(url, symbol, period, start_eff, end_utc, per_req_limit=500)
-    if not rows:
+def _open_interest_api(url: str, symbol: str, period: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
+    wnd = _api_window_30d(start_utc, end_utc)
+    pages = _hist_window_paged(url, symbol, period, *wnd, per_req_limit=500) if wnd else []
+    first = next((p[0] for p in pages if p), None)
+    if first is None:
         return pd.DataFrame(columns=["time","openInterest"])
-
-    df = pd.DataFrame(rows)
-    df["time"] = df["timestamp"].apply(lambda x: _from_ms(int(x)))
-    col = "sumOpenInterest" if "sumOpenInterest" in df.columns else "openInterest"
-    df["openInterest"] = pd.to_numeric(df[col], errors="coerce")
-    return _dedup_sort(df[["time","openInterest"]])
+    col = "sumOpenInterest" if "sumOpenInterest" in first else "openInterest"
+    return _decode_pages(pages, "timestamp", {"openInterest": col})
 
 def fetch_top_traders_long_short_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp, metric: str="accounts") -> pd.DataFrame:
     if metric not in ("accounts","positions"):
@@ -194,33 +349,34 @@ def fetch_top_traders_long_short_range(symbol: str, interval: str, start_utc: pd
     period = PERIOD_MAP.get(interval)
     if not period:
         raise ValueError(f"Unsupported interval: {interval}")
-    start_eff = _clamp_30d(start_utc, end_utc)
+    return _through_store(
+        f"top_ls_{metric}", symbol, period, start_utc, end_utc, ["longShortRatio"], PERIOD_MS[period],
+        lambda s, e: _long_short_api(url, symbol, period, s, e),
+    )
 
-    rows = _hist_window_paged(url, symbol, period, start_eff, end_utc, per_req_limit=500)
-    if not rows:
+def _long_short_api(url: str, symbol: str, period: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
+    wnd = _api_window_30d(start_utc, end_utc)
+    pages = _hist_window_paged(url, symbol, period, *wnd, per_req_limit=500) if wnd else []
+    if not any(pages):
         return pd.DataFrame(columns=["time","longShortRatio"])
-
-    df = pd.DataFrame(rows)
-    df["time"] = df["timestamp"].apply(lambda x: _from_ms(int(x)))
-    df["longShortRatio"] = pd.to_numeric(df["longShortRatio"], errors="coerce")
-    return _dedup_sort(df[["time","longShortRatio"]])
+    return _decode_pages(pages, "timestamp", {"longShortRatio": "longShortRatio"})
 
 def fetch_taker_buy_sell_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
     url = f"{BASE_FUT}/futures/data/takerlongshortRatio"
     period = PERIOD_MAP.get(interval)
     if not period:
         raise ValueError(f"Unsupported interval: {interval}")
-    start_eff = _clamp_30d(start_utc, end_utc)
+    return _through_store(
+        "taker_ratio", symbol, period, start_utc, end_utc, ["buyVol", "sellVol", "buySellRatio"], PERIOD_MS[period],
+        lambda s, e: _taker_api(url, symbol, period, s, e),
+    )
 
-    rows = _hist_window_paged(url, symbol, period, start_eff, end_utc, per_req_limit=500)
-    if not rows:
+def _taker_api(url: str, symbol: str, period: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
+    wnd = _api_window_30d(start_utc, end_utc)
+    pages = _hist_window_paged(url, symbol, period, *wnd, per_req_limit=500) if wnd else []
+    if not any(pages):
         return pd.DataFrame(columns=["time","buyVol","sellVol","buySellRatio"])
-
-    df = pd.DataFrame(rows)
-    df["time"] = df["timestamp"].apply(lambda x: _from_ms(int(x)))
-    for c in ("buyVol","sellVol","buySellRatio"):
-        df[c] = pd.to_numeric(df.get(c, pd.NA), errors="coerce")
-    return _dedup_sort(df[["time","buyVol","sellVol","buySellRatio"]])
+    return _decode_pages(pages, "timestamp", {c: c for c in ("buyVol","sellVol","buySellRatio")})
 
 
 
@@ -230,10 +386,16 @@ def fetch_funding_rate_range(symbol: str,
     """
     /futures/data/fundingRate  (8h 단위, 페이징 필요)
     """
+    return _through_store(
+        "funding", symbol, FUNDING_KEY, start_utc, end_utc, ["fundingRate"], FUNDING_PERIOD_MS,
+        lambda s, e: _funding_rate_api(symbol, s, e),
+    )
+
+def _funding_rate_api(symbol: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
     url = f"{BASE_FUT}/fapi/v1/fundingRate"
     s = _tz_utc(start_utc)
     e = _tz_utc(end_utc)
-    rows: list[dict] = []
+    pages: list[list[dict]] = []
 
     while s < e:
         params = {
@@ -242,13 +404,11 @@ def fetch_funding_rate_range(symbol: str,
             "endTime": int(e.timestamp() * 1000),
             "limit": 1000,
         }
-        r = requests.get(url, params=params, timeout=20)
-        r.raise_for_status()
-        data = r.json()
+        data = _get(url, params)
         if not data:
             break
 
-        rows.extend(data)
+        pages.append(data)
 
         # 다음 루프 시작: 마지막 fundingTime + 1ms
         last = int(data[-1]["fundingTime"])
@@ -258,15 +418,9 @@ def fetch_funding_rate_range(symbol: str,
         if len(data) < params["limit"]:
             break
 
-        time.sleep(0.05)  # 안전슬립
-
-    if not rows:
+    if not pages:
         return pd.DataFrame(columns=["time", "fundingRate"])
-
-    df = pd.DataFrame(rows)
-    df["time"] = pd.to_datetime(df["fundingTime"], unit="ms", utc=True)
-    df["fundingRate"] = pd.to_numeric(df["fundingRate"], errors="coerce")
-    return _dedup_sort(df[["time", "fundingRate"]])
+    return _decode_pages(pages, "fundingTime", {"fundingRate": "fundingRate"})
 
 def fetch_futures_klines_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
     """
@@ -274,73 +428,89 @@ def fetch_futures_klines_range(symbol: str, interval: str, start_utc: pd.Timesta
     spot용 fetch_klines_range와 동일한 페이징 방식(마지막 closeTime+1ms)으로 수집.
     반환: time, open, high, low, close, volume
     """
-    import requests
+    return _through_store(
+        "futures_klines", symbol, interval, start_utc, end_utc,
+        ["open", "high", "low", "close", "volume"], PERIOD_MS[interval],
+        lambda s, e: _futures_klines_api(symbol, interval, s, e),
+        closed_only=True,
+    )
+
+def _futures_klines_api(
+    symbol: str,
+    interval: str,
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    max_workers: int = MAX_WORKERS,
+) -> pd.DataFrame:
+    # 1000캔들 단위 창은 interval로 미리 계산 가능 → 창별 병렬 요청 후 순서대로 병합
     symbol = symbol.upper()
-    url = "https://fapi.binance.com/fapi/v1/klines"
-    rows = []
-    s = start_utc
-    while s < end_utc:
+    url = f"{BASE_FUT}/fapi/v1/klines"
+    start_ms, end_ms = _ms(start_utc), _ms(end_utc)
+    step = PERIOD_MS[interval] * 1000
+    windows = [(cur, min(cur + step - 1, end_ms)) for cur in range(start_ms, end_ms, step)]
+
+    def _one(cur: int, wnd_end: int) -> list[list]:
         params = {
             "symbol": symbol,
             "interval": interval,
-            "startTime": int(s.timestamp() * 1000),
-            "endTime": int(end_utc.timestamp() * 1000),
+            "startTime": cur,
+            "endTime": wnd_end,
             "limit": 1000,
         }
-        r = requests.get(url, params=params, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        if not data:
-            break
-        rows.extend(data)
-        # 다음 루프 시작: 마지막 캔들의 closeTime + 1ms
-        last_close_ms = int(data[-1][6])  # closeTime
-        s = pd.Timestamp(last_close_ms, unit="ms", tz="UTC") + pd.Timedelta(milliseconds=1)
-        if len(data) < params["limit"]:
-            break
+        return _get(url, params, weight=kline_weight(params["limit"]))
 
-    if not rows:
+    pages = _run_windows(_one, windows, max_workers)
+    if not any(pages):
         return pd.DataFrame(columns=["time","open","high","low","close","volume"])
-
-    df = pd.DataFrame(
-        rows,
-        columns=[
-            "openTime","open","high","low","close","volume",
-            "closeTime","quoteAssetVolume","numberOfTrades",
-            "takerBuyBase","takerBuyQuote","ignore",
-        ],
-    )
-    df["time"] = pd.to_datetime(df["openTime"], unit="ms", utc=True)
-    for col in ["open","high","low","close","volume"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    df = df.drop_duplicates(subset=["time"]).sort_values("time").reset_index(drop=True)
-    return df[["time","open","high","low","close","volume"]]
+    return _decode_pages(pages, 0, _KLINE_FIELDS)
+
+# ---- 저장소 시리즈 → API 직접 수집 (coverage 재수집용, 저장소를 거치지 않음) ----
+
+def api_fetcher(series: str, symbol: str, key: str):
+    """저장소 키(series, key)에 해당하는 fetch(start_utc, end_utc) → DataFrame."""
+    if series == "futures_klines":
+        return lambda s, e: _futures_klines_api(symbol, key, s, e)
+    if series == "spot_klines":
+        return lambda s, e: _spot_klines_api(symbol, key, s, e, 1000)
+    if series == "funding":
+        return lambda s, e: _funding_rate_api(symbol, s, e)
+    if series == "open_interest":
+        return lambda s, e: _open_interest_api(f"{BASE_FUT}/futures/data/openInterestHist", symbol, key, s, e)
+    if series in ("top_ls_accounts", "top_ls_positions"):
+        path = "topLongShortAccountRatio" if series.endswith("accounts") else "topLongShortPositionRatio"
+        return lambda s, e: _long_short_api(f"{BASE_FUT}/futures/data/{path}", symbol, key, s, e)
+    if series == "taker_ratio":
+        return lambda s, e: _taker_api(f"{BASE_FUT}/futures/data/takerlongshortRatio", symbol, key, s, e)
+    raise ValueError(f"Unknown series: {series}")
 
 # === 현재가 표시 ===
 def fetch_funding_live(symbol: str) -> dict:
     """Premium Index의 최근 펀딩률 (실시간/예상치). raw json 반환."""
     url = f"{BASE_FUT}/fapi/v1/premiumIndex"
-    r = requests.get(url, params={"symbol": symbol.upper()}, timeout=10)
-    r.raise_for_status()
-    return r.json()  # {"lastFundingRate": "0.00010000", "nextFundingTime": ...}
+    return get_json(url, {"symbol": symbol.upper()}, timeout=10)  # {"lastFundingRate": "0.00010000", "nextFundingTime": ...}
 
 def fetch_open_interest_snapshot(symbol: str) -> float:
     """현재 OI 스냅샷. 숫자(float)만 반환."""
     url = f"{BASE_FUT}/fapi/v1/openInterest"
-    r = requests.get(url, params={"symbol": symbol.upper()}, timeout=10)
-    r.raise_for_status()
-    j = r.json()
+    j = get_json(url, {"symbol": symbol.upper()}, timeout=10)
     return float(j["openInterest"])
 
+def fetch_usdm_perpetuals(quote: str = "USDT") -> list[str]:
+    """거래 중인 USDⓂ 무기한 선물 심볼 목록 (/fapi/v1/exchangeInfo)."""
+    url = f"{BASE_FUT}/fapi/v1/exchangeInfo"
+    j = get_json(url, {}, weight=1, timeout=10)
+    return sorted(
+        s["symbol"] for s in j.get("symbols", [])
+        if s.get("contractType") == "PERPETUAL" and s.get("quoteAsset") == quote and s.get("status") == "TRADING"
+    )
+
 def fetch_latest_bucket(endpoint: str, symbol: str, period: str = "5m") -> dict | None:
     """
     endpoint: "topLongShortAccountRatio" | "topLongShortPositionRatio" | "takerlongshortRatio"
     period:   "5m", "15m", "1h", ...
     """
     url = f"{BASE_FUT}/futures/data/{endpoint}"
-    r = requests.get(url, params={"symbol": symbol.upper(), "period": period, "limit": 1}, timeout=10)
-    r.raise_for_status()
-    arr = r.json()
+    arr = get_json(url, {"symbol": symbol.upper(), "period": period, "limit": 1}, timeout=10)
     return arr[-1] if arr else None
 
 def fetch_top_ls_accounts_latest(symbol: str, period: str = "5m") -> float | None:
@@ -0,0 +1,187 @@
+"""
+CSV / XLSX / Parquet 내보내기 (청크 단위 스트리밍 기록).
+
+프레임 전체를 한 번에 문자열/BytesIO로 만들지 않고 CHUNK_ROWS 행씩 파일에 바로 씀:
+- CSV: 청크별 to_csv(append)
+- XLSX: xlsxwriter constant_memory 모드 (행을 쓰는 즉시 디스크로 내보냄, 선택 의존성)
+- Parquet: pyarrow ParquetWriter로 청크마다 row group 추가 (선택 의존성)
+여러 프레임을 CSV/Parquet으로 내보내면 zip 하나에 담음 (XLSX는 시트별).
+
+결과는 <CACHE_DIR>/exports/에 데이터 지문(컬럼 + 내용 해시)을 붙인 파일명으로 남겨,
+데이터가 바뀌기 전까지 같은 내보내기를 다시 만들지 않음.
+
+사용 예:
+    path = export({"price": price_df, "funding": funding_df}, "xlsx", "BTCUSDT_1h")
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import CACHE_DIR
+
+try:  # 선택 의존성
+    import xlsxwriter
+except ImportError:  # pragma: no cover
+    xlsxwriter = None
+
+try:  # 선택 의존성
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = pq = None
+
+EXPORT_DIR = CACHE_DIR / "exports"
+CHUNK_ROWS = 50_000
+
+MIME = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+    "zip": "application/zip",
+}
+
+
+def available_formats() -> list[str]:
+    """설치된 의존성으로 만들 수 있는 형식."""
+    return ["csv"] + (["xlsx"] if xlsxwriter is not None else []) + (["parquet"] if pq is not None else [])
+
+
+def _chunks(df: pd.DataFrame, rows: int = CHUNK_ROWS):
+    for i in range(0, len(df), rows):
+        yield df.iloc[i:i + rows]
+
+
+# ---- 형식별 기록 ------------------------------------------------------------
+
+def write_csv(df: pd.DataFrame, fh):
+    """텍스트 파일 핸들에 청크 단위로 기록."""
+    if df.empty:
+        df.to_csv(fh, index=False)
+        return
+    for i, chunk in enumerate(_chunks(df)):
+        chunk.to_csv(fh, index=False, header=(i == 0))
+
+
+def _excel_rows(chunk: pd.DataFrame):
+    """Excel 셀 값으로 변환: tz-aware datetime → tz-naive(UTC), NaN → 빈 셀."""
+    out = chunk.copy()
+    for c in out.select_dtypes(include=["datetimetz"]).columns:
+        out[c] = out[c].dt.tz_convert("UTC").dt.tz_localize(None)
+    out = out.astype(object).where(out.notna(), None)
+    return out.itertuples(index=False, name=None)
+
+
+def excel_columns(df: pd.DataFrame) -> list[str]:
+    """tz 정보가 빠진 datetime 컬럼은 이름에 (UTC) 표기."""
+    tz_cols = set(df.select_dtypes(include=["datetimetz"]).columns)
+    return [f"{c} (UTC)" if c in tz_cols else str(c) for c in df.columns]
+
+
+def write_xlsx(frames: dict[str, pd.DataFrame], path: Path):
+    if xlsxwriter is None:
+        raise RuntimeError("XLSX 내보내기에는 xlsxwriter 패키지가 필요합니다 (pip install xlsxwriter)")
+    wb = xlsxwriter.Workbook(str(path), {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        "nan_inf_to_errors": True,
+    })
+    try:
+        for name, df in frames.items():
+            ws = wb.add_worksheet(name[:31])
+            ws.write_row(0, 0, excel_columns(df))
+            r = 1
+            for chunk in _chunks(df):
+                for row in _excel_rows(chunk):
+                    ws.write_row(r, 0, row)
+                    r += 1
+    finally:
+        wb.close()
+
+
+def write_parquet(df: pd.DataFrame, path: Path):
+    if pq is None:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다 (pip install pyarrow)")
+    writer = None
+    try:
+        for chunk in _chunks(df):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), table.schema)
+            writer.write_table(table)
+        if writer is None:  # 빈 프레임도 스키마는 남김
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_one(df: pd.DataFrame, fmt: str, path: Path):
+    if fmt == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            write_csv(df, fh)
+    else:
+        write_parquet(df, path)
+
+
+def _write_zip(frames: dict[str, pd.DataFrame], fmt: str, path: Path):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, df in frames.items():
+            member = path.with_name(f".{path.name}.{name}.{fmt}")
+            try:
+                _write_one(df, fmt, member)
+                zf.write(member, arcname=f"{name}.{fmt}")
+            finally:
+                member.unlink(missing_ok=True)
+
+
+# ---- 진입점 -----------------------------------------------------------------
+
+def _fingerprint(frames: dict[str, pd.DataFrame], fmt: str) -> str:
+    # 행 수/마지막 time만 보면 진행 중인 봉의 값이 바뀌어도 지문이 같음 → 내용 전체를 해시
+    h = hashlib.sha1(fmt.encode("utf-8"))
+    for name, df in frames.items():
+        h.update(f"|{name}:{len(df)}:{','.join(map(str, df.columns))}".encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:12]
+
+
+def export(frames: dict[str, pd.DataFrame], fmt: str, stem: str) -> Path:
+    """
+    frames를 fmt(csv/xlsx/parquet)로 기록한 파일 경로.
+    프레임이 여러 개면 xlsx는 시트별, csv/parquet은 zip. 같은 데이터의 기존 파일이 있으면 재사용.
+    """
+    if fmt not in ("csv", "xlsx", "parquet"):
+        raise ValueError(f"Unsupported format: {fmt}")
+    frames = {k: v for k, v in frames.items() if v is not None}
+    ext = fmt if fmt == "xlsx" or len(frames) == 1 else "zip"
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    path = EXPORT_DIR / f"{stem}-{fmt}-{_fingerprint(frames, fmt)}.{ext}"
+    if path.exists():
+        return path
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if fmt == "xlsx":
+            write_xlsx(frames, tmp)
+        elif ext == "zip":
+            _write_zip(frames, fmt, tmp)
+        else:
+            _write_one(next(iter(frames.values())), fmt, tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    _prune(f"{stem}-{fmt}-", keep=path)
+    return path
+
+
+def _prune(prefix: str, keep: Path):
+    """같은 stem/형식의 이전 데이터 버전 파일 정리."""
+    for old in EXPORT_DIR.glob(f"{prefix}*"):
+        if old != keep and old.suffix == keep.suffix and not old.name.startswith("."):
+            old.unlink(missing_ok=True)
@@ -0,0 +1,350 @@
+"""
+증분(스트리밍) 지표 상태 — 새 봉 하나에 O(1)로 갱신.
+
+indicators.py의 배치 함수는 새 봉이 올 때마다 전체 히스토리를 다시 계산함.
+여기 상태 객체는 마지막 상태만 들고 있다가 update(x)로 한 봉씩 이어 계산하며,
+pandas 커널과 같은 연산 순서를 그대로 따라 배치 결과와 비트 단위로 같은 값을 냄:
+- rolling mean: Kahan 보정 누적합 (추가/제거 보정항 분리) + 같은 값 연속 시 그 값 그대로
+- rolling var: Kahan 보정 Welford. 제거 후 제곱편차합이 직전 값의 1000·eps 이하로 무너지면
+  현재 창을 처음부터 다시 누적 (pandas 3.x 동작)
+- ewm(adjust=False): 결측이면 감쇠만 누적, 값이 같으면 갱신 생략
+
+상태는 state() → JSON 직렬화 가능한 dict로 저장하고 restore(dict)로 되살림.
+진행 중인 봉은 peek(x)로 상태를 바꾸지 않고 미리 계산.
+
+사용 예:
+    st = SMAState.from_series(df["close"], 20)     # 히스토리로 한 번 예열
+    st.update(new_close)                           # 이후 봉마다 O(1)
+    saved = st.state(); st = restore(saved)
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .indicators import _ewm_com
+
+NAN = float("nan")
+RECOMPUTE_RATIO = 1000 * np.finfo(np.float64).eps   # rolling var 재누적 기준 (pandas와 동일)
+
+
+# ---------- 커널 ----------
+
+class RollingMean:
+    """s.rolling(window, min_periods).mean()의 한 봉 갱신."""
+
+    def __init__(self, window: int, min_periods: int | None = None):
+        self.window = int(window)
+        self.min_periods = self.window if min_periods is None else int(min_periods)
+        self.buf: deque = deque(maxlen=self.window)
+        self.nobs = self.neg = self.same = 0
+        self.sum = self.comp_add = self.comp_rem = 0.0
+        self.prev = NAN
+
+    def _reset(self, first: float):
+        self.nobs = self.neg = self.same = 0
+        self.sum = self.comp_add = self.comp_rem = 0.0
+        self.prev = first
+
+    def _add(self, v: float):
+        if v != v:
+            return
+        self.nobs += 1
+        y = v - self.comp_add
+        t = self.sum + y
+        self.comp_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, v) < 0:
+            self.neg += 1
+        self.same = self.same + 1 if v == self.prev else 1
+        self.prev = v
+
+    def _remove(self, v: float):
+        if v != v:
+            return
+        self.nobs -= 1
+        y = -v - self.comp_rem
+        t = self.sum + y
+        self.comp_rem = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, v) < 0:
+            self.neg -= 1
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if not self.buf or self.window == 1:   # 첫 창 (창 1이면 창이 겹치지 않아 매번 새로)
+            self._reset(x)
+        elif len(self.buf) == self.window:
+            self._remove(self.buf[0])
+        self.buf.append(x)
+        self._add(x)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if not (self.nobs >= max(self.min_periods, 1) and self.nobs > 0):
+            return NAN
+        if self.same >= self.nobs:
+            return self.prev
+        out = self.sum / self.nobs
+        if self.neg == 0 and out < 0:
+            return 0.0
+        if self.neg == self.nobs and out > 0:
+            return 0.0
+        return out
+
+
+class RollingVar:
+    """s.rolling(window, min_periods).var(ddof)의 한 봉 갱신."""
+
+    def __init__(self, window: int, min_periods: int | None = None, ddof: int = 1):
+        self.window = int(window)
+        self.min_periods = self.window if min_periods is None else int(min_periods)
+        self.ddof = int(ddof)
+        self.buf: deque = deque(maxlen=self.window)
+        self.nobs = 0
+        self.mean = self.ssq = self.comp_add = self.comp_rem = 0.0
+
+    def _reset(self):
+        self.nobs = 0
+        self.mean = self.ssq = self.comp_add = self.comp_rem = 0.0
+
+    def _add(self, v: float):
+        if v != v:
+            return
+        self.nobs += 1
+        prev_mean = self.mean - self.comp_add
+        y = v - self.comp_add
+        t = y - self.mean
+        self.comp_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssq = self.ssq + (v - prev_mean) * (v - self.mean)
+
+    def _remove(self, v: float):
+        if v != v:
+            return
+        self.nobs -= 1
+        if not self.nobs:
+            self.mean = self.ssq = 0.0
+            return
+        prev_mean = self.mean - self.comp_rem
+        y = v - self.comp_rem
+        t = y - self.mean
+        self.comp_rem = t + self.mean - y
+        self.mean = self.mean - t / self.nobs
+        self.ssq = self.ssq - (v - prev_mean) * (v - self.mean)
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if not self.buf or self.window == 1:
+            self._reset()
+        elif len(self.buf) == self.window:
+            before = self.ssq
+            self._remove(self.buf.popleft())
+            if self.ssq <= before * RECOMPUTE_RATIO:   # 상쇄로 무너짐 → 남은 창 재누적
+                self._reset()
+                for v in self.buf:
+                    self._add(v)
+        self.buf.append(x)
+        self._add(x)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.nobs >= max(self.min_periods, 1) and self.nobs > self.ddof:
+            return self.ssq / (self.nobs - self.ddof)
+        return NAN
+
+
+class EWMean:
+    """s.ewm(com, adjust=False, min_periods).mean()의 한 봉 갱신 (ignore_na=False)."""
+
+    def __init__(self, com: float, min_periods: int = 0):
+        self.com = float(com)
+        self.alpha = 1.0 / (1.0 + self.com)
+        self.min_periods = int(min_periods)
+        self.y = NAN
+        self.old = 1.0
+        self.nobs = 0
+        self.started = False
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        obs = x == x
+        self.nobs += obs
+        if not self.started:
+            self.started = True
+            self.y = x
+        elif self.y == self.y:
+            self.old *= 1.0 - self.alpha
+            # pandas: com == 1이면 새 값 가중치가 1 - old_wt (결측 뒤 첫 관측에서 alpha와 달라짐)
+            new = 1.0 - self.old if self.com == 1 else self.alpha
+            if obs:
+                if self.y != x:
+                    self.y = (self.old * self.y + new * x) / (self.old + new)
+                self.old = 1.0
+        elif obs:
+            self.y = x
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.y if self.nobs >= max(self.min_periods, 1) else NAN
+
+
+# ---------- 지표 상태 ----------
+
+def _dump(obj) -> dict:
+    out = {}
+    for k, v in vars(obj).items():
+        if isinstance(v, deque):
+            v = list(v)
+        elif hasattr(v, "__dict__"):
+            v = _dump(v)
+        out[k] = v
+    return out
+
+
+def _load(obj, data: dict):
+    for k, v in data.items():
+        cur = getattr(obj, k)
+        if isinstance(cur, deque):
+            setattr(obj, k, deque(v, maxlen=cur.maxlen))
+        elif hasattr(cur, "__dict__"):
+            _load(cur, v)
+        else:
+            setattr(obj, k, v)
+    return obj
+
+
+class IndicatorState:
+    """공통: update/peek/state/from_series. 하위 클래스는 params와 _step만 정의."""
+    kind = ""
+
+    def __init__(self, **params):
+        self.params = params
+        self.value = NAN   # 마지막 update 결과 (MACD/BB는 dict)
+
+    def update(self, x: float):
+        self.value = self._step(float(x))
+        return self.value
+
+    def peek(self, x: float):
+        """진행 중인 봉 값 x를 넣었을 때의 결과 (상태는 그대로)."""
+        return restore(self.state()).update(x)
+
+    def state(self) -> dict:
+        data = {k: _dump(v) if hasattr(v, "__dict__") else v for k, v in vars(self).items() if k != "params"}
+        return {"kind": self.kind, "params": dict(self.params), "data": data}
+
+    @classmethod
+    def from_series(cls, s: pd.Series, *args, **kwargs):
+        st = cls(*args, **kwargs)
+        for x in s.to_numpy(dtype=np.float64):
+            st.update(x)
+        return st
+
+
+class SMAState(IndicatorState):
+    """sma(s, window)"""
+    kind = "sma"
+
+    def __init__(self, window: int):
+        super().__init__(window=window)
+        self.mean = RollingMean(window)
+
+    def _step(self, x: float) -> float:
+        return self.mean.update(x)
+
+
+class EMAState(IndicatorState):
+    """ema(s, span)"""
+    kind = "ema"
+
+    def __init__(self, span: int):
+        super().__init__(span=span)
+        self.ewm = EWMean(_ewm_com(span=span))
+
+    def _step(self, x: float) -> float:
+        return self.ewm.update(x)
+
+
+class RSIState(IndicatorState):
+    """rsi(s, period) — Wilder 평활 (alpha=1/period, min_periods=period)"""
+    kind = "rsi"
+
+    def __init__(self, period: int = 14):
+        super().__init__(period=period)
+        com = _ewm_com(alpha=1 / period)
+        self.gain = EWMean(com, period)
+        self.loss = EWMean(com, period)
+        self.last = NAN
+
+    def _step(self, x: float) -> float:
+        delta = x - self.last
+        self.last = x
+        g = self.gain.update(delta if delta > 0 else 0.0)
+        l = self.loss.update(-delta if delta < 0 else 0.0)
+        if l == 0:   # numpy 나눗셈 규칙: 0/0 → NaN, 양수/0 → inf → RSI 100
+            rs = NAN if g == 0 or g != g else math.inf
+        else:
+            rs = g / l
+        return 100 - (100 / (1 + rs))
+
+
+class MACDState(IndicatorState):
+    """macd(s, fast, slow, signal) → {"macd", "signal", "hist"}"""
+    kind = "macd"
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__(fast=fast, slow=slow, signal=signal)
+        self.fast = EWMean(_ewm_com(span=fast))
+        self.slow = EWMean(_ewm_com(span=slow))
+        self.signal = EWMean(_ewm_com(span=signal))
+
+    def _step(self, x: float) -> dict:
+        line = self.fast.update(x) - self.slow.update(x)
+        sig = self.signal.update(line)
+        return {"macd": line, "signal": sig, "hist": line - sig}
+
+
+class BBandsState(IndicatorState):
+    """bbands(s, window, k) → {"bb_upper", "bb_mid", "bb_lower"}"""
+    kind = "bbands"
+
+    def __init__(self, window: int = 20, k: float = 2.0):
+        super().__init__(window=window, k=k)
+        self.mean = RollingMean(window)
+        self.var = RollingVar(window, ddof=0)
+
+    def _step(self, x: float) -> dict:
+        mid = self.mean.update(x)
+        var = self.var.update(x)
+        std = 0.0 if var < 0 else math.sqrt(var) if var == var else NAN
+        k = self.params["k"]
+        return {"bb_upper": mid + k * std, "bb_mid": mid, "bb_lower": mid - k * std}
+
+
+STATES: dict[str, type[IndicatorState]] = {c.kind: c for c in (SMAState, EMAState, RSIState, MACDState, BBandsState)}
+
+
+def make(name: str, **params) -> IndicatorState:
+    """지표 이름(indicators.py 함수명)과 파라미터로 빈 상태 생성."""
+    if name not in STATES:
+        raise ValueError(f"Unsupported incremental indicator: {name}")
+    return STATES[name](**params)
+
+
+def restore(saved: dict) -> IndicatorState:
+    """state()로 저장한 dict → 상태 객체."""
+    st = make(saved["kind"], **saved["params"])
+    for k, v in saved["data"].items():
+        cur = getattr(st, k)
+        if hasattr(cur, "__dict__"):
+            _load(cur, v)
+        else:
+            setattr(st, k, v)
+    return st
@@ -73,4 +73,123 @@ def bbands(s: pd.Series, window: int = 20, k: float = 2.0) -> pd.DataFrame:
         'bb_mid': mid,
         'bb_lower': lower,
     })
-    return out
\ No newline at end of file
+    return out
+
+# ---------- 다중 파라미터 커널 ----------
+# 파라미터 스캔용: 창/스팬/기간 목록을 받아 (봉 × 파라미터) 프레임을 한 번의 스윕으로 계산.
+# - SMA/표준편차: 블록별로 국소 평균을 뺀 누적합 한 번 → 창마다 O(n) 차분
+#   (전체 누적합은 가격 수준이 높고 분산이 작으면 상쇄 오차가 커짐 → 누적 길이를 STATS_BLOCK + 최대 창으로 제한)
+#   정확한 2패스 계산 대비 상대 오차 1e-9 이하 (1e8 가격 수준, 봉당 변동 1, 창 5에서 측정).
+#   pandas rolling().std()는 증분 갱신이라 같은 조건에서 오히려 1e-3 가까이 어긋남 → 비교 기준으로 쓰지 말 것
+# - EMA 계열: 공통 입력(형 변환, RSI의 차분/상승/하락)만 한 번 만들고 스팬별 pandas ewm
+#   (adjust=False 재귀는 본질적으로 순차라 파이썬에서 파라미터 축으로 벡터화해도 pandas C 루프보다 느림)
+
+STATS_BLOCK = 512   # 출력 블록 길이 — 블록마다 입력 (STATS_BLOCK + 최대 창 - 1)개를 따로 누적
+
+
+def _ewm_com(span: float | None = None, alpha: float | None = None) -> float:
+    """pandas와 같은 center of mass."""
+    return (span - 1) / 2 if span is not None else (1 - alpha) / alpha
+
+
+def _ewm_alpha(span: float | None = None, alpha: float | None = None) -> float:
+    """pandas와 같은 경로(center of mass 경유)로 alpha 계산 — 1/period와 마지막 비트가 다를 수 있음."""
+    return 1.0 / (1.0 + _ewm_com(span, alpha))
+
+
+def _block_sums(s: pd.Series, wmax: int):
+    """
+    블록별 누적합 (합, 제곱합, 관측 수) + 블록 중심값.
+    블록 k는 출력 봉 [k*B, (k+1)*B)를 맡고, 입력은 그 앞 wmax-1봉까지 포함해 블록 평균을 빼고 누적.
+    반환 배열은 (블록 수, B + wmax) — 열 i는 블록 입력의 앞 i개 합.
+    """
+    x = s.to_numpy(dtype=np.float64)
+    n, B = len(x), STATS_BLOCK
+    nb = -(-n // B)
+    xp = np.concatenate([np.full(wmax - 1, np.nan), x, np.full(nb * B - n, np.nan)])
+    blocks = xp[np.arange(nb)[:, None] * B + np.arange(B + wmax - 1)[None, :]]
+    valid = ~np.isnan(blocks)
+    cnt = valid.sum(axis=1)
+    ref = np.where(cnt > 0, np.where(valid, blocks, 0.0).sum(axis=1) / np.maximum(cnt, 1), 0.0)
+    xc = np.where(valid, blocks - ref[:, None], 0.0)
+    zero = np.zeros((nb, 1))
+    cs = np.concatenate([zero, np.cumsum(xc, axis=1)], axis=1)
+    cs2 = np.concatenate([zero, np.cumsum(xc * xc, axis=1)], axis=1)
+    cn = np.concatenate([zero.astype(np.int64), np.cumsum(valid, axis=1)], axis=1)
+    return ref, cs, cs2, cn
+
+
+def _window_stats(s: pd.Series, windows, want_std: bool):
+    """(창 × 봉) 배열로 평균/표준편차 — 창별 결과를 연속 메모리 행에 채움."""
+    n, B = len(s), STATS_BLOCK
+    mean = np.full((len(windows), n), np.nan)
+    std = np.full((len(windows), n), np.nan) if want_std else None
+    ok = [int(w) for w in windows if 0 < int(w) <= n]
+    if not ok:
+        return mean, std
+    wmax = max(ok)
+    ref, cs, cs2, cn = _block_sums(s, wmax)
+    hi = slice(wmax, wmax + B)   # 출력 봉 k의 창 끝 (블록 입력 기준 k + wmax)
+    for j, w in enumerate(windows):
+        w = int(w)
+        if w <= 0 or w > n:
+            continue
+        lo = slice(wmax - w, wmax - w + B)
+        full = ((cn[:, hi] - cn[:, lo]) == w).ravel()[:n]   # min_periods=window: 창 안에 NaN이 있으면 NaN
+        m = (cs[:, hi] - cs[:, lo]) / w
+        mean[j] = np.where(full, (m + ref[:, None]).ravel()[:n], np.nan)
+        if want_std:
+            var = np.maximum((cs2[:, hi] - cs2[:, lo]) / w - m * m, 0.0)
+            std[j] = np.where(full, np.sqrt(var).ravel()[:n], np.nan)
+    return mean, std
+
+
+def sma_multi(s: pd.Series, windows) -> pd.DataFrame:
+    """여러 창의 SMA (컬럼 = 창). sma(s, w)와 같은 NaN 구간."""
+    mean, _ = _window_stats(s, windows, want_std=False)
+    return pd.DataFrame(mean.T, index=s.index, columns=list(windows))
+
+
+def rolling_std_multi(s: pd.Series, windows) -> pd.DataFrame:
+    """여러 창의 이동 표준편차 (ddof=0, 컬럼 = 창)."""
+    _, std = _window_stats(s, windows, want_std=True)
+    return pd.DataFrame(std.T, index=s.index, columns=list(windows))
+
+
+def bbands_multi(s: pd.Series, windows, k: float = 2.0) -> pd.DataFrame:
+    """
+    여러 창의 볼린저 밴드
+    columns: (bb_upper|bb_mid|bb_lower, window) MultiIndex
+    """
+    mid, std = _window_stats(s, windows, want_std=True)
+    cols = pd.MultiIndex.from_product([["bb_upper", "bb_mid", "bb_lower"], list(windows)])
+    return pd.DataFrame(np.vstack([mid + k * std, mid, mid - k * std]).T, index=s.index, columns=cols)
+
+
+def _ewm_columns(x: pd.Series, key: str, values, min_periods) -> np.ndarray:
+    """ewm(**{key: v}, adjust=False).mean()을 values 전체에 대해 → (봉 × 파라미터). key: "span" | "alpha"."""
+    minp = [int(m) for m in np.broadcast_to(np.asarray(min_periods), len(values))]
+    out = np.empty((len(values), len(x)))
+    for j, (v, m) in enumerate(zip(values, minp)):
+        out[j] = x.ewm(**{key: v}, adjust=False, min_periods=m).mean().to_numpy()
+    return out.T
+
+
+def ema_multi(s: pd.Series, spans) -> pd.DataFrame:
+    """여러 스팬의 EMA (컬럼 = 스팬). ema(s, span)과 비트 단위로 같음."""
+    out = _ewm_columns(s.astype(np.float64), "span", list(spans), 0)
+    return pd.DataFrame(out, index=s.index, columns=list(spans))
+
+
+def rsi_multi(s: pd.Series, periods) -> pd.DataFrame:
+    """여러 기간의 RSI (컬럼 = 기간). rsi(s, period)와 비트 단위로 같음. 차분/상승/하락은 한 번만 계산."""
+    delta = s.diff()
+    gain = pd.Series(np.where(delta > 0, delta, 0.0), index=s.index)
+    loss = pd.Series(np.where(delta < 0, -delta, 0.0), index=s.index)
+    alphas = [1 / p for p in periods]
+    avg_gain = _ewm_columns(gain, "alpha", alphas, list(periods))
+    avg_loss = _ewm_columns(loss, "alpha", alphas, list(periods))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        out = 100 - (100 / (1 + rs))
+    return pd.DataFrame(out, index=s.index, columns=list(periods))
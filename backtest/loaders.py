@@ -0,0 +1,121 @@
+"""
+화면 공용 히스토리 로더 — 최근 months개월 시리즈를 공유 캐시(shm_cache)로 로드.
+
+마감된 봉은 다음 봉 마감까지, 진행 중인 봉은 schedule.OPEN_BAR_TTL_SEC 동안 따로 캐시해 합쳐 돌려줌.
+
+상관 분석/데이터 미리보기 등 여러 화면이 같은 키로 부르므로 views가 아닌 여기 둠
+(화면끼리 서로 import하지 않도록).
+
+사용 예:
+    series = load_series("BTCUSDT", "15m", months=1)   # {"price", "funding", "oi", ...}
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from . import data as d
+from . import resample as rs
+from . import schedule
+from .shm_cache import shared_cache
+
+
+def _month_window(months: int = 1) -> tuple[pd.Timestamp, pd.Timestamp]:
+    end = pd.Timestamp.now(tz="UTC")
+    start = end - pd.DateOffset(months=int(months))
+    return start, end
+
+
+# ---- 마감 히스토리 / 진행 중인 봉 -------------------------------------------
+# 히스토리는 마감된 봉만 담아 다음 봉 마감까지 캐시하고, 진행 중인 봉은 따로 짧게 캐시해
+# 붙임 → 4h/1d도 마감 전까지 히스토리를 다시 받지 않으면서 현재 봉은 계속 갱신됨
+
+_FETCH = {
+    "price": rs.fetch_futures_klines_range,
+    "oi": rs.fetch_open_interest_range,
+    "top_acc": lambda sym, iv, s, e: rs.fetch_top_traders_long_short_range(sym, iv, s, e, metric="accounts"),
+    "top_pos": lambda sym, iv, s, e: rs.fetch_top_traders_long_short_range(sym, iv, s, e, metric="positions"),
+    "taker_ratio": rs.fetch_taker_buy_sell_range,
+}
+
+
+def _open_start(interval: str) -> pd.Timestamp:
+    P = d.PERIOD_MS[interval]
+    return pd.Timestamp(int(time.time() * 1000) // P * P, unit="ms", tz="UTC")
+
+
+@shared_cache(expires=schedule.bar_close("interval"))
+def _history(kind: str, symbol: str, interval: str, months: int) -> pd.DataFrame:
+    start, end = _month_window(months)
+    df = _FETCH[kind](symbol, interval, start, end)
+    return df[df["time"] < _open_start(interval)].reset_index(drop=True)
+
+
+@shared_cache(ttl=schedule.OPEN_BAR_TTL_SEC)
+def _open_bar(kind: str, symbol: str, interval: str, since_ms: int) -> pd.DataFrame:
+    """since_ms(히스토리 다음 봉)부터 지금까지 — 보통 진행 중인 봉 하나."""
+    df = _FETCH[kind](symbol, interval, pd.Timestamp(since_ms, unit="ms", tz="UTC"), pd.Timestamp.now(tz="UTC"))
+    return df[df["time"] >= pd.Timestamp(since_ms, unit="ms", tz="UTC")].reset_index(drop=True)
+
+
+def _with_open_bar(kind: str, symbol: str, interval: str, months: int) -> pd.DataFrame:
+    hist = _history(kind, symbol, interval, months)
+    # 히스토리 끝 다음 봉부터 받음 → 마감 직후 히스토리가 갱신되기 전에도 방금 마감된 봉이 빠지지 않고,
+    # 히스토리가 갱신되면 키가 바뀌어 지난 봉의 미완성 값이 남지 않음
+    if hist.empty:
+        since_ms = int(_open_start(interval).timestamp() * 1000)
+    else:
+        since_ms = int(pd.Timestamp(hist["time"].iloc[-1]).timestamp() * 1000) + d.PERIOD_MS[interval]
+    live = _open_bar(kind, symbol, interval, since_ms)
+    if live.empty:
+        return hist
+    if hist.empty:
+        return live
+    return pd.concat([hist, live], ignore_index=True)
+
+
+# ---- 시리즈별 로더 -----------------------------------------------------------
+
+def load_price_1m(symbol: str, interval: str, months: int = 1) -> pd.DataFrame:
+    return _with_open_bar("price", symbol, interval, months)
+
+
+@shared_cache(expires=schedule.funding_settlement())
+def load_funding(symbol: str, months: int = 1) -> pd.DataFrame:
+    start, end = _month_window(months)
+    return d.fetch_funding_rate_range(symbol, start, end)
+
+
+def load_oi(symbol: str, interval: str, months: int = 1) -> pd.DataFrame:
+    return _with_open_bar("oi", symbol, interval, months)
+
+
+def load_top_ls(symbol: str, interval: str, metric: str, months: int = 1) -> pd.DataFrame:
+    return _with_open_bar("top_acc" if metric == "accounts" else "top_pos", symbol, interval, months)
+
+
+def load_taker_ratio(symbol: str, interval: str, months: int = 1) -> pd.DataFrame:
+    return _with_open_bar("taker_ratio", symbol, interval, months)
+
+
+# ---- 묶음 로드 ----------------------------------------------------------------
+
+def submit_loads(ex: ThreadPoolExecutor, symbol: str, interval: str, months: int) -> dict:
+    """여섯 로더를 ex에 제출 → {future: 시리즈 키}. 도착 순서대로 처리할 때 사용."""
+    return {
+        ex.submit(load_price_1m, symbol, interval, months): "price",
+        ex.submit(load_funding, symbol, months): "funding",
+        ex.submit(load_oi, symbol, interval, months): "oi",
+        ex.submit(load_top_ls, symbol, interval, metric="accounts", months=months): "top_acc",
+        ex.submit(load_top_ls, symbol, interval, metric="positions", months=months): "top_pos",
+        ex.submit(load_taker_ratio, symbol, interval, months): "taker_ratio",
+    }
+
+
+def load_series(symbol: str, interval: str, months: int = 1) -> dict[str, pd.DataFrame]:
+    """여섯 시리즈를 동시에 로드 → {"price", "funding", "oi", "top_acc", "top_pos", "taker_ratio"}."""
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        futures = submit_loads(ex, symbol, interval, months)
+        return {futures[f]: f.result() for f in as_completed(futures)}
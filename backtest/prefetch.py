@@ -0,0 +1,109 @@
+"""
+기본 대시보드 캐시 예열 스케줄러.
+
+배포 직후나 봉 마감으로 캐시가 만료된 직후 첫 사용자가 캔들 + 파생지표 5종 다운로드를
+기다리지 않도록, 백그라운드 스레드가 심볼 × 주기 매트릭스의 로더를 미리 호출:
+- 시작 시 전체 매트릭스 1회
+- 이후 각 주기의 봉 마감 + 반영 여유(schedule.PUBLISH_GRACE_SEC) 시점에 그 주기만 다시
+  (공유 캐시 엔트리가 만료되는 바로 그 시각 → 새 봉이 생긴 뒤 가장 먼저 채움)
+- 실패한 작업은 RETRY_SEC 뒤 재시도
+
+예열 대상 로더는 warm(symbol, interval) 콜백으로 받음 (뷰 모듈의 prefetch 함수).
+로더가 shared_cache이므로 여러 프로세스가 동시에 예열해도 계산은 한 번만 일어남.
+
+설정(환경변수):
+    INDICLENS_PREFETCH=0                      # 끄기
+    INDICLENS_PREFETCH_SYMBOLS=BTCUSDT,ETHUSDT
+    INDICLENS_PREFETCH_INTERVALS=15m,1h,4h,1d
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Iterable
+
+from . import schedule
+from .data import PERIOD_MS
+
+DEFAULT_SYMBOLS = ("BTCUSDT", "ETHUSDT")
+DEFAULT_INTERVALS = ("15m", "1h", "4h", "1d")
+RETRY_SEC = 30
+
+
+def _env_list(name: str, default: tuple[str, ...]) -> list[str]:
+    raw = os.environ.get(name, "")
+    return [s.strip() for s in raw.split(",") if s.strip()] or list(default)
+
+
+def enabled() -> bool:
+    return os.environ.get("INDICLENS_PREFETCH", "1").lower() not in ("0", "false", "off", "no")
+
+
+class Prefetcher:
+    """
+    warm(symbol, interval)을 매트릭스 전체에 대해 주기적으로 호출.
+    - status: {(symbol, interval): {"at": 마지막 성공 epoch 초, "sec": 소요, "error": 마지막 오류}}
+    """
+
+    def __init__(self, warm: Callable[[str, str], None],
+                 symbols: Iterable[str] | None = None, intervals: Iterable[str] | None = None):
+        self.warm = warm
+        self.symbols = [s.upper() for s in (symbols or _env_list("INDICLENS_PREFETCH_SYMBOLS", DEFAULT_SYMBOLS))]
+        self.intervals = [i for i in (intervals or _env_list("INDICLENS_PREFETCH_INTERVALS", DEFAULT_INTERVALS))
+                          if i in PERIOD_MS]
+        self.status: dict[tuple[str, str], dict] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- 수명 --
+    def start(self) -> "Prefetcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="indiclens-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # -- 실행 --
+    def run_once(self, intervals: Iterable[str] | None = None) -> list[tuple[str, str]]:
+        """지정 주기(기본 전체)를 예열. 실패한 (symbol, interval) 목록 반환."""
+        failed = []
+        for interval in intervals or self.intervals:
+            for symbol in self.symbols:
+                if self._stop.is_set():
+                    return failed
+                t0 = time.time()
+                st = self.status.setdefault((symbol, interval), {"at": None, "sec": None, "error": None})
+                try:
+                    self.warm(symbol, interval)
+                except Exception as e:  # 한 조합 실패가 나머지 예열을 막지 않도록
+                    st["error"] = repr(e)
+                    failed.append((symbol, interval))
+                    continue
+                st.update(at=time.time(), sec=round(time.time() - t0, 3), error=None)
+        return failed
+
+    def _due(self, now: float) -> tuple[float, list[str]]:
+        """다음 깨어날 시각과 그때 만료되는 주기들."""
+        grace = schedule.PUBLISH_GRACE_SEC
+        wake = {i: schedule.next_bar_close(i, now - grace) + grace for i in self.intervals}
+        at = min(wake.values())
+        return at, [i for i, w in wake.items() if w == at]
+
+    def _run(self):
+        failed = self.run_once()
+        while not self._stop.is_set():
+            now = time.time()
+            at, due = self._due(now)
+            if failed and now + RETRY_SEC < at:
+                at, due = now + RETRY_SEC, sorted({i for _, i in failed})
+            if self._stop.wait(max(0.0, at - time.time())):
+                return
+            failed = self.run_once(due)
@@ -0,0 +1,495 @@
+"""
+오프라인 재현용 HTTP 계층: 녹화(record) / 재생(stand-in) / 로컬 서버(serve).
+
+- RecordingAdapter: 실제 바이낸스 응답을 fixture 디렉터리에 JSON으로 저장
+- StandInBinance: 녹화본(또는 합성 데이터)을 메모리에 올려 두고 바이낸스처럼 응답
+  (startTime/endTime/limit 페이징, limit 상한, X-MBX-USED-WEIGHT-1M 헤더, 한도 초과 시 429)
+- StandInAdapter: StandInBinance를 requests 트랜스포트로 연결 (네트워크 없이 in-process)
+- serve(): 같은 StandInBinance를 로컬 HTTP 서버로 노출 → 대시보드 end-to-end 벤치마크
+- StandInFeed: 웹소켓 대신 최근 봉/마크가격을 combined-stream 메시지로 재생 (stream.LiveFeed용)
+
+실행 예:
+    python -m backtest.replay record fixtures/ --symbols BTCUSDT --intervals 15m 1h
+    python -m backtest.replay serve --fixtures fixtures/ --port 8765
+    python -m backtest.replay serve --synthetic --port 8765
+    BINANCE_FUTURES_BASE=http://127.0.0.1:8765 BINANCE_BASE=http://127.0.0.1:8765 streamlit run app.py
+
+환경변수 INDICLENS_REPLAY=<fixture 디렉터리 | synthetic> 를 주면 client 임포트 시
+공용 세션에 StandInAdapter가 자동 장착됨 (scripts/smoke_*.py 오프라인 실행용).
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .client import BASE_FUT, BASE_SPOT, SESSION, kline_weight
+
+PERIOD_MS = {
+    "1m": 60_000, "5m": 5*60_000, "15m": 15*60_000, "30m": 30*60_000,
+    "1h": 60*60_000, "2h": 2*60*60_000, "4h": 4*60*60_000,
+    "6h": 6*60*60_000, "12h": 12*60*60_000, "1d": 24*60*60_000,
+}
+ACTIVE: "StandInBinance | None" = None   # install_from_env로 장착된 백엔드 (LiveFeed가 참조)
+
+HIST_ENDPOINTS = ("openInterestHist", "topLongShortAccountRatio", "topLongShortPositionRatio",
+                  "takerlongshortRatio", "globalLongShortAccountRatio")
+
+
+# ---- 녹화 -------------------------------------------------------------------
+
+class RecordingAdapter(HTTPAdapter):
+    """실제 요청을 보내고, JSON 응답을 fixture_dir/<순번>.json 으로 저장."""
+
+    def __init__(self, fixture_dir: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.fixture_dir = Path(fixture_dir)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._n = len(list(self.fixture_dir.glob("*.json")))
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        try:
+            body = resp.json()
+        except ValueError:
+            return resp
+        parts = urlsplit(request.url)
+        rec = {"path": parts.path, "params": dict(parse_qsl(parts.query)),
+               "status": resp.status_code, "body": body}
+        with self._lock:
+            path = self.fixture_dir / f"{self._n:06d}.json"
+            self._n += 1
+        path.write_text(json.dumps(rec), encoding="utf-8")
+        return resp
+
+
+# ---- 스탠드인 백엔드 -------------------------------------------------------
+
+class _Series:
+    """time(ms) → row 정렬 보관. 범위 조회는 bisect."""
+
+    def __init__(self):
+        self.rows: dict[int, object] = {}
+        self._keys: list[int] | None = None
+
+    def add(self, t: int, row):
+        self.rows[int(t)] = row
+        self._keys = None
+
+    def range(self, start: int | None, end: int | None, limit: int) -> list:
+        if self._keys is None:
+            self._keys = sorted(self.rows)
+        keys = self._keys
+        hi = bisect.bisect_right(keys, end) if end is not None else len(keys)
+        if start is None:
+            lo = max(0, hi - limit)
+        else:
+            lo = bisect.bisect_left(keys, start)
+            hi = min(hi, lo + limit)
+        return [self.rows[k] for k in keys[lo:hi]]
+
+
+class StandInBinance:
+    """
+    바이낸스 응답 흉내.
+    - weight_limit: 1분당 weight 한도 (초과 시 429 + Retry-After)
+    - latency: 요청마다 추가할 지연(초) — 실제 RTT 흉내
+    - hist_days: /futures/data/* 가 제공하는 최근 일수 (바이낸스는 30일)
+    """
+
+    def __init__(self, weight_limit: int = 2400, latency: float = 0.0, hist_days: int = 30):
+        self.weight_limit = weight_limit
+        self.latency = latency
+        self.hist_days = hist_days
+        self.series: dict[tuple, _Series] = {}
+        self.snapshots: dict[tuple, object] = {}
+        self._synthetic: _SyntheticMarket | None = None
+        self._lock = threading.Lock()
+        self._minute = 0
+        self._used = 0
+        self.requests = 0
+
+    # -- 적재 --
+    def _series(self, *key) -> _Series:
+        if key not in self.series:
+            self.series[key] = _Series()
+        return self.series[key]
+
+    def ingest(self, path: str, params: dict, body):
+        """녹화된 (path, params, body) 한 건을 데이터셋에 병합."""
+        sym = str(params.get("symbol", "")).upper()
+        name = path.rsplit("/", 1)[-1]
+        if name == "klines" and isinstance(body, list):
+            s = self._series(path, sym, params.get("interval"))
+            for row in body:
+                s.add(row[0], row)
+        elif name in HIST_ENDPOINTS and isinstance(body, list):
+            s = self._series(path, sym, params.get("period"))
+            for row in body:
+                s.add(row["timestamp"], row)
+        elif name == "fundingRate" and isinstance(body, list):
+            s = self._series(path, sym, None)
+            for row in body:
+                s.add(row["fundingTime"], row)
+        elif name in ("premiumIndex", "openInterest"):
+            self.snapshots[(path, sym)] = body
+
+    @classmethod
+    def from_fixtures(cls, fixture_dir: Path, **kwargs) -> "StandInBinance":
+        self = cls(**kwargs)
+        for p in sorted(Path(fixture_dir).glob("*.json")):
+            rec = json.loads(p.read_text(encoding="utf-8"))
+            if rec.get("status") == 200:
+                self.ingest(rec["path"], rec["params"], rec["body"])
+        return self
+
+    @classmethod
+    def synthetic(cls, symbols=("BTCUSDT", "ETHUSDT"), days: int = 400, seed: int = 7, **kwargs) -> "StandInBinance":
+        """랜덤워크 기반 합성 데이터셋 (녹화본 없이 벤치마크할 때). 시리즈는 첫 요청 때 생성."""
+        self = cls(**kwargs)
+        self._synthetic = _SyntheticMarket(symbols, days, seed)
+        for sym in self._synthetic.symbols:
+            self.snapshots.update(self._synthetic.snapshots(sym))
+        return self
+
+    def symbols(self) -> list[str]:
+        if self._synthetic is not None:
+            return list(self._synthetic.symbols)
+        return sorted({key[1] for key in self.series} | {key[1] for key in self.snapshots})
+
+    # -- 응답 --
+    def _charge(self, weight: int) -> tuple[bool, dict]:
+        with self._lock:
+            now = time.time()
+            minute = int(now // 60)
+            if minute != self._minute:
+                self._minute, self._used = minute, 0
+            self.requests += 1
+            if self._used + weight > self.weight_limit:
+                retry = max(1, int(60 - now % 60))
+                return False, {"X-MBX-USED-WEIGHT-1M": str(self._used), "Retry-After": str(retry)}
+            self._used += weight
+            return True, {"X-MBX-USED-WEIGHT-1M": str(self._used)}
+
+    def handle(self, path: str, params: dict) -> tuple[int, dict, object]:
+        """(status, headers, json body)"""
+        if self.latency:
+            time.sleep(self.latency)
+        name = path.rsplit("/", 1)[-1]
+        sym = str(params.get("symbol", "")).upper()
+        start = int(params["startTime"]) if "startTime" in params else None
+        end = int(params["endTime"]) if "endTime" in params else None
+
+        if name == "klines":
+            max_limit = 1500 if path.startswith("/fapi/") else 1000
+            limit = min(int(params.get("limit", 500)), max_limit)
+            weight = kline_weight(limit)
+        elif name in HIST_ENDPOINTS:
+            limit, weight = min(int(params.get("limit", 30)), 500), 1
+        elif name == "fundingRate":
+            limit, weight = min(int(params.get("limit", 100)), 1000), 1
+        else:
+            limit, weight = 1, 1
+
+        ok, headers = self._charge(weight)
+        if not ok:
+            return 429, headers, {"code": -1003, "msg": "Too many requests; stand-in weight limit exceeded."}
+
+        if name == "exchangeInfo":
+            return 200, headers, {"symbols": [
+                {"symbol": s, "contractType": "PERPETUAL", "quoteAsset": "USDT", "status": "TRADING"}
+                for s in self.symbols()
+            ]}
+        if sym and self._synthetic is not None and sym not in self._synthetic.symbols:
+            return 400, headers, {"code": -1121, "msg": "Invalid symbol."}
+
+        if name in ("premiumIndex", "openInterest"):
+            body = self.snapshots.get((path, sym))
+            return (200, headers, body) if body is not None else (400, headers, {"code": -1121, "msg": "Invalid symbol."})
+
+        key = (path, sym, params.get("interval") if name == "klines" else params.get("period"))
+        if name == "fundingRate":
+            key = (path, sym, None)
+        series = self.series.get(key)
+        if series is None and self._synthetic is not None:
+            series = self._synthetic.series(*key)
+            with self._lock:
+                self.series.setdefault(key, series)
+        if series is None:
+            return 200, headers, []
+        if name in HIST_ENDPOINTS and self.hist_days:
+            floor = int(time.time() * 1000) - self.hist_days * 86_400_000
+            start = max(start, floor) if start is not None else None
+            if end is not None and end < floor:
+                return 200, headers, []
+        return 200, headers, series.range(start, end, limit)
+
+
+class _SyntheticMarket:
+    """심볼별 5m 랜덤워크(가격/거래량/OI/롱숏/테이커)를 한 번 만들고, 주기별 시리즈는 집계해서 생성."""
+
+    def __init__(self, symbols, days: int, seed: int):
+        self.symbols = [s.upper() for s in symbols]
+        base = PERIOD_MS["5m"]
+        end = int(time.time() * 1000) // base * base
+        self.t = np.arange(end - days * 86_400_000, end + 1, base, dtype=np.int64)
+        n = len(self.t)
+        self.arrays = {}
+        for i, sym in enumerate(self.symbols):
+            rng = np.random.default_rng(seed + i)
+            self.arrays[sym] = {
+                "px": 30_000.0 * np.exp(np.cumsum(rng.normal(0, 0.002, n))),
+                "vol": rng.gamma(2.0, 50.0, n),
+                "oi": 80_000.0 * np.exp(np.cumsum(rng.normal(0, 0.001, n))),
+                "ls": np.clip(1.0 + np.cumsum(rng.normal(0, 0.005, n)), 0.3, 3.0),
+                "buy": rng.gamma(2.0, 100.0, n),
+                "sell": rng.gamma(2.0, 100.0, n),
+                "funding": rng.normal(0.0001, 0.00005, n),
+            }
+
+    def snapshots(self, sym: str) -> dict:
+        a, t = self.arrays[sym], int(self.t[-1])
+        nxt = (t // (8 * 3_600_000) + 1) * 8 * 3_600_000
+        return {
+            ("/fapi/v1/premiumIndex", sym): {"symbol": sym, "markPrice": f"{a['px'][-1]:.2f}",
+                                             "lastFundingRate": f"{a['funding'][-1]:.8f}",
+                                             "nextFundingTime": nxt, "time": t},
+            ("/fapi/v1/openInterest", sym): {"symbol": sym, "openInterest": f"{a['oi'][-1]:.3f}", "time": t},
+        }
+
+    def series(self, path: str, sym: str, iv: str | None) -> _Series | None:
+        if sym not in self.arrays:
+            return None
+        a, out = self.arrays[sym], _Series()
+        name = path.rsplit("/", 1)[-1]
+        if name == "fundingRate":
+            idx = np.flatnonzero(self.t % (8 * 3_600_000) == 0)
+            for t, r in zip(self.t[idx].tolist(), a["funding"][idx].tolist()):
+                out.add(t, {"symbol": sym, "fundingTime": t, "fundingRate": f"{r:.8f}"})
+            return out
+        if iv not in PERIOD_MS or PERIOD_MS[iv] < PERIOD_MS["5m"]:
+            return None
+
+        p = PERIOD_MS[iv]
+        g = self.t // p * p
+        starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+        bt = g[starts].tolist()
+        if name == "klines":
+            px = a["px"]
+            opens = np.r_[px[0], px[:-1]][starts]
+            highs = np.maximum(np.maximum.reduceat(px, starts), opens)
+            lows = np.minimum(np.minimum.reduceat(px, starts), opens)
+            cols = zip(bt, opens, highs, lows,
+                       px[np.r_[starts[1:], len(px)] - 1], np.add.reduceat(a["vol"], starts), np.diff(np.r_[starts, len(px)]))
+            for t, o, h, l, c, v, n in cols:
+                out.add(t, [t, f"{o:.2f}", f"{h:.2f}", f"{l:.2f}", f"{c:.2f}", f"{v:.3f}",
+                            t + p - 1, "0", int(n), "0", "0", "0"])
+        elif name == "openInterestHist":
+            for t, v in zip(bt, a["oi"][starts].tolist()):
+                out.add(t, {"symbol": sym, "sumOpenInterest": f"{v:.3f}", "timestamp": t})
+        elif name in ("topLongShortAccountRatio", "topLongShortPositionRatio", "globalLongShortAccountRatio"):
+            scale = 0.9 if name == "topLongShortPositionRatio" else 1.0
+            for t, v in zip(bt, (a["ls"][starts] * scale).tolist()):
+                out.add(t, {"symbol": sym, "longShortRatio": f"{v:.4f}", "timestamp": t})
+        elif name == "takerlongshortRatio":
+            buy, sell = np.add.reduceat(a["buy"], starts), np.add.reduceat(a["sell"], starts)
+            for t, b, s in zip(bt, buy.tolist(), sell.tolist()):
+                out.add(t, {"buyVol": f"{b:.3f}", "sellVol": f"{s:.3f}", "buySellRatio": f"{b / s:.4f}", "timestamp": t})
+        else:
+            return None
+        return out
+
+
+# ---- 트랜스포트 / 서버 ------------------------------------------------------
+
+class StandInAdapter(BaseAdapter):
+    """requests 트랜스포트 어댑터: 소켓 없이 StandInBinance.handle로 응답."""
+
+    def __init__(self, backend: StandInBinance):
+        super().__init__()
+        self.backend = backend
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        status, headers, body = self.backend.handle(parts.path, dict(parse_qsl(parts.query)))
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers = CaseInsensitiveDict({"Content-Type": "application/json", **headers})
+        resp._content = json.dumps(body).encode("utf-8")
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+def install(adapter: BaseAdapter, session: requests.Session = SESSION):
+    """공용 세션의 바이낸스 URL 접두어에 어댑터 장착."""
+    for base in {BASE_FUT, BASE_SPOT}:
+        session.mount(base, adapter)
+
+
+def install_from_env():
+    """INDICLENS_REPLAY=<fixture dir | synthetic> 이면 StandInAdapter 장착."""
+    src = os.environ.get("INDICLENS_REPLAY")
+    if not src:
+        return None
+    global ACTIVE
+    backend = StandInBinance.synthetic() if src == "synthetic" else StandInBinance.from_fixtures(Path(src))
+    install(StandInAdapter(backend))
+    ACTIVE = backend
+    return backend
+
+
+class StandInFeed:
+    """
+    LiveFeed용 로컬 스트림: connect(url, stop) → combined-stream 메시지 이터레이터.
+    url의 streams(<sym>@kline_<iv>, <sym>@markPrice@1s)에 맞춰 스탠드인의 최근 bars개 봉을
+    진행 중(x=false) → 마감(x=true) 순서로, 사이사이 마크가격 이벤트와 함께 재생.
+    delay: 메시지 간 지연(초). 재생이 끝나면 연결 종료처럼 반환 → LiveFeed가 재접속.
+    """
+
+    def __init__(self, backend: StandInBinance, bars: int = 50, delay: float = 0.0):
+        self.backend = backend
+        self.bars = bars
+        self.delay = delay
+
+    def __call__(self, url: str, stop: threading.Event | None = None):
+        streams = dict(parse_qsl(urlsplit(url).query)).get("streams", "").split("/")
+        now = int(time.time() * 1000)
+        for name in streams:
+            sym, _, kind = name.partition("@")
+            sym = sym.upper()
+            if not kind.startswith("kline_"):
+                continue
+            iv = kind[len("kline_"):]
+            _, _, rows = self.backend.handle("/fapi/v1/klines", {"symbol": sym, "interval": iv, "limit": self.bars})
+            for row in rows if isinstance(rows, list) else []:
+                if stop is not None and stop.is_set():
+                    return
+                closed = int(row[6]) < now
+                yield self._kline(name, sym, iv, row, closed=False)
+                if closed:
+                    yield self._kline(name, sym, iv, row, closed=True)
+                yield self._mark(sym, int(row[6]) if closed else now)
+                if self.delay:
+                    time.sleep(self.delay)
+
+    @staticmethod
+    def _kline(stream: str, sym: str, iv: str, row: list, closed: bool) -> str:
+        k = {"t": row[0], "T": row[6], "s": sym, "i": iv, "o": row[1], "h": row[2], "l": row[3],
+             "c": row[4], "v": row[5], "x": closed}
+        return json.dumps({"stream": stream, "data": {"e": "kline", "E": row[6], "s": sym, "k": k}})
+
+    def _mark(self, sym: str, t: int) -> str:
+        _, _, p = self.backend.handle("/fapi/v1/premiumIndex", {"symbol": sym})
+        p = p if isinstance(p, dict) and "markPrice" in p else {}
+        data = {"e": "markPriceUpdate", "E": t, "s": sym, "p": p.get("markPrice", "nan"),
+                "i": p.get("markPrice", "nan"), "r": p.get("lastFundingRate", "nan"),
+                "T": p.get("nextFundingTime", 0)}
+        return json.dumps({"stream": f"{sym.lower()}@markPrice@1s", "data": data})
+
+
+def serve(backend: StandInBinance, host: str = "127.0.0.1", port: int = 8765):
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            status, headers, body = backend.handle(parts.path, dict(parse_qsl(parts.query)))
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    print(f"stand-in Binance on http://{host}:{port}")
+    httpd.serve_forever()
+
+
+def record(fixture_dir: Path, symbols=("BTCUSDT",), intervals=("1h",), months: int = 1):
+    """data.py의 모든 엔드포인트를 한 번씩 호출하며 응답을 녹화 (저장소는 임시 디렉터리 사용)."""
+    import pandas as pd
+    from . import data as d, store
+
+    end = pd.Timestamp.now(tz="UTC")
+    start = end - pd.DateOffset(months=int(months))
+    # 끝나면(예외 포함) 원래 저장소 경로와 세션 어댑터로 되돌림
+    prev_adapters = {base: SESSION.adapters.get(base) for base in {BASE_FUT, BASE_SPOT}}
+    prev_store = store.STORE_DIR
+    install(RecordingAdapter(fixture_dir))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store.STORE_DIR = Path(tmp)  # 저장소 히트로 API 호출이 생략되지 않도록
+            for sym in symbols:
+                d.fetch_funding_rate_range(sym, start, end)
+                d.fetch_funding_live(sym)
+                d.fetch_open_interest_snapshot(sym)
+                for iv in intervals:
+                    d.fetch_futures_klines_range(sym, iv, start, end)
+                    d.fetch_klines_range(sym, iv, start, end)
+                    d.fetch_open_interest_range(sym, iv, start, end)
+                    d.fetch_top_traders_long_short_range(sym, iv, start, end, metric="accounts")
+                    d.fetch_top_traders_long_short_range(sym, iv, start, end, metric="positions")
+                    d.fetch_taker_buy_sell_range(sym, iv, start, end)
+                for ep in ("topLongShortAccountRatio", "topLongShortPositionRatio", "takerlongshortRatio"):
+                    d.fetch_latest_bucket(ep, sym)
+    finally:
+        store.STORE_DIR = prev_store
+        for base, adapter in prev_adapters.items():
+            if adapter is None:
+                SESSION.adapters.pop(base, None)
+            else:
+                SESSION.mount(base, adapter)
+
+
+def main(argv: list[str] | None = None):
+    p = argparse.ArgumentParser(description="바이낸스 응답 녹화/재생")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("record", help="실제 API 응답을 fixture로 저장")
+    r.add_argument("fixtures", type=Path)
+    r.add_argument("--symbols", nargs="+", default=["BTCUSDT"])
+    r.add_argument("--intervals", nargs="+", default=["1h"])
+    r.add_argument("--months", type=int, default=1)
+    s = sub.add_parser("serve", help="로컬 스탠드인 서버 실행")
+    s.add_argument("--fixtures", type=Path)
+    s.add_argument("--synthetic", action="store_true")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8765)
+    s.add_argument("--weight-limit", type=int, default=2400)
+    s.add_argument("--latency", type=float, default=0.0, help="요청당 지연(초)")
+    args = p.parse_args(argv)
+
+    if args.cmd == "record":
+        record(args.fixtures, args.symbols, args.intervals, args.months)
+        return
+    opts = {"weight_limit": args.weight_limit, "latency": args.latency}
+    if args.synthetic or not args.fixtures:
+        backend = StandInBinance.synthetic(**opts)
+    else:
+        backend = StandInBinance.from_fixtures(args.fixtures, **opts)
+    serve(backend, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
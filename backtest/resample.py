@@ -0,0 +1,180 @@
+"""
+기준 주기(15m) 한 벌로 상위 주기(1h/4h/1d)를 파생하는 리샘플링 계층.
+
+사이드바에서 봉 간격을 바꿀 때마다 그 주기를 처음부터 내려받지 않도록,
+가장 짧은 주기만 API/저장소에서 받고 나머지는 로컬에서 만든다.
+
+바이낸스 봉 경계와 동일하게 맞춤:
+- 봉 시작 = t // P * P (UTC epoch 기준 → 1h/4h는 정시, 1d는 00:00 UTC)
+- OHLCV: open=첫 봉 open, high=max, low=min, close=마지막 봉 close, volume=합
+- OI / 롱숏 비율: 스냅샷 값이므로 상위 봉 시작 시각의 값을 그대로 사용
+- 테이커: buyVol/sellVol은 합, buySellRatio = buyVol / sellVol
+
+마감 + 구성 봉이 모두 있는 상위 봉만 저장소의 해당 주기(<series>/<SYMBOL>/<interval>)에
+기록 → 다음 조회는 저장분을 읽고 빠진 구간(구멍/꼬리)만 기준 주기에서 다시 파생.
+data.fetch_*_range와 같은 시그니처/컬럼으로 반환하므로 그대로 바꿔 쓸 수 있음.
+"""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import coverage
+from . import store
+from . import data as d
+
+BASE_INTERVAL = "15m"   # 사이드바 최소 주기
+
+OHLCV_COLS = ["open", "high", "low", "close", "volume"]
+TAKER_COLS = ["buyVol", "sellVol", "buySellRatio"]
+
+
+# ---- 리샘플 커널 ------------------------------------------------------------
+
+def _buckets(t_ms: np.ndarray, period_ms: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """정렬된 time(ms) → (버킷 시작 시각, 각 버킷 첫 행 인덱스, 버킷별 행 수)."""
+    b = t_ms // period_ms * period_ms
+    starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]]) if len(b) else np.empty(0, dtype=np.int64)
+    counts = np.diff(np.r_[starts, len(b)])
+    return b[starts], starts, counts
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    캔들 → 상위 주기 캔들. 반환: (프레임, 완결 여부 마스크)
+    완결 = 구성 봉이 모두 있고 상위 봉이 이미 마감됨
+    """
+    P = d.PERIOD_MS[interval]
+    t = store.to_ms(df["time"])
+    tb, starts, counts = _buckets(t, P)
+    if not len(tb):
+        return pd.DataFrame(columns=["time", *OHLCV_COLS]), np.zeros(0, dtype=bool)
+    ends = np.r_[starts[1:], len(t)] - 1
+
+    o, h, l, c, v = (df[col].to_numpy(np.float64) for col in OHLCV_COLS)
+    out = pd.DataFrame({
+        "time": store.from_ms(tb),
+        "open": o[starts],
+        "high": np.maximum.reduceat(h, starts),
+        "low": np.minimum.reduceat(l, starts),
+        "close": c[ends],
+        "volume": np.add.reduceat(v, starts),
+    })
+    return out, _complete(tb, counts, P)
+
+
+def resample_snapshot(df: pd.DataFrame, interval: str, columns: list[str]) -> tuple[pd.DataFrame, np.ndarray]:
+    """OI/롱숏 비율 등 스냅샷 시리즈 → 상위 봉 시작 시각의 값만 남김 (항상 완결)."""
+    P = d.PERIOD_MS[interval]
+    t = store.to_ms(df["time"])
+    on_edge = t % P == 0
+    out = pd.DataFrame({"time": store.from_ms(t[on_edge])})
+    for col in columns:
+        out[col] = df[col].to_numpy(np.float64)[on_edge]
+    return out, np.ones(len(out), dtype=bool)
+
+
+def resample_taker(df: pd.DataFrame, interval: str) -> tuple[pd.DataFrame, np.ndarray]:
+    """테이커 매수/매도 거래량 → 버킷 합, 비율은 합으로 다시 계산."""
+    P = d.PERIOD_MS[interval]
+    t = store.to_ms(df["time"])
+    tb, starts, counts = _buckets(t, P)
+    if not len(tb):
+        return pd.DataFrame(columns=["time", *TAKER_COLS]), np.zeros(0, dtype=bool)
+
+    buy = np.add.reduceat(df["buyVol"].to_numpy(np.float64), starts)
+    sell = np.add.reduceat(df["sellVol"].to_numpy(np.float64), starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(sell != 0, buy / sell, np.nan)
+    out = pd.DataFrame({"time": store.from_ms(tb), "buyVol": buy, "sellVol": sell, "buySellRatio": ratio})
+    return out, _complete(tb, counts, P)
+
+
+def _complete(tb: np.ndarray, counts: np.ndarray, period_ms: int) -> np.ndarray:
+    full = counts == period_ms // d.PERIOD_MS[BASE_INTERVAL]
+    return full & (tb + period_ms <= int(time.time() * 1000))
+
+
+# ---- 주기 계층 조회 ---------------------------------------------------------
+
+def _derivable(interval: str) -> bool:
+    P, B = d.PERIOD_MS[interval], d.PERIOD_MS[BASE_INTERVAL]
+    return P > B and P % B == 0
+
+
+def _tiered(series: str, symbol: str, interval: str,
+            start_utc: pd.Timestamp, end_utc: pd.Timestamp,
+            columns: list[str], base_fetch, reduce) -> pd.DataFrame:
+    """
+    저장된 상위 주기(완결 봉) + 빠진 구간은 기준 주기에서 파생.
+    - 상위 주기 키의 연속 구간(coverage.missing)으로 빠진 창(앞부분/중간 구멍/꼬리)을 구해
+      창마다 기준 주기를 받아 파생 (바깥 경계만 보면 떨어진 요청 사이 구멍이 누락됨)
+    - 새로 완결된 봉만 저장소에 기록 (진행 중/구성 봉이 빠진 봉은 응답에만 포함)
+    """
+    P = d.PERIOD_MS[interval]
+    start_utc, end_utc = d._tz_utc(start_utc), d._tz_utc(end_utc)
+    s_ms = d._ms(start_utc) // P * P  # 첫 상위 봉이 온전히 만들어지도록 경계로 내림
+
+    pending = []
+    for ws, we in coverage.missing(series, symbol, interval, s_ms, d._ms(end_utc), P):
+        ws = -(-ws // P) * P  # 저장된 봉 안쪽에서 시작하면 일부 구성 봉만으로 파생되므로 다음 경계로
+        if ws > we:
+            continue
+        base = base_fetch(pd.Timestamp(ws, unit="ms", tz="UTC"), pd.Timestamp(we, unit="ms", tz="UTC"))
+        if base is None or base.empty:
+            continue
+        derived, complete = reduce(base)
+        store.write_frame(series, symbol, interval, derived[complete])
+        pending.append(derived[~complete])
+
+    cached = store.read_frame(series, symbol, interval, start_utc, end_utc, columns=columns)
+    parts = [p for p in [cached, *pending] if p is not None and not p.empty]
+    if not parts:
+        return pd.DataFrame(columns=["time", *columns])
+    out = parts[0] if len(parts) == 1 else d._dedup_sort(pd.concat(parts, ignore_index=True))
+    t = out["time"]
+    out = out[(t >= start_utc) & (t <= end_utc)]
+    return out[["time", *columns]].reset_index(drop=True)
+
+
+def fetch_futures_klines_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
+    """선물 캔들. 기준 주기보다 긴 주기는 15m에서 파생."""
+    if not _derivable(interval):
+        return d.fetch_futures_klines_range(symbol, interval, start_utc, end_utc)
+    return _tiered(
+        "futures_klines", symbol, interval, start_utc, end_utc, OHLCV_COLS,
+        lambda s, e: d.fetch_futures_klines_range(symbol, BASE_INTERVAL, s, e),
+        lambda base: resample_ohlcv(base, interval),
+    )
+
+
+def fetch_open_interest_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
+    if not _derivable(interval):
+        return d.fetch_open_interest_range(symbol, interval, start_utc, end_utc)
+    return _tiered(
+        "open_interest", symbol, interval, start_utc, end_utc, ["openInterest"],
+        lambda s, e: d.fetch_open_interest_range(symbol, BASE_INTERVAL, s, e),
+        lambda base: resample_snapshot(base, interval, ["openInterest"]),
+    )
+
+
+def fetch_top_traders_long_short_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp, metric: str = "accounts") -> pd.DataFrame:
+    if not _derivable(interval):
+        return d.fetch_top_traders_long_short_range(symbol, interval, start_utc, end_utc, metric=metric)
+    return _tiered(
+        f"top_ls_{metric}", symbol, interval, start_utc, end_utc, ["longShortRatio"],
+        lambda s, e: d.fetch_top_traders_long_short_range(symbol, BASE_INTERVAL, s, e, metric=metric),
+        lambda base: resample_snapshot(base, interval, ["longShortRatio"]),
+    )
+
+
+def fetch_taker_buy_sell_range(symbol: str, interval: str, start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> pd.DataFrame:
+    if not _derivable(interval):
+        return d.fetch_taker_buy_sell_range(symbol, interval, start_utc, end_utc)
+    return _tiered(
+        "taker_ratio", symbol, interval, start_utc, end_utc, TAKER_COLS,
+        lambda s, e: d.fetch_taker_buy_sell_range(symbol, BASE_INTERVAL, s, e),
+        lambda base: resample_taker(base, interval),
+    )
@@ -0,0 +1,90 @@
+"""
+봉 마감 / 펀딩 정산 시각 기준 캐시 만료.
+
+고정 TTL(예: 600초) 대신 "다음에 새 데이터가 생기는 시각"까지만 캐시:
+- 캔들/파생 히스토리: 다음 봉 마감(UTC epoch 경계) + 반영 여유
+  진행 중인 봉은 히스토리 캐시에 넣지 않고 따로 OPEN_BAR_TTL_SEC짜리 엔트리로 (loaders.py)
+- 펀딩: premiumIndex의 nextFundingTime + 반영 여유 (심볼마다 정산 주기가 다름, 실패 시 8h 경계)
+- 마감이 지났는데 응답에 새 봉이 아직 없으면(API 반영 지연) RETRY_SEC 뒤 재확인
+
+shared_cache(expires=...)에 넘기는 함수는 (결과, 인자 dict) → 만료 epoch 초.
+"""
+from __future__ import annotations
+
+import time
+
+import pandas as pd
+
+import requests
+
+from .data import FUNDING_PERIOD_MS, PERIOD_MS, fetch_funding_live
+
+PUBLISH_GRACE_SEC = 3   # 봉 마감 후 API에 새 봉이 보이기까지의 여유
+RETRY_SEC = 20          # 반영이 늦을 때 재확인 간격
+OPEN_BAR_TTL_SEC = 30   # 진행 중인 봉 엔트리의 캐시 시간 (히스토리와 분리)
+
+
+def next_boundary(period_ms: int, now: float | None = None) -> float:
+    """now(epoch 초) 이후 첫 period 경계(epoch 초)."""
+    now_ms = int((time.time() if now is None else now) * 1000)
+    return (now_ms // period_ms + 1) * period_ms / 1000
+
+
+def next_bar_close(interval: str, now: float | None = None) -> float:
+    return next_boundary(PERIOD_MS[interval], now)
+
+
+def next_funding_time(symbol: str | None = None, now: float | None = None) -> float:
+    """
+    다음 펀딩 정산 시각(epoch 초). symbol이 있으면 premiumIndex의 nextFundingTime
+    (4h/1h 정산 심볼도 맞음), 없거나 조회 실패면 8h 경계.
+    """
+    now = time.time() if now is None else now
+    if symbol is not None:
+        try:
+            nxt = int((fetch_funding_live(symbol) or {}).get("nextFundingTime") or 0) / 1000
+        except (requests.RequestException, ValueError, TypeError):
+            nxt = 0
+        if nxt > now:
+            return nxt
+    return next_boundary(FUNDING_PERIOD_MS, now)
+
+
+def _last_ms(result) -> int | None:
+    if not isinstance(result, pd.DataFrame) or result.empty or "time" not in result:
+        return None
+    return int(pd.Timestamp(result["time"].iloc[-1]).timestamp() * 1000)
+
+
+def _expiry(period_ms: int, result) -> float:
+    now = time.time()
+    nxt = next_boundary(period_ms, now) + PUBLISH_GRACE_SEC
+    expected = (int(now * 1000) // period_ms - 1) * period_ms   # 직전 마감 봉의 시작
+    last = _last_ms(result)
+    if last is not None and expected - period_ms <= last < expected:
+        # 딱 한 주기 늦음 → API 반영 지연으로 보고 곧 재확인 (더 오래된 공백은 재시도해도 안 채워짐)
+        return now + RETRY_SEC
+    return nxt
+
+
+def _funding_expiry(result, symbol: str | None) -> float:
+    now = time.time()
+    nxt = next_funding_time(symbol, now)
+    t = result["time"] if isinstance(result, pd.DataFrame) and "time" in result else None
+    if t is not None and len(t) >= 2:
+        last = _last_ms(result)
+        period = last - int(pd.Timestamp(t.iloc[-2]).timestamp() * 1000)   # 응답에서 본 정산 간격
+        # 직전 정산(nxt - period)이 한 번 빠짐 → 반영 지연으로 보고 곧 재확인 (fundingTime의 ms 오차 감안)
+        if period > 0 and 1.5 * period < nxt * 1000 - last < 2.5 * period:
+            return now + RETRY_SEC
+    return nxt + PUBLISH_GRACE_SEC
+
+
+def bar_close(arg: str = "interval"):
+    """인자 arg(주기 문자열)의 다음 봉 마감까지 캐시 (결과에는 마감된 봉만 담을 것)."""
+    return lambda result, params: _expiry(PERIOD_MS[params[arg]], result)
+
+
+def funding_settlement(arg: str = "symbol"):
+    """인자 arg(심볼)의 다음 펀딩 정산까지 캐시."""
+    return lambda result, params: _funding_expiry(result, params.get(arg))
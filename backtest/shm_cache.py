@@ -0,0 +1,199 @@
+"""
+프로세스 간 공유 프레임 캐시 (st.cache_data 대체용).
+
+st.cache_data는 프로세스마다, 호출마다 DataFrame을 pickle/unpickle한 복사본을 돌려줌.
+여기서는 결과를 컬럼별 .npy로 한 번 기록하고 읽을 때 mmap으로 매핑 →
+같은 머신의 Streamlit 프로세스/백테스트 워커가 같은 페이지 캐시를 공유하고, 히트 시 역직렬화가 없음.
+
+- 위치: INDICLENS_SHM_DIR > /dev/shm/indiclens (RAM 기반 tmpfs) > <CACHE_DIR>/shared
+- 엔트리: <root>/<함수>/<인자 해시>/<버전>/  +  current(현재 버전 포인터, 원자적 교체)
+  버전 디렉터리는 한 번 쓰면 바꾸지 않으므로 읽는 중에 다른 프로세스가 갱신해도 안전
+- mmap_mode="c": 읽기는 공유, 호출자가 값을 고치면 그 페이지만 프로세스 전용 복사
+- 같은 엔트리의 동시 미스는 프로세스 안에서는 singleflight, 프로세스 간에는 파일 락으로 한 번만 계산
+- 로더가 채우는 컬럼형 저장소(store.py)도 키 단위 flock으로 쓰기를 직렬화하므로
+  여러 Streamlit 워커(각자 prefetch 스레드 포함)가 같은 CACHE_DIR을 같이 써도 됨
+  (fcntl이 없는 Windows에서는 워커 1개로 실행)
+- 만료: ttl(초) 또는 expires(결과, 인자 dict) → 만료 시각 (backtest.schedule의 봉 마감 기준)
+- DataFrame이 아닌 작은 JSON 값(float 등)은 포인터 파일에 같이 기록
+
+사용 예:
+    @shared_cache(expires=schedule.bar_close("interval"))
+    def load_price(symbol, interval, months) -> pd.DataFrame: ...
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import CACHE_DIR, read_columns, write_columns
+from .singleflight import Group
+
+try:  # 프로세스 간 락 (Windows에는 없음 → 프로세스 안에서만 합침)
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+def _default_root() -> Path:
+    env = os.environ.get("INDICLENS_SHM_DIR")
+    if env:
+        return Path(env)
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / "indiclens"
+    return CACHE_DIR / "shared"
+
+
+SHM_DIR = _default_root()
+KEEP_VERSIONS = 2   # 현재 + 직전 버전 (직전 버전을 막 열려던 리더 보호)
+
+_FLIGHTS = Group()
+_MISS = object()
+
+
+# ---- 엔트리 입출력 ----------------------------------------------------------
+
+def _entry_dir(namespace: str, key: str) -> Path:
+    return SHM_DIR / namespace / key
+
+
+def _key(params: dict) -> str:
+    raw = repr(sorted(params.items()))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def _read_pointer(entry: Path) -> dict | None:
+    try:
+        return json.loads((entry / "current").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _lookup(namespace: str, key: str, ttl: float | None = None):
+    entry = _entry_dir(namespace, key)
+    ptr = _read_pointer(entry)
+    if ptr is None:
+        return _MISS
+    now = time.time()
+    if ttl is not None and now - ptr["created"] > ttl:
+        return _MISS
+    if ptr.get("expires") is not None and now >= ptr["expires"]:
+        return _MISS
+    if "value" in ptr:
+        return ptr["value"]
+    try:
+        return read_columns(entry / ptr["version"], mmap_mode="c")
+    except (OSError, ValueError):  # 정리된 버전을 가리키는 오래된 포인터 등
+        return _MISS
+
+
+def get(namespace: str, key: str, ttl: float | None = None):
+    """캐시 조회. 없거나 만료면 None. 반환 프레임의 컬럼은 공유 mmap."""
+    out = _lookup(namespace, key, ttl)
+    return None if out is _MISS else out
+
+
+def put(namespace: str, key: str, value, expires: float | None = None):
+    """
+    새 버전 디렉터리에 기록한 뒤 current 포인터를 원자적으로 교체.
+    DataFrame이 아니면 JSON으로 포인터에 직접 기록.
+    """
+    entry = _entry_dir(namespace, key)
+    entry.mkdir(parents=True, exist_ok=True)
+    version = f"{time.time_ns()}-{os.getpid()}"
+    ptr = {"version": version, "created": time.time(), "expires": expires}
+    if isinstance(value, pd.DataFrame):
+        write_columns(entry / version, value)
+    else:
+        ptr["value"] = value
+    tmp = entry / f".current.{version}.tmp"
+    tmp.write_text(json.dumps(ptr), encoding="utf-8")
+    os.replace(tmp, entry / "current")
+    _prune(entry)
+
+
+def _prune(entry: Path):
+    versions = sorted((p for p in entry.iterdir() if p.is_dir()), key=lambda p: p.name)
+    # 이미 매핑한 프로세스는 unlink 후에도 계속 읽을 수 있음 (POSIX)
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+@contextmanager
+def _file_lock(entry: Path):
+    entry.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(entry / ".lock", "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def clear(namespace: str | None = None):
+    """namespace(함수) 단위 또는 전체 삭제."""
+    shutil.rmtree(SHM_DIR / namespace if namespace else SHM_DIR, ignore_errors=True)
+
+
+# ---- 데코레이터 -------------------------------------------------------------
+
+def _cacheable(value) -> bool:
+    if isinstance(value, pd.DataFrame):
+        return True
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return value is not None  # None은 미스와 구분되지 않으므로 캐시하지 않음
+
+
+def shared_cache(ttl: float | None = None, namespace: str | None = None, expires=None):
+    """
+    함수 결과(DataFrame 또는 JSON 값)를 공유 캐시에 둠.
+    - 인자는 repr이 안정적인 값(str/int/float/tuple)이어야 함 (기본값을 채운 뒤 키로 사용)
+    - expires(결과, 인자 dict) → 만료 epoch 초. ttl과 함께 주면 먼저 닿는 쪽에서 만료
+    """
+    def deco(fn):
+        ns = namespace or f"{fn.__module__}.{fn.__qualname__}"
+        sig = inspect.signature(fn)
+
+        def _fill(key: str, params: dict, args, kwargs):
+            with _file_lock(_entry_dir(ns, key)):
+                # 락을 기다리는 동안 다른 프로세스가 채웠을 수 있음
+                hit = _lookup(ns, key, ttl)
+                if hit is not _MISS:
+                    return hit
+                out = fn(*args, **kwargs)
+                if not _cacheable(out):
+                    return out
+                put(ns, key, out, expires(out, params) if expires else None)
+                shared = _lookup(ns, key)
+                return out if shared is _MISS else shared
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            key = _key(params)
+            hit = _lookup(ns, key, ttl)
+            if hit is not _MISS:
+                return hit
+            return _FLIGHTS.do((ns, key), lambda: _fill(key, params, args, kwargs))
+
+        wrapper.clear = lambda: clear(ns)
+        return wrapper
+
+    return deco
@@ -1,13 +1,101 @@
 from __future__ import annotations
+import functools
+import hashlib
+import json
 import operator
+import threading
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 
 from .indicators import sma, ema, rsi, macd, bbands
 
 
+# ---------- 지표 캐시 ----------
+# (지표, 파라미터, 소스 컬럼, 데이터 지문) → 계산 결과 LRU.
+# 같은 룰 안의 반복 피연산자, entry/exit 쌍, 다중 필드 지표(macd/bbands)가 한 번 계산한 결과를 공유.
+# 지문은 소스 컬럼 값 + time 인덱스의 해시라, 같은 가격 프레임이면 호출이 달라도 적중.
+_INDICATORS = {
+    "sma": (sma, (("window", 20),)),
+    "ema": (ema, (("span", 20),)),
+    "rsi": (rsi, (("period", 14),)),
+    "macd": (macd, (("fast", 12), ("slow", 26), ("signal", 9))),
+    "bbands": (bbands, (("window", 20), ("k", 2.0))),
+}
+_FIELD_HELP = {
+    "macd": "macd 지표는 field('macd'|'signal'|'hist')가 필요합니다.",
+    "bbands": "bbands 지표는 field('bb_upper'|'bb_mid'|'bb_lower')가 필요합니다.",
+}
+
+
+class IndicatorCache:
+    """스레드 안전 LRU. 값(Series/DataFrame)은 공유되므로 호출자가 수정하지 않아야 함."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[tuple, pd.Series | pd.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        val = compute()
+        with self._lock:
+            self._data[key] = val
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return val
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+INDICATOR_CACHE = IndicatorCache()
+
+
+def _digest(arr: np.ndarray) -> str:
+    return hashlib.blake2b(np.ascontiguousarray(arr).view(np.uint8), digest_size=12).hexdigest()
+
+
+class _Sources:
+    """한 번의 평가 동안 소스 컬럼(float)과 그 지문을 한 번씩만 만듦."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._index_fp: str | None = None
+        self._cols: dict[str, tuple[pd.Series, str]] = {}
+
+    def column(self, name: str) -> tuple[pd.Series, str]:
+        if name not in self._cols:
+            src = self.df[name].astype(float)
+            if self._index_fp is None:
+                idx = self.df.index
+                raw = idx.asi8 if isinstance(idx, pd.DatetimeIndex) else pd.util.hash_pandas_object(idx).to_numpy()
+                self._index_fp = f"{len(idx)}:{_digest(raw)}"
+            self._cols[name] = (src, f"{self._index_fp}:{_digest(src.to_numpy())}")
+        return self._cols[name]
+
+
+def indicator(name: str, params: dict, df: pd.DataFrame, source: str = "close",
+              sources: _Sources | None = None) -> pd.Series | pd.DataFrame:
+    """지표 계산 (캐시 경유). macd/bbands는 전체 프레임을 캐시하고 호출자가 필드를 고름."""
+    fn, defaults = _INDICATORS[name]
+    args = tuple(params.get(k, d) for k, d in defaults)
+    src, fp = (sources or _Sources(df)).column(source)
+    return INDICATOR_CACHE.get((name, args, source, fp), lambda: fn(src, *args))
+
+
 # ---------- 유틸: 시리즈/스칼라 normalize ----------
-def _to_series(obj, df: pd.DataFrame) -> pd.Series:
+def _to_series(obj, df: pd.DataFrame, sources: _Sources | None = None) -> pd.Series:
     """
     피연산자 JSON을 판다스 Series로 변환.
     - const -> Series(상수)
@@ -33,43 +121,22 @@ def _to_series(obj, df: pd.DataFrame) -> pd.Series:
         field = obj.get("field", None)
         source_col = obj.get("source", "close")
 
-        src = df[source_col].astype(float)
-
-        if name == "sma":
-            return sma(src, params.get("window", 20))
-        if name == "ema":
-            return ema(src, params.get("span", 20))
-        if name == "rsi":
-            return rsi(src, params.get("period", 14))
-        if name == "macd":
-            m = macd(src, params.get("fast", 12), params.get("slow", 26), params.get("signal", 9))
-            if field is None:
-                raise ValueError("macd 지표는 field('macd'|'signal'|'hist')가 필요합니다.")
-            return m[field]
-        if name == "bbands":
-            b = bbands(src, params.get("window", 20), params.get("k", 2.0))
-            if field is None:
-                raise ValueError("bbands 지표는 field('bb_upper'|'bb_mid'|'bb_lower')가 필요합니다.")
-            return b[field]
-
-        raise ValueError(f"지원하지 않는 indicator/source name: {name}")
+        if name not in _INDICATORS:
+            raise ValueError(f"지원하지 않는 indicator/source name: {name}")
+        if name in _FIELD_HELP and field is None:
+            raise ValueError(_FIELD_HELP[name])
+        out = indicator(name, params, df, source_col, sources)
+        return out[field] if name in _FIELD_HELP else out
 
     raise ValueError(f"알 수 없는 operand 유형: {obj}")
 
 
-# ---------- 교차 연산 ----------
-def _crossover(a: pd.Series, b: pd.Series) -> pd.Series:
-    prev = (a.shift(1) <= b.shift(1))
-    now = (a > b)
-    return (prev & now).fillna(False)
-
-def _crossunder(a: pd.Series, b: pd.Series) -> pd.Series:
-    prev = (a.shift(1) >= b.shift(1))
-    now = (a < b)
-    return (prev & now).fillna(False)
-
-
-# ---------- 비교/논리 파서 ----------
+# ---------- 룰 컴파일러 ----------
+# JSON DSL → 표현식 DAG(Plan). 한 번 컴파일한 계획은 룰 해시로 캐시하고 NumPy 배열 위에서 실행:
+# - 같은 부분식(피연산자/비교/교차/논리)은 노드 하나로 합침 (entry/exit를 같이 컴파일하면 둘 사이에서도)
+# - const 피연산자는 전체 Series 대신 스칼라로, const끼리의 비교와 and/or의 상수 인자는 컴파일 시 접음
+# - and/or는 실행 중 결과가 전부 False/True가 되면 남은 인자를 계산하지 않음
+# 결과는 기존 pandas 해석기와 같음 (NaN 비교는 False, 교차의 첫 봉은 False, 리프는 0/NaN → False)
 _ops_compare = {
     ">": operator.gt,
     "<": operator.lt,
@@ -79,58 +146,154 @@ _ops_compare = {
     "!=": operator.ne,
 }
 
-def _eval_expr(expr: dict, df: pd.DataFrame) -> pd.Series:
-    # 논리 단항
-    if expr.get("op") == "not":
-        arg = _eval_expr(expr["arg"], df)
-        return (~arg).fillna(False)
-
-    # 논리 다항
-    if expr.get("op") == "and":
-        args = expr["args"]
-        res = pd.Series(True, index=df.index)
-        for e in args:
-            res = res & _eval_expr(e, df)
-        return res.fillna(False)
-
-    if expr.get("op") == "or":
-        args = expr["args"]
-        res = pd.Series(False, index=df.index)
-        for e in args:
-            res = res | _eval_expr(e, df)
-        return res.fillna(False)
-
-    # 교차
-    if expr.get("op") == "crossover":
-        left = _to_series(expr["left"], df)
-        right = _to_series(expr["right"], df)
-        return _crossover(left, right)
-
-    if expr.get("op") == "crossunder":
-        left = _to_series(expr["left"], df)
-        right = _to_series(expr["right"], df)
-        return _crossunder(left, right)
-
-    # 비교
-    if expr.get("op") in _ops_compare:
-        left = _to_series(expr["left"], df)
-        right = _to_series(expr["right"], df)
-        return _ops_compare[expr["op"]](left, right).fillna(False)
-
-    # 리프(= 단일 피연산자만 들어온 경우)도 허용: True/False Series로 변환 시도
-    if "type" in expr or "name" in expr:
-        s = _to_series(expr, df)
-        # 0/NaN -> False, 그 외 True 로 캐스팅
-        return s.fillna(0).astype(bool)
-
-    raise ValueError(f"지원하지 않는 expr: {expr}")
+
+class Plan:
+    """nodes[i] = (종류, ...인자). 인자 중 노드 참조는 정수 id. outputs = 룰별 결과 노드 id."""
+
+    def __init__(self):
+        self.nodes: list[tuple] = []
+        self.outputs: list[int] = []
+        self._ids: dict[tuple, int] = {}
+
+    def add(self, node: tuple) -> int:
+        if node not in self._ids:
+            self._ids[node] = len(self.nodes)
+            self.nodes.append(node)
+        return self._ids[node]
+
+    # -- 컴파일 --
+    def operand(self, obj) -> int:
+        if obj.get("type") == "const":
+            return self.add(("const", float(obj["value"])))
+        if obj.get("type") == "indicator" or "name" in obj:
+            # 컬럼 참조인지 지표인지는 프레임 컬럼에 따라 정해지므로 실행 시 판단
+            return self.add(("operand", json.dumps(obj, sort_keys=True)))
+        raise ValueError(f"알 수 없는 operand 유형: {obj}")
+
+    def expr(self, expr: dict) -> int:
+        op = expr.get("op")
+        if op == "not":
+            a = self.expr(expr["arg"])
+            if self.nodes[a][0] == "bool":
+                return self.add(("bool", not self.nodes[a][1]))
+            return self.add(("not", a))
+        if op in ("and", "or"):
+            absorb = op == "or"  # or에서는 True, and에서는 False가 결과를 결정
+            args = []
+            for e in expr["args"]:
+                a = self.expr(e)
+                if self.nodes[a][0] == "bool":
+                    if self.nodes[a][1] == absorb:
+                        return self.add(("bool", absorb))
+                    continue
+                if a not in args:
+                    args.append(a)
+            if not args:
+                return self.add(("bool", not absorb))
+            return args[0] if len(args) == 1 else self.add((op, tuple(args)))
+        if op in ("crossover", "crossunder"):
+            return self.add((op, self.operand(expr["left"]), self.operand(expr["right"])))
+        if op in _ops_compare:
+            a, b = self.operand(expr["left"]), self.operand(expr["right"])
+            if self.nodes[a][0] == "const" and self.nodes[b][0] == "const":
+                return self.add(("bool", bool(_ops_compare[op](self.nodes[a][1], self.nodes[b][1]))))
+            return self.add(("cmp", op, a, b))
+        # 리프(= 단일 피연산자만 들어온 경우)도 허용: 0/NaN → False, 그 외 True
+        if "type" in expr or "name" in expr:
+            a = self.operand(expr)
+            if self.nodes[a][0] == "const":
+                v = self.nodes[a][1]
+                return self.add(("bool", bool(v) and not np.isnan(v)))
+            return self.add(("truthy", a))
+        raise ValueError(f"지원하지 않는 expr: {expr}")
+
+    # -- 실행 --
+    def run(self, df: pd.DataFrame) -> list[np.ndarray]:
+        n = len(df)
+        sources = _Sources(df)
+        memo: dict[int, np.ndarray | float | bool] = {}
+
+        def val(i: int):
+            if i in memo:
+                return memo[i]
+            kind, *args = self.nodes[i]
+            if kind in ("const", "bool"):
+                out = args[0]
+            elif kind == "operand":
+                out = _to_series(json.loads(args[0]), df, sources).to_numpy(dtype=np.float64)
+            elif kind == "cmp":
+                out = _ops_compare[args[0]](val(args[1]), val(args[2]))
+            elif kind in ("crossover", "crossunder"):
+                a, b = val(args[0]), val(args[1])
+                cmp_now, cmp_prev = (operator.gt, operator.le) if kind == "crossover" else (operator.lt, operator.ge)
+                out = np.zeros(n, dtype=bool)
+                if n:
+                    a_, b_ = np.broadcast_to(a, n), np.broadcast_to(b, n)
+                    out[1:] = cmp_prev(a_[:-1], b_[:-1]) & cmp_now(a_[1:], b_[1:])
+            elif kind == "not":
+                out = ~_bools(val(args[0]), n)
+            elif kind in ("and", "or"):
+                out = None
+                for a in args[0]:
+                    v = _bools(val(a), n)
+                    out = v.copy() if out is None else (out & v if kind == "and" else out | v)
+                    if (kind == "and" and not out.any()) or (kind == "or" and out.all()):
+                        break  # 남은 인자는 결과를 바꿀 수 없음
+            elif kind == "truthy":
+                v = val(args[0])
+                out = (v != 0) & ~np.isnan(v)
+            else:  # pragma: no cover
+                raise ValueError(f"알 수 없는 노드: {kind}")
+            memo[i] = out
+            return out
+
+        return [_bools(val(o), n) for o in self.outputs]
+
+
+def _bools(v, n: int) -> np.ndarray:
+    """스칼라/배열 → 길이 n bool 배열."""
+    if np.ndim(v) == 0:
+        return np.full(n, bool(v))
+    return np.asarray(v, dtype=bool)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(key: str) -> Plan:
+    plan = Plan()
+    plan.outputs = [plan.expr(r) for r in json.loads(key)]
+    return plan
+
+
+def compile_rules(*rules: dict) -> Plan:
+    """룰들을 하나의 DAG로 컴파일 (룰 해시로 캐시)."""
+    return _compile_cached(json.dumps(list(rules), sort_keys=True))
+
+
+def evaluate_rules(rules: list[dict], ohlcv: pd.DataFrame) -> list[pd.Series]:
+    """여러 룰을 함께 컴파일/실행 → 룰별 Boolean Series. 공통 부분식은 한 번만 계산."""
+    # ohlcv: columns = time, open, high, low, close, volume
+    df = ohlcv.set_index("time")
+    return [pd.Series(v, index=df.index) for v in compile_rules(*rules).run(df)]
+
+
+def evaluate_matrix(rules: list[dict], ohlcv: pd.DataFrame, names: list[str] | None = None) -> pd.DataFrame:
+    """
+    여러 룰을 한 프레임에 한 번에 평가 → (봉 × 룰) bool 행렬 (index=time, 컬럼=names 또는 0..N-1).
+    배치 전체를 한 DAG로 컴파일하므로 서로 다른 지표/부분식은 배치 전체에서 한 번씩만 계산.
+    NumPy 행렬이 필요하면 .to_numpy().
+    """
+    if names is not None and len(names) != len(rules):
+        raise ValueError("names와 rules의 길이가 다릅니다.")
+    df = ohlcv.set_index("time")
+    cols = compile_rules(*rules).run(df)
+    mat = np.column_stack(cols) if cols else np.zeros((len(df), 0), dtype=bool)
+    return pd.DataFrame(mat, index=df.index, columns=names if names is not None else range(len(rules)), copy=False)
 
 
 def evaluate_rule(rule_json: dict, ohlcv: pd.DataFrame) -> pd.Series:
     """
     JSON DSL → Boolean Series (시그널) 변환
     ※ 룩어헤드 방지는 '백테스트 체결'에서 처리(예: signal.shift(1))
+    지표는 INDICATOR_CACHE를 거치므로 같은 프레임으로 entry/exit를 연달아 평가하면 재사용됨
     """
-    # ohlcv: columns = time, open, high, low, close, volume
-    df = ohlcv.set_index("time")
-    return _eval_expr(rule_json, df).astype(bool)
\ No newline at end of file
+    return evaluate_rules([rule_json], ohlcv)[0]
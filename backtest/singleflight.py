@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class Group:
+    """
+    같은 key의 동시 호출을 하나로 합치는 singleflight.
+    - 먼저 온 호출(리더)만 fn()을 실행하고, 실행 중에 들어온 호출은 그 결과를 기다려 공유
+    - 실행이 끝나면 key를 지우므로 결과를 캐시하지는 않음 (캐시는 저장소/st.cache 담당)
+    - copy=True면 대기자에게 result.copy()를 돌려줘 리더와 같은 객체를 공유하지 않음
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], copy: bool = True) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            res = call.result
+            return res.copy() if copy and hasattr(res, "copy") else res
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
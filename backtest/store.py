@@ -0,0 +1,436 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:  # 선택 의존성 (없으면 zlib)
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:  # 프로세스 간 락 (Windows에는 없음 → 프로세스 안에서만 직렬화)
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# 컬럼형 저장소 레이아웃:
+#   <STORE_DIR>/<series>/<SYMBOL>/<interval>/<YYYY-MM>/<column>.npy[.zst|.zlib]
+# - time 컬럼은 int64 epoch-ms, 나머지는 float64
+# - 월 단위 파티션 → 기간 조회 시 필요한 달만, 그 안에서도 요청 컬럼/시간 범위만 읽음
+# - 진행 중인 달은 .npy 그대로(memmap, 잦은 덮어쓰기), 지난 달(봉인)은 컬럼별 압축
+#   (zstandard가 있으면 .zst, 없으면 .zlib — 읽을 때 확장자로 구분)
+# - <interval>/meta.json 에 저장된 첫/마지막 time을 기록 (증분 갱신 기준점)
+# - 쓰기는 키 단위 락(<interval>/.lock flock)으로 프로세스 간에도 직렬화
+STORE_DIR = Path(os.environ.get("CACHE_DIR", "data")) / "store"
+TIME_COL = "time"
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+LOAD_RETRIES = 3   # 읽는 중 압축으로 파일이 바뀐 경우 다시 찾는 횟수
+
+_locks: dict[tuple, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+# ---- 공통 유틸 --------------------------------------------------------------
+
+@contextmanager
+def _lock(series: str, symbol: str, interval: str):
+    """
+    키 단위 쓰기 락: 프로세스 안은 threading.Lock, 프로세스 간은 <interval>/.lock의 flock.
+    파티션 컬럼 교체와 meta.json 갱신을 한 덩어리로 묶음 (여러 워커가 같은 키를 쓰는 배포).
+    """
+    key = (series, symbol.upper(), interval)
+    with _locks_guard:
+        if key not in _locks:
+            _locks[key] = threading.Lock()
+        tlock = _locks[key]
+    with tlock:
+        if fcntl is None:  # Windows: 프로세스 안에서만 보호
+            yield
+            return
+        base = _key_dir(series, symbol, interval)
+        base.mkdir(parents=True, exist_ok=True)
+        with open(base / ".lock", "w") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _key_dir(series: str, symbol: str, interval: str) -> Path:
+    return STORE_DIR / series / symbol.upper() / interval
+
+
+def to_ms(times) -> np.ndarray:
+    """datetime 계열(Series/Index/array) → int64 epoch-ms (tz-aware면 UTC 기준)."""
+    idx = pd.DatetimeIndex(times)
+    if idx.tz is None:
+        idx = idx.tz_localize("UTC")
+    return idx.as_unit("ms").asi8.astype(np.int64, copy=False)
+
+
+def from_ms(ms: np.ndarray) -> pd.Series:
+    """int64 epoch-ms → tz-aware UTC datetime Series."""
+    return pd.Series(pd.to_datetime(np.asarray(ms, dtype=np.int64), unit="ms", utc=True))
+
+
+def _meta_path(series: str, symbol: str, interval: str) -> Path:
+    return _key_dir(series, symbol, interval) / "meta.json"
+
+
+def read_meta(series: str, symbol: str, interval: str) -> dict:
+    path = _meta_path(series, symbol, interval)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_meta(series: str, symbol: str, interval: str, **fields):
+    """meta.json 필드 갱신 (기존 필드는 유지). 읽고-고쳐-쓰기이므로 _lock 안에서 호출."""
+    path = _meta_path(series, symbol, interval)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = read_meta(series, symbol, interval)
+    meta.update(fields)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _month_of(ms: np.ndarray) -> np.ndarray:
+    return np.asarray(ms, dtype=np.int64).astype("datetime64[ms]").astype("datetime64[M]")
+
+
+def save_column(path: Path, arr: np.ndarray):
+    """임시 파일에 쓰고 os.replace로 교체 → 읽는 쪽이 반쯤 쓰인 파일을 보지 않음."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.save(fh, arr, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def load_column(path: Path, mmap: bool = True) -> np.ndarray:
+    if not mmap:
+        return np.load(path, allow_pickle=False)
+    # np.load(mmap_mode)는 헤더를 읽은 뒤 경로로 다시 열어서, 그 사이 os.replace되면
+    # 헤더와 파일이 어긋남 → 한 번 연 파일 객체에서 헤더와 매핑을 함께 얻음
+    with open(path, "rb") as fh:
+        fmt = np.lib.format
+        read_header = fmt.read_array_header_1_0 if fmt.read_magic(fh) == (1, 0) else fmt.read_array_header_2_0
+        shape, fortran, dtype = read_header(fh)
+        if not shape or 0 in shape:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(fh, dtype=dtype, mode="r", shape=shape,
+                         order="F" if fortran else "C", offset=fh.tell())
+
+
+# ---- 압축 (봉인된 월 파티션) ------------------------------------------------
+
+_CODEC = ".zst" if zstandard is not None else ".zlib"
+_CODECS = (".zst", ".zlib")
+
+
+def _compress(raw: bytes) -> bytes:
+    if _CODEC == ".zst":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return zlib.compress(raw, ZLIB_LEVEL)
+
+
+def _decompress(path: Path) -> bytes:
+    data = path.read_bytes()
+    if path.suffix == ".zlib":
+        return zlib.decompress(data)
+    if zstandard is None:
+        raise RuntimeError(f"{path}를 읽으려면 zstandard 패키지가 필요합니다 (pip install zstandard)")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def save_packed(path: Path, arr: np.ndarray):
+    """path(<col>.npy) 옆에 압축본(<col>.npy.zst|.zlib)을 원자적으로 기록."""
+    buf = io.BytesIO()
+    np.save(buf, np.ascontiguousarray(arr), allow_pickle=False)
+    target = path.with_name(path.name + _CODEC)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(_compress(buf.getvalue()))
+    os.replace(tmp, target)
+
+
+def _column_file(part: Path, col: str) -> Path | None:
+    """파티션의 컬럼 파일 (압축본 우선). 없으면 None."""
+    for suffix in _CODECS:
+        p = part / f"{col}.npy{suffix}"
+        if p.exists():
+            return p
+    p = part / f"{col}.npy"
+    return p if p.exists() else None
+
+
+def _load(path: Path) -> np.ndarray:
+    if path.suffix in _CODECS:
+        return np.load(io.BytesIO(_decompress(path)), allow_pickle=False)
+    return load_column(path)
+
+
+def _read_column(part: Path, col: str) -> np.ndarray | None:
+    """
+    컬럼 파일을 찾아 읽음. 없으면 None.
+    찾은 뒤 여는 사이에 압축(_write_partition(packed=True)/compact)이 .npy를 지웠으면
+    압축본이 이미 기록된 뒤이므로 다시 찾아 읽음.
+    """
+    for attempt in range(LOAD_RETRIES):
+        path = _column_file(part, col)
+        if path is None:
+            return None
+        try:
+            return _load(path)
+        except FileNotFoundError:
+            if attempt == LOAD_RETRIES - 1:
+                raise
+
+
+def _columns_in(part: Path) -> list[str]:
+    names = {p.name.split(".npy", 1)[0] for p in part.glob("*.npy*") if not p.name.startswith(".")}
+    return sorted(names - {TIME_COL})
+
+
+def _sealed(part: Path) -> bool:
+    """현재(UTC) 달보다 이전 달 → 더 이상 새 봉이 붙지 않는 파티션."""
+    return np.datetime64(part.name, "M") < np.datetime64(pd.Timestamp.now(tz="UTC").strftime("%Y-%m"), "M")
+
+
+# ---- 파티션 입출력 ----------------------------------------------------------
+
+def _partition_dirs(series: str, symbol: str, interval: str) -> list[Path]:
+    base = _key_dir(series, symbol, interval)
+    if not base.exists():
+        return []
+    return sorted(p for p in base.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+
+def _partitions_between(series: str, symbol: str, interval: str,
+                        s_ms: int | None, e_ms: int | None) -> list[Path]:
+    """[s_ms, e_ms]에 걸친 달의 파티션만."""
+    s_m = _month_of(np.array([s_ms]))[0] if s_ms is not None else None
+    e_m = _month_of(np.array([e_ms]))[0] if e_ms is not None else None
+    out = []
+    for part in _partition_dirs(series, symbol, interval):
+        m = np.datetime64(part.name, "M")
+        if (s_m is None or m >= s_m) and (e_m is None or m <= e_m):
+            out.append(part)
+    return out
+
+
+def _read_partition(part: Path, columns: list[str] | None = None,
+                    s_ms: int | None = None, e_ms: int | None = None) -> dict[str, np.ndarray] | None:
+    """
+    파티션 읽기. columns/s_ms/e_ms가 있으면 그 컬럼·시간 범위만
+    (time으로 범위를 먼저 자른 뒤 나머지 컬럼은 필요한 것만 열어 슬라이스).
+    """
+    t = _read_column(part, TIME_COL)
+    if t is None:
+        return None
+    lo = int(np.searchsorted(t, s_ms, side="left")) if s_ms is not None else 0
+    hi = int(np.searchsorted(t, e_ms, side="right")) if e_ms is not None else len(t)
+    if columns is None:
+        columns = _columns_in(part)
+    out = {}
+    for c in columns:
+        a = _read_column(part, c)
+        out[c] = a if a is not None else np.full(len(t), np.nan)
+    # 동시 쓰기 중 길이가 어긋난 경우는 가장 짧은 컬럼에 맞춤
+    n = min([len(t), *(len(a) for a in out.values())])
+    hi = min(hi, n)
+    lo = min(lo, hi)
+    return {TIME_COL: t[lo:hi], **{c: a[lo:hi] for c, a in out.items()}}
+
+
+def _write_partition(part: Path, cols: dict[str, np.ndarray], packed: bool = False):
+    """packed면 압축본으로 기록하고 남은 .npy는 지움 (봉인된 달)."""
+    part.mkdir(parents=True, exist_ok=True)
+    save = save_packed if packed else save_column
+    for c, arr in cols.items():
+        if c != TIME_COL:
+            save(part / f"{c}.npy", arr)
+    # time을 마지막에 교체 → time 길이가 파티션의 기준
+    save(part / f"{TIME_COL}.npy", cols[TIME_COL])
+    if packed:
+        for c in [*(c for c in cols if c != TIME_COL), TIME_COL]:
+            (part / f"{c}.npy").unlink(missing_ok=True)
+            for suffix in _CODECS:
+                if suffix != _CODEC:
+                    (part / f"{c}.npy{suffix}").unlink(missing_ok=True)
+
+
+def _merge(old: dict[str, np.ndarray] | None, new: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    time 기준 병합. 같은 time은 새 값(new) 우선, 결과는 time 오름차순.
+    new에 없는 컬럼은 같은 time의 기존 값을 유지 (일부 컬럼만 가진 소스가 나머지를 NaN으로 지우지 않도록).
+    """
+    if old is None:
+        old = {TIME_COL: np.empty(0, dtype=np.int64)}
+    names = [c for c in dict.fromkeys(list(old) + list(new)) if c != TIME_COL]
+    n_old, n_new = len(old[TIME_COL]), len(new[TIME_COL])
+
+    t = np.concatenate([old[TIME_COL], new[TIME_COL]]).astype(np.int64, copy=False)
+    order = np.argsort(t, kind="stable")
+    ts = t[order]
+    # 정렬 후 같은 time의 마지막(= 나중에 붙은 new) 하나만 남김
+    keep = np.ones(len(ts), dtype=bool)
+    keep[:-1] = ts[1:] != ts[:-1]
+    sel = order[keep]
+    # new에 없는 컬럼용: 같은 time의 첫 행(= 기존 old)
+    first = np.ones(len(ts), dtype=bool)
+    first[1:] = ts[1:] != ts[:-1]
+    sel_old = order[first]
+
+    out = {TIME_COL: t[sel]}
+    for c in names:
+        a = old.get(c, np.full(n_old, np.nan))
+        b = new.get(c, np.full(n_new, np.nan))
+        both = np.concatenate([np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)])
+        out[c] = both[sel] if c in new else both[sel_old]
+    return out
+
+
+# ---- 공개 API ----------------------------------------------------------------
+
+def write_frame(series: str, symbol: str, interval: str, df: pd.DataFrame):
+    """
+    DataFrame(time + 수치 컬럼)을 월 파티션에 병합 저장.
+    - series: "futures_klines" | "funding" | "open_interest" ...
+    - 기존 파티션과 time 기준 dedup (새 값 우선)
+    """
+    if df is None or df.empty:
+        return
+    t = to_ms(df[TIME_COL])
+    values = {c: pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float64)
+              for c in df.columns if c != TIME_COL}
+    months = _month_of(t)
+    base = _key_dir(series, symbol, interval)
+
+    with _lock(series, symbol, interval):
+        for m in np.unique(months):
+            mask = months == m
+            new = {TIME_COL: t[mask], **{c: v[mask] for c, v in values.items()}}
+            part = base / str(m)
+            old = _read_partition(part)
+            _write_partition(part, _merge(old, new), packed=_sealed(part))
+
+        meta = read_meta(series, symbol, interval)
+        first, last = int(t.min()), int(t.max())
+        if "first_ms" in meta:
+            first = min(first, int(meta["first_ms"]))
+            last = max(last, int(meta["last_ms"]))
+        write_meta(series, symbol, interval, first_ms=first, last_ms=last)
+
+
+def read_frame(series: str,
+               symbol: str,
+               interval: str,
+               start_utc: pd.Timestamp | None = None,
+               end_utc: pd.Timestamp | None = None,
+               columns: list[str] | None = None) -> pd.DataFrame | None:
+    """
+    [start_utc, end_utc] 구간을 읽어 DataFrame 반환 (없으면 None).
+    구간에 걸친 월 파티션의 요청 컬럼만 열고, 각 파티션은 time 범위로 먼저 자름.
+    time은 tz-aware UTC로 변환해서 돌려줌.
+    """
+    s_ms = int(to_ms([start_utc])[0]) if start_utc is not None else None
+    e_ms = int(to_ms([end_utc])[0]) if end_utc is not None else None
+
+    chunks: list[dict[str, np.ndarray]] = []
+    for part in _partitions_between(series, symbol, interval, s_ms, e_ms):
+        cols = _read_partition(part, columns, s_ms, e_ms)
+        if cols is not None and len(cols[TIME_COL]):
+            chunks.append(cols)
+    if not chunks:
+        return None
+
+    names = columns or [c for c in dict.fromkeys(c for ch in chunks for c in ch) if c != TIME_COL]
+    if len(chunks) == 1:
+        merged = chunks[0]
+    else:
+        merged = {c: np.concatenate([ch.get(c, np.full(len(ch[TIME_COL]), np.nan)) for ch in chunks])
+                  for c in [TIME_COL, *names]}
+
+    out = pd.DataFrame({TIME_COL: from_ms(merged[TIME_COL])})
+    for c in names:
+        out[c] = np.asarray(merged[c], dtype=np.float64)
+    return out
+
+
+def read_times(series: str, symbol: str, interval: str,
+               start_ms: int | None = None, end_ms: int | None = None) -> np.ndarray:
+    """저장된 time 컬럼(int64 epoch-ms, 오름차순). start_ms/end_ms가 있으면 그 구간만 (걸친 달 파티션만 읽음)."""
+    parts = []
+    for part in _partitions_between(series, symbol, interval, start_ms, end_ms):
+        cols = _read_partition(part, [], start_ms, end_ms)
+        if cols is not None:
+            parts.append(cols[TIME_COL])
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(parts).astype(np.int64, copy=False)
+
+
+def keys(series: str | None = None) -> list[tuple[str, str, str]]:
+    """저장된 (series, SYMBOL, interval) 목록."""
+    if not STORE_DIR.exists():
+        return []
+    out = []
+    for s_dir in sorted(STORE_DIR.iterdir()):
+        if not s_dir.is_dir() or (series is not None and s_dir.name != series):
+            continue
+        for sym_dir in sorted(p for p in s_dir.iterdir() if p.is_dir()):
+            out += [(s_dir.name, sym_dir.name, iv.name) for iv in sorted(sym_dir.iterdir()) if iv.is_dir()]
+    return out
+
+
+def bounds(series: str, symbol: str, interval: str) -> tuple[int, int] | None:
+    """저장된 첫/마지막 time(epoch-ms). 저장분이 없으면 None."""
+    meta = read_meta(series, symbol, interval)
+    if "first_ms" in meta and "last_ms" in meta:
+        return int(meta["first_ms"]), int(meta["last_ms"])
+
+    parts = _partition_dirs(series, symbol, interval)
+    first = last = None
+    for part in parts:
+        t = _read_column(part, TIME_COL)
+        if t is not None and len(t):
+            first = int(t[0])
+            break
+    for part in reversed(parts):
+        t = _read_column(part, TIME_COL)
+        if t is not None and len(t):
+            last = int(t[-1])
+            break
+    if first is None or last is None:
+        return None
+    return first, last
+
+
+def compact(series: str | None = None) -> int:
+    """봉인된 달 중 아직 .npy 그대로인 파티션을 압축. 압축한 파티션 수 반환."""
+    done = 0
+    for ser, sym, iv in keys(series):
+        for part in _partition_dirs(ser, sym, iv):
+            if not _sealed(part) or not (part / f"{TIME_COL}.npy").exists():
+                continue
+            with _lock(ser, sym, iv):
+                if not (part / f"{TIME_COL}.npy").exists():  # 다른 워커가 먼저 압축함
+                    continue
+                cols = _read_partition(part)
+                if cols is not None:
+                    _write_partition(part, {c: np.array(a) for c, a in cols.items()}, packed=True)
+                    done += 1
+    return done
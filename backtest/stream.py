@@ -0,0 +1,232 @@
+"""
+바이낸스 선물 웹소켓(combined stream) 실시간 수집.
+
+세션마다 REST로 60초 폴링하는 대신 프로세스당 하나의 연결로 최신 상태를 메모리에 유지:
+- <symbol>@kline_<interval>   → 심볼별 캔들 링 버퍼 (마감 봉 + 진행 중인 봉)
+- <symbol>@markPrice@1s       → 심볼별 마크가격/예상 펀딩률 링 버퍼
+마감된 봉은 저장소(futures_klines)에도 이어 붙여 다음 히스토리 조회가 REST를 덜 쓰게 함.
+track()으로 등록한 증분 지표 상태(backtest/incremental.py)는 마감 봉마다 O(1)로 이어 갱신.
+
+전송은 connect(url) → 메시지(str) 이터레이터로 추상화:
+- 기본: websocket-client 패키지 (pip install websocket-client, 선택 의존성)
+- INDICLENS_REPLAY 설정 시: 로컬 스탠드인 피드(backtest/replay.py의 StandInFeed)
+
+사용 예:
+    feed = LiveFeed(["BTCUSDT", "ETHUSDT"], "15m").start()
+    feed.premium("BTCUSDT")     # {"time", "markPrice", "indexPrice", "fundingRate", "nextFundingTime"}
+    feed.klines("BTCUSDT")      # [time, open, high, low, close, volume, closed]
+    feed.track("BTCUSDT", "rsi14", RSIState.from_series(hist["close"], 14), last_ms)
+    feed.indicators("BTCUSDT")  # {"rsi14": 진행 중인 봉까지 반영한 값}
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable
+
+import pandas as pd
+
+from . import store
+from .data import PERIOD_MS
+from .incremental import IndicatorState
+
+try:  # 선택 의존성
+    import websocket
+except ImportError:  # pragma: no cover
+    websocket = None
+
+WS_BASE = "wss://fstream.binance.com/stream"
+KLINE_BUFFER = 500      # 심볼별 보관할 마감 봉 수
+PREMIUM_BUFFER = 300    # 심볼별 보관할 마크가격 이벤트 수 (1초 간격 → 약 5분)
+RECONNECT_MAX_SEC = 30
+
+
+def _ws_messages(url: str, stop: threading.Event) -> Iterable[str]:
+    if websocket is None:
+        raise RuntimeError("실시간 스트림에는 websocket-client 패키지가 필요합니다 (pip install websocket-client)")
+    ws = websocket.create_connection(url, timeout=30)
+    try:
+        while not stop.is_set():
+            yield ws.recv()
+    finally:
+        ws.close()
+
+
+def default_connect() -> Callable[[str, threading.Event], Iterable[str]] | None:
+    """스탠드인이 설치돼 있으면 그 피드, 아니면 websocket-client. 둘 다 없으면 None."""
+    from . import replay
+    if replay.ACTIVE is not None:
+        return replay.StandInFeed(replay.ACTIVE)
+    return _ws_messages if websocket is not None else None
+
+
+class LiveFeed:
+    """
+    심볼 목록의 kline/markPrice 스트림을 백그라운드 스레드에서 소비.
+    - handle(msg): 메시지 1건 반영 (테스트에서 직접 호출 가능)
+    - 끊기면 지수 백오프로 재접속 (바이낸스는 24시간마다 연결을 끊음)
+    """
+
+    def __init__(self, symbols: Iterable[str], interval: str = "15m",
+                 connect: Callable[[str, threading.Event], Iterable[str]] | None = None,
+                 persist: bool = True):
+        self.symbols = [s.upper() for s in symbols]
+        self.interval = interval
+        self.persist = persist
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._closed: dict[str, deque] = {s: deque(maxlen=KLINE_BUFFER) for s in self.symbols}
+        self._open: dict[str, tuple | None] = {s: None for s in self.symbols}
+        self._premium: dict[str, deque] = {s: deque(maxlen=PREMIUM_BUFFER) for s in self.symbols}
+        self._tracked: dict[str, dict[str, list]] = {s: {} for s in self.symbols}  # key → [상태, 마지막 반영 봉 time]
+        self.last_message: float | None = None
+        self.error: str | None = None
+
+    @property
+    def url(self) -> str:
+        streams = []
+        for s in self.symbols:
+            streams += [f"{s.lower()}@kline_{self.interval}", f"{s.lower()}@markPrice@1s"]
+        return f"{WS_BASE}?streams={'/'.join(streams)}"
+
+    # -- 수명 --
+    def start(self) -> "LiveFeed":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="indiclens-livefeed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        connect = self._connect or default_connect()
+        if connect is None:
+            self.error = "websocket-client 미설치"
+            return
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                for raw in connect(self.url, self._stop):
+                    self.handle(raw)
+                    backoff = 1.0
+                    if self._stop.is_set():
+                        break
+            except Exception as e:  # 연결 오류는 기록만 하고 재접속
+                self.error = repr(e)
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, RECONNECT_MAX_SEC)
+
+    # -- 메시지 처리 --
+    def handle(self, raw: str | dict):
+        msg = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+        data = msg.get("data", msg)  # combined stream은 {"stream", "data"}로 감쌈
+        sym = str(data.get("s", "")).upper()
+        if sym not in self._closed:
+            return
+        self.last_message = time.time()
+        event = data.get("e")
+        if event == "kline":
+            self._on_kline(sym, data["k"])
+        elif event == "markPriceUpdate":
+            row = (int(data["E"]), float(data["p"]), float(data.get("i") or "nan"),
+                   float(data.get("r") or "nan"), int(data.get("T") or 0))
+            with self._lock:
+                self._premium[sym].append(row)
+
+    def _on_kline(self, sym: str, k: dict):
+        bar = (int(k["t"]), float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"]))
+        with self._lock:
+            if not k.get("x"):
+                self._open[sym] = bar
+                return
+            buf = self._closed[sym]
+            if buf and buf[-1][0] >= bar[0]:
+                return  # 재접속 직후 중복
+            buf.append(bar)
+            if self._open[sym] is not None and self._open[sym][0] <= bar[0]:
+                self._open[sym] = None
+            self._advance(sym, bar)
+        if self.persist:
+            self._persist(sym, bar)
+
+    def _persist(self, sym: str, bar: tuple):
+        # 저장분 바로 다음 봉일 때만 기록 → 저장소 중간에 구멍이 생기지 않음 (공백은 REST 증분 수집이 채움)
+        period = PERIOD_MS[self.interval]
+        b = store.bounds("futures_klines", sym, self.interval)
+        if b is not None and b[1] + period != bar[0]:
+            return
+        store.write_frame("futures_klines", sym, self.interval, _bars_frame([bar]))
+
+    # -- 증분 지표 --
+    def track(self, symbol: str, key: str, state: IndicatorState, last_ms: int):
+        """last_ms 봉까지 예열된 증분 지표 상태를 등록. 이후 마감 봉마다 종가로 갱신."""
+        with self._lock:
+            self._tracked[symbol.upper()][key] = [state, int(last_ms)]
+
+    def _advance(self, sym: str, bar: tuple):
+        period = PERIOD_MS[self.interval]
+        for key, entry in list(self._tracked[sym].items()):
+            state, last = entry
+            if bar[0] <= last:
+                continue  # 예열 히스토리에 이미 포함된 봉
+            if bar[0] != last + period:
+                del self._tracked[sym][key]  # 봉을 놓침 → 배치 결과와 어긋나므로 버림 (호출자가 다시 예열)
+                continue
+            state.update(bar[4])
+            entry[1] = bar[0]
+
+    def indicators(self, symbol: str, include_open: bool = True) -> dict:
+        """등록된 지표의 현재 값. include_open이면 진행 중인 봉 종가까지 반영 (상태는 그대로)."""
+        sym = symbol.upper()
+        with self._lock:
+            cur = self._open.get(sym)
+            out = {}
+            for key, (state, last) in self._tracked.get(sym, {}).items():
+                if include_open and cur is not None and cur[0] == last + PERIOD_MS[self.interval]:
+                    out[key] = state.peek(cur[4])
+                else:
+                    out[key] = state.value
+        return out
+
+    # -- 조회 --
+    def premium(self, symbol: str) -> dict | None:
+        with self._lock:
+            buf = self._premium.get(symbol.upper())
+            row = buf[-1] if buf else None
+        if row is None:
+            return None
+        keys = ("time", "markPrice", "indexPrice", "fundingRate", "nextFundingTime")
+        return dict(zip(keys, row))
+
+    def premium_history(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            rows = list(self._premium.get(symbol.upper(), ()))
+        df = pd.DataFrame(rows, columns=["time", "markPrice", "indexPrice", "fundingRate", "nextFundingTime"])
+        df["time"] = store.from_ms(df["time"].to_numpy())
+        return df
+
+    def klines(self, symbol: str, include_open: bool = True) -> pd.DataFrame:
+        """링 버퍼 캔들 (마감 봉 + 선택적으로 진행 중인 봉)."""
+        sym = symbol.upper()
+        with self._lock:
+            closed = list(self._closed.get(sym, ()))
+            cur = self._open.get(sym)
+        df = _bars_frame(closed + ([cur] if include_open and cur is not None else []))
+        df["closed"] = [True] * len(closed) + [False] * (len(df) - len(closed))
+        return df
+
+
+def _bars_frame(bars: list[tuple]) -> pd.DataFrame:
+    df = pd.DataFrame(bars, columns=["time", "open", "high", "low", "close", "volume"])
+    df["time"] = store.from_ms(df["time"].to_numpy())
+    return df
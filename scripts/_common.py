@@ -0,0 +1,10 @@
+"""smoke 스크립트 공용 헬퍼 (python -m scripts.<name>으로 실행)."""
+import pandas as pd
+
+from backtest.data import fetch_futures_klines_range
+
+
+def recent_klines(symbol: str, interval: str, n: int) -> pd.DataFrame:
+    """지금부터 거슬러 n봉 분량의 선물 캔들."""
+    end = pd.Timestamp.now(tz="UTC")
+    return fetch_futures_klines_range(symbol, interval, end - n * pd.Timedelta(interval), end)
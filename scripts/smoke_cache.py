@@ -1,18 +1,24 @@
-from backtest.data import fetch_klines
 import time
+import pandas as pd
+from backtest import data as d
+from backtest.cache import save_cache, load_cache
 
 if __name__ == "__main__":
-    print("첫 호출 (API)")
-    df1 = fetch_klines("BTCUSDT", "1h", 50, use_cache=True)
-    print(df1.tail(2))
+    end = pd.Timestamp.now(tz="UTC")
+    start = end - pd.Timedelta(days=30)
 
-    print("\n두번째 호출 (캐시)")
-    df2 = fetch_klines("BTCUSDT", "1h", 50, use_cache=True)
-    print(df2.tail(2))
+    print("첫 호출 (API → 저장소)")
+    t0 = time.time()
+    df1 = d.fetch_futures_klines_range("BTCUSDT", "1h", start, end)
+    print(df1.tail(2), f"\n{time.time() - t0:.3f}s")
+
+    print("\n두번째 호출 (저장소 + 꼬리만 API)")
+    t0 = time.time()
+    df2 = d.fetch_futures_klines_range("BTCUSDT", "1h", start, end)
+    print(df2.tail(2), f"\n{time.time() - t0:.3f}s")
 
     print("\n캐시 TTL 테스트 (1초 TTL)")
-    df3 = fetch_klines("BTCUSDT", "1h", 50, use_cache=True)
+    save_cache(df1, "klines_BTCUSDT_1h")
     time.sleep(2)
-    from backtest.cache import load_cache
-    expired = load_cache("klines_BTCUSDT_1h_50", max_age_sec=1)
+    expired = load_cache("klines_BTCUSDT_1h", max_age_sec=1)
     print("만료 후 캐시 반환:", expired is not None)
@@ -1,11 +1,14 @@
-from backtest.data import fetch_klines, fetch_funding_rate
+import pandas as pd
+from backtest import data as d
 from backtest.correlation import feature_return_lag_corr
 
 if __name__ == "__main__":
-    # 1시간봉 1000개 (약 42일)
-    price = fetch_klines("BTCUSDT", "1h", 1000)
-    # 펀딩비 최근 200개
-    fr = fetch_funding_rate("BTCUSDT", 200)
+    end = pd.Timestamp.now(tz="UTC")
+    start = end - pd.Timedelta(days=42)
+    # 1시간봉 약 1000개
+    price = d.fetch_futures_klines_range("BTCUSDT", "1h", start, end)
+    # 같은 구간 펀딩비
+    fr = d.fetch_funding_rate_range("BTCUSDT", start, end)
 
     res = feature_return_lag_corr(price, fr, feature_col="fundingRate", return_period=1, lags=range(-48, 49))
     print(res.head())
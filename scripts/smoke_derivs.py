@@ -1,28 +1,26 @@
-from backtest.data import (
-    fetch_funding_rate,
-    fetch_open_interest,
-    fetch_global_long_short,
-    fetch_top_traders_long_short,
-    fetch_taker_buy_sell,
-)
+import pandas as pd
+from backtest import data as d
 
 if __name__ == "__main__":
+    end = pd.Timestamp.now(tz="UTC")
+    start = end - pd.Timedelta(hours=20)
+
     print("=== Funding Rate ===")
-    fr = fetch_funding_rate("BTCUSDT", 20)
+    fr = d.fetch_funding_rate_range("BTCUSDT", end - pd.Timedelta(days=7), end)
     print(fr.tail(3))
 
     print("\n=== Open Interest (1h) ===")
-    oi = fetch_open_interest("BTCUSDT", "1h", 20)
+    oi = d.fetch_open_interest_range("BTCUSDT", "1h", start, end)
     print(oi.tail(3))
 
-    print("\n=== Global Long/Short (1h) ===")
-    gls = fetch_global_long_short("BTCUSDT", "1h", 20)
-    print(gls.tail(3))
-
     print("\n=== Top Traders (accounts, 1h) ===")
-    tt_acc = fetch_top_traders_long_short("BTCUSDT", "1h", 20, metric="accounts")
+    tt_acc = d.fetch_top_traders_long_short_range("BTCUSDT", "1h", start, end, metric="accounts")
     print(tt_acc.tail(3))
 
+    print("\n=== Top Traders (positions, 1h) ===")
+    tt_pos = d.fetch_top_traders_long_short_range("BTCUSDT", "1h", start, end, metric="positions")
+    print(tt_pos.tail(3))
+
     print("\n=== Taker Buy/Sell (1h) ===")
-    tbs = fetch_taker_buy_sell("BTCUSDT", "1h", 20)
+    tbs = d.fetch_taker_buy_sell_range("BTCUSDT", "1h", start, end)
     print(tbs.tail(3))
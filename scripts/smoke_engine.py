@@ -1,10 +1,10 @@
-from backtest.data import fetch_klines
 from backtest.signals import evaluate_rule
 from backtest.engine import backtest_long_only
+from scripts._common import recent_klines
 
 
 if __name__ == "__main__":
-    df = fetch_klines("BTCUSDT", "1h", 500)
+    df = recent_klines("BTCUSDT", "1h", 500)
 
     # 단순 전략: EMA12 ↗ EMA26 진입, EMA12 ↘ EMA26 청산
     entry_rule = {
@@ -21,6 +21,6 @@ if __name__ == "__main__":
     entry_sig = evaluate_rule(entry_rule, df)
     exit_sig  = evaluate_rule(exit_rule, df)
 
-    bt = backtest_long_only(df, entry_sig, exit_sig, fee=0.001, slippage=0.001, cooldown=1)
+    bt, trades, _ = backtest_long_only(df, entry_sig, exit_sig, fee=0.001, slippage=0.001, cooldown=1)
     print(bt.tail(10))
     print("최종 자산배율:", bt["equity"].iloc[-1])
@@ -1,6 +1,9 @@
-from backtest.data import fetch_klines
+import pandas as pd
+from backtest import data as d
 
 if __name__ == "__main__":
-    df = fetch_klines("BTCUSDT", "1h", 50)
+    end = pd.Timestamp.now(tz="UTC")
+    start = end - pd.Timedelta(hours=50)
+    df = d.fetch_futures_klines_range("BTCUSDT", "1h", start, end)
     print(df.head())
-    print("rows", len(df))
\ No newline at end of file
+    print("rows", len(df))
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from backtest import sma, ema, rsi, macd, bbands
+from backtest.incremental import SMAState, EMAState, RSIState, MACDState, BBandsState, restore
+from scripts._common import recent_klines
+
+
+def _same(a, b) -> bool:
+    return np.array_equal(np.asarray(a, dtype=float), np.asarray(b, dtype=float), equal_nan=True)
+
+
+if __name__ == '__main__':
+    close = recent_klines("BTCUSDT", "1h", 500)["close"]
+    warm, live = close.iloc[:300], close.iloc[300:]
+
+    cases = {
+        "SMA20": (SMAState(20), sma(close, 20), None),
+        "EMA20": (EMAState(20), ema(close, 20), None),
+        "RSI14": (RSIState(14), rsi(close, 14), None),
+        "MACD": (MACDState(12, 26, 9), macd(close, 12, 26, 9), "hist"),
+        "BB20": (BBandsState(20, 2.0), bbands(close, 20, 2.0), "bb_upper"),
+    }
+    for name, (st, batch, field) in cases.items():
+        for x in warm:
+            st.update(x)
+        st = restore(st.state())  # 체크포인트 왕복
+        out = [st.update(x) for x in live]
+        got = [v[field] for v in out] if field else out
+        want = (batch[field] if field else batch).iloc[300:]
+        print(f"{name:6s} bit-equal={_same(got, want)} last={got[-1]:.4f}")
+
+    # 결측 구간: 관측 뒤 NaN (com == 1인 span=3은 pandas가 결측 뒤 가중치를 따로 계산)
+    gap = pd.Series([1, 2, np.nan, 4, np.nan, np.nan, 6, 5, np.nan, 7], dtype=float)
+    for name, st, batch in [
+        ("EMA3", EMAState(3), ema(gap, 3)),
+        ("EMA5", EMAState(5), ema(gap, 5)),
+        ("SMA3", SMAState(3), sma(gap, 3)),
+        ("RSI2", RSIState(2), rsi(gap, 2)),
+    ]:
+        got = [st.update(x) for x in gap]
+        print(f"{name:6s} NaN gap bit-equal={_same(got, batch)}")
+    st = MACDState(3, 5, 3)
+    got = [st.update(x)["macd"] for x in gap]
+    print(f"MACD   NaN gap bit-equal={_same(got, macd(gap, 3, 5, 3)['macd'])}")
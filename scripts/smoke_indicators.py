@@ -1,8 +1,12 @@
-from backtest.data import fetch_klines
+import numpy as np
+import pandas as pd
 from backtest import sma, ema, rsi, macd, bbands
+from backtest import indicators
+from scripts._common import recent_klines
+
 
 if __name__ == '__main__':
-    df = fetch_klines("BTCUSDT", "1h", 200)
+    df = recent_klines("BTCUSDT", "1h", 200)
     close = df["close"]
 
     df["SMA20"] = sma(close, 20)
@@ -14,3 +18,18 @@ if __name__ == '__main__':
 
     out = df.join(macd_df).join(bb_df)
     print(out.tail(5))
+
+    # 다중 스팬 — 결측 구간 뒤에도 ema()와 비트 단위 일치
+    gap = pd.Series([1, 2, np.nan, 4, np.nan, np.nan, 6], dtype=float)
+    spans = range(2, 300)
+    multi = indicators.ema_multi(gap, spans)
+    batch = pd.concat({sp: ema(gap, sp) for sp in spans}, axis=1)
+    print("ema_multi NaN gap bit-equal:", np.array_equal(multi.to_numpy(), batch.to_numpy(), equal_nan=True))
+
+    # 이동 표준편차 — 1e8 가격 수준에서도 정확한 2패스 계산과 일치 (전체 누적합의 상쇄 오차 점검)
+    high = pd.Series(1e8 + np.cumsum(np.random.default_rng(0).normal(0, 1, 5000)))
+    w = 5
+    win = np.lib.stride_tricks.sliding_window_view(high.to_numpy(), w)
+    exact = np.sqrt(((win - win.mean(axis=1, keepdims=True)) ** 2).mean(axis=1))
+    got = indicators.rolling_std_multi(high, [w])[w].to_numpy()[w - 1:]
+    print("rolling_std_multi @1e8 max rel err:", float(np.max(np.abs(got - exact) / exact)))
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from backtest import resample as rs
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    return len(a) == len(b) and (a["time"].to_numpy() == b["time"].to_numpy()).all() and np.allclose(
+        a.drop(columns="time").to_numpy(float), b.drop(columns="time").to_numpy(float), equal_nan=True)
+
+
+if __name__ == "__main__":
+    now = pd.Timestamp.now(tz="UTC")
+    sym, iv = "BTCUSDT", "1h"
+
+    # 떨어진 두 구간을 먼저 받아 상위 주기 키에 구멍을 만든 뒤, 둘을 덮는 넓은 구간 요청
+    rs.fetch_futures_klines_range(sym, iv, now - pd.Timedelta(days=200), now - pd.Timedelta(days=190))
+    rs.fetch_futures_klines_range(sym, iv, now - pd.Timedelta(days=30), now)
+    start = now - pd.Timedelta(days=60)
+    wide = rs.fetch_futures_klines_range(sym, iv, start, now)
+
+    # 기준 주기(15m)에서 바로 파생한 값과 비교
+    base = rs.fetch_futures_klines_range(sym, rs.BASE_INTERVAL, start.floor(iv), now)
+    native, _ = rs.resample_ohlcv(base, iv)
+    native = native[native["time"] >= start].reset_index(drop=True)
+    print(f"tiered rows={len(wide)} first={wide['time'].iloc[0]}")
+    print(f"native rows={len(native)} first={native['time'].iloc[0]}")
+    print("disjoint → wider bit-equal:", _same(wide, native))
+    print("repeat (stored tier) bit-equal:", _same(rs.fetch_futures_klines_range(sym, iv, start, now), native))
+
+    oi = rs.fetch_open_interest_range(sym, iv, now - pd.Timedelta(days=20), now)
+    print("OI 1h continuous:", bool((oi["time"].diff().dropna() == pd.Timedelta(iv)).all()))
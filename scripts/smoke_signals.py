@@ -1,9 +1,10 @@
 import json
-from backtest.data import fetch_klines
 from backtest.signals import evaluate_rule
+from scripts._common import recent_klines
+
 
 if __name__ == "__main__":
-    df = fetch_klines("BTCUSDT", "1h", 1000)
+    df = recent_klines("BTCUSDT", "1h", 1000)
 
     rule = {
         "op": "crossover",
@@ -8,8 +8,12 @@ import streamlit as st
 _SYMBOLS = ["BTCUSDT", "ETHUSDT"]
 _INTERVALS = ["15m", "1h", "4h", "1d"]
 _PERIOD_OPTIONS = {"1개월": 1, "3개월": 3, "6개월": 6, "12개월": 12}
-# 상관분석 기간(고정) — UI만 셀렉트박스 형태로 노출하되 수정 불가
-_CORR_PERIOD_OPTIONS = {"1개월": 1}
+# 상관분석 기간 — 파생지표는 API가 최근 30일만 주므로, 1개월 초과 구간은
+# backtest.archiver로 로컬 저장소에 쌓인 만큼만 채워짐
+_CORR_PERIOD_OPTIONS = {"1개월": 1, "3개월": 3, "6개월": 6, "12개월": 12}
+# 기본 선택값 (캐시 예열도 이 조합 기준)
+DEFAULT_MONTHS = 3
+DEFAULT_CORR_MONTHS = 1
 
 # 바이낸스 USDⓂ 선물 기본 수수료(대부분 계정의 디폴트)
 #   - 테이커(시장가): 0.04%
@@ -55,18 +59,17 @@ def sidebar_inputs() -> Inputs:
     period_label = st.sidebar.selectbox(
         "백테스트 기간",
         list(_PERIOD_OPTIONS.keys()),
-        index=1,
+        index=list(_PERIOD_OPTIONS.values()).index(DEFAULT_MONTHS),
         help="과거 데이터의 길이. 1~12개월 중 선택.",
     )
     months = _PERIOD_OPTIONS[period_label]
 
-    # 상관분석 기간 — 선택 UI는 있지만 disabled (보기 일관성 목적)
     corr_label = st.sidebar.selectbox(
         "상관분석 기간",
         list(_CORR_PERIOD_OPTIONS.keys()),
-        index=0,
-        disabled=True,
-        help="바이낸스 공개 파생지표 API가 보통 최근 30일만 제공하기 때문에 1개월로 고정.",
+        index=list(_CORR_PERIOD_OPTIONS.values()).index(DEFAULT_CORR_MONTHS),
+        help="바이낸스 파생지표 API는 최근 30일만 제공. 그 이전 구간은 아카이버"
+             "(python -m backtest.archiver)로 로컬에 누적된 만큼만 표시됩니다.",
     )
     corr_months = _CORR_PERIOD_OPTIONS[corr_label]
 
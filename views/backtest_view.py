@@ -8,24 +8,23 @@ import plotly.graph_objects as go
 import streamlit as st
 
 # 사용자 제공 모듈 (IndicLens/backtest/*)
-from backtest import data as d
+from backtest import loaders as ld
 from backtest import signals as sig
 from backtest import engine as eng
 from backtest import evals as ev
 
-from ui.sidebar import Inputs, now_utc
+from ui.sidebar import Inputs
 
-# ── 캐시 설정 ────────────────────────────────────────────────────────────────
-CACHE_TTL_PRICE = 600   # 10분
 
-
-@st.cache_data(show_spinner=False, ttl=CACHE_TTL_PRICE)
+# ── 로드 (마감 봉은 다음 봉 마감까지, 진행 중인 봉은 짧게 캐시) ──────────────────
 def load_price(symbol: str, interval: str, months: int) -> pd.DataFrame:
     """선물 캔들 페치(기간: months). 캐시됨."""
-    end = pd.Timestamp(now_utc())
-    start = end - pd.DateOffset(months=int(months))
-    df = d.fetch_futures_klines_range(symbol, interval, start, end)
-    return df
+    return ld.load_price_1m(symbol, interval, months)
+
+
+def prefetch(symbol: str, interval: str, months: int):
+    """기본 설정의 가격 로더를 미리 호출해 공유 캐시를 채움."""
+    load_price(symbol, interval, months)
 
 
 # ── 룰 빌더 ──────────────────────────────────────────────────────────────────
@@ -245,6 +244,25 @@ def _plot_equity(price_df: pd.DataFrame, curves: dict[str, pd.Series]):
     st.plotly_chart(fig, use_container_width=True)
 
 
+def _compare_sets_ui(price_df: pd.DataFrame, inputs: Inputs, periods_per_year: int):
+    """저장된 조건 세트 전부를 한 배치로 평가해 세트별 성과를 나란히 비교."""
+    sets = st.session_state.condition_sets
+    if len(sets) < 2 or not st.checkbox("📊 모든 조건 세트 성과 비교", value=False):
+        return
+    # entry/exit 2N개 룰을 한 번에 평가 (공통 지표는 배치 전체에서 한 번만 계산)
+    rules = [c["entry"] for c in sets] + [c["exit"] for c in sets]
+    mat = sig.evaluate_matrix(rules, price_df).to_numpy()
+    rows = []
+    for i, c in enumerate(sets):
+        entry = pd.Series(mat[:, i], index=price_df.index)
+        exit_ = pd.Series(mat[:, len(sets) + i], index=price_df.index)
+        bt_df, trades, _ = eng.backtest_long_only(
+            price_df, entry, exit_, fee=inputs.fee, slippage=inputs.slippage, cooldown=0
+        )
+        rows.append({"조건 세트": c["name"], **ev.summarize(bt_df["equity"], trades, periods_per_year)})
+    st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+
 def view(inputs: Inputs):
     _ensure_state()
 
@@ -262,8 +280,8 @@ def view(inputs: Inputs):
     entry_rule, exit_rule = _combine_rules(selected, comb)
 
     # 4) 백테스트 실행
-    entry_sig = sig.evaluate_rule(entry_rule, price_df)
-    exit_sig = sig.evaluate_rule(exit_rule, price_df)
+    # entry/exit를 한 계획으로 컴파일 → 공통 지표/비교는 한 번만 계산
+    entry_sig, exit_sig = sig.evaluate_rules([entry_rule, exit_rule], price_df)
 
     bt_df, trades, trade_log = eng.backtest_long_only(
         price_df, entry_sig, exit_sig, fee=inputs.fee, slippage=inputs.slippage, cooldown=0
@@ -277,6 +295,7 @@ def view(inputs: Inputs):
     summary = ev.summarize(bt_df["equity"], trades, periods_per_year)
     st.markdown("### 📈 성과 요약")
     st.dataframe(pd.DataFrame([summary]), use_container_width=True)
+    _compare_sets_ui(price_df, inputs, periods_per_year)
 
     # 6) 그래프
     _plot_equity(price_df, {"전략": bt_df["equity"], "Buy&Hold": bh})
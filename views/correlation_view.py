@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
 import streamlit as st
 import numpy as np
@@ -8,50 +10,42 @@ import plotly.graph_objects as go
 
 from ui.sidebar import Inputs, now_utc
 from backtest import data as d
+from backtest import resample as rs
 from backtest import correlation as corr
+from backtest import loaders as ld
+from backtest import schedule
+from backtest import stream
+from backtest.shm_cache import shared_cache
 
-# ── 캐시 설정 ────────────────────────────────────────────────────────────────
-CACHE_TTL_PRICE = 600     # 10분
-CACHE_TTL_FEAT  = 600     # 10분
-
-
-def _month_window():
-    end = pd.Timestamp(now_utc())
-    start = end - pd.DateOffset(months=1)
-    return start, end
 
+def prefetch(symbol: str, interval: str, months: int = 1):
+    """view()가 기본 설정에서 부르는 히스토리 로더를 미리 호출해 공유 캐시를 채움."""
+    ld.load_series(symbol, interval, months)
 
-# ── 로드 (캐시) ──────────────────────────────────────────────────────────────
-@st.cache_data(show_spinner=False, ttl=CACHE_TTL_PRICE)
-def load_price_1m(symbol: str, interval: str) -> pd.DataFrame:
-    start, end = _month_window()
-    return d.fetch_futures_klines_range(symbol, interval, start, end)
 
+# ── 라이브(현재값) 전용 로더 ────────────────────────────────────────────────
+# 예상 펀딩률은 프로세스 공용 웹소켓 피드(메모리)에서 우선 읽고, 피드가 없을 때만 REST.
+# OI 스냅샷은 60초 캐시, 최신 버킷 값은 다음 버킷 마감까지 캐시
+LIVE_STALE_SEC = 10   # 피드 마지막 수신이 이보다 오래되면 REST로 대체
 
-@st.cache_data(show_spinner=False, ttl=CACHE_TTL_FEAT)
-def load_funding(symbol: str) -> pd.DataFrame:
-    start, end = _month_window()
-    return d.fetch_funding_rate_range(symbol, start, end)
-
-
-@st.cache_data(show_spinner=False, ttl=CACHE_TTL_FEAT)
-def load_oi(symbol: str, interval: str) -> pd.DataFrame:
-    start, end = _month_window()
-    return d.fetch_open_interest_range(symbol, interval, start, end)
 
+@st.cache_resource(show_spinner=False)
+def _live_feed(symbol: str) -> stream.LiveFeed | None:
+    """심볼당 하나의 스트림을 모든 세션이 공유 (websocket-client가 없으면 None)."""
+    connect = stream.default_connect()
+    if connect is None:
+        return None
+    return stream.LiveFeed([symbol], rs.BASE_INTERVAL, connect=connect).start()
 
-@st.cache_data(show_spinner=False, ttl=CACHE_TTL_FEAT)
-def load_top_ls(symbol: str, interval: str, metric: str) -> pd.DataFrame:
-    start, end = _month_window()
-    return d.fetch_top_traders_long_short_range(symbol, interval, start, end, metric=metric)
 
+def _current_funding_pct(symbol: str) -> float | None:
+    feed = _live_feed(symbol)
+    p = feed.premium(symbol) if feed is not None else None
+    if p is not None and feed.last_message and now_utc().timestamp() - feed.last_message < LIVE_STALE_SEC:
+        return p["fundingRate"] * 100.0
+    return load_live_funding_pct(symbol)
 
-@st.cache_data(show_spinner=False, ttl=CACHE_TTL_FEAT)
-def load_taker_ratio(symbol: str, interval: str) -> pd.DataFrame:
-    start, end = _month_window()
-    return d.fetch_taker_buy_sell_range(symbol, interval, start, end)
 
-# ── 라이브(현재값) 전용 로더 — 60초 캐시 ───────────────────────────────────
 @st.cache_data(show_spinner=False, ttl=60)
 def load_live_funding_pct(symbol: str) -> float | None:
     j = d.fetch_funding_live(symbol)
@@ -61,15 +55,15 @@ def load_live_funding_pct(symbol: str) -> float | None:
 def load_live_oi(symbol: str) -> float | None:
     return d.fetch_open_interest_snapshot(symbol)
 
-@st.cache_data(show_spinner=False, ttl=60)
+@shared_cache(expires=schedule.bar_close("period"))
 def load_latest_top_ls_accounts(symbol: str, period: str = "5m") -> float | None:
     return d.fetch_top_ls_accounts_latest(symbol, period)
 
-@st.cache_data(show_spinner=False, ttl=60)
+@shared_cache(expires=schedule.bar_close("period"))
 def load_latest_top_ls_positions(symbol: str, period: str = "5m") -> float | None:
     return d.fetch_top_ls_positions_latest(symbol, period)
 
-@st.cache_data(show_spinner=False, ttl=60)
+@shared_cache(expires=schedule.bar_close("period"))
 def load_latest_taker_ratio(symbol: str, period: str = "5m") -> float | None:
     return d.fetch_taker_buy_sell_latest(symbol, period)
 
@@ -86,11 +80,14 @@ def _align_asof(price_df: pd.DataFrame, fdf: pd.DataFrame, col: str) -> pd.DataF
     """
     if fdf is None or fdf.empty:
         return pd.DataFrame(columns=["time", "value"]).astype({"time": "datetime64[ns, UTC]", "value": "float64"})
-    idx = price_df[["time"]].sort_values("time")
-    f = fdf[["time", col]].dropna().sort_values("time")
-    out = pd.merge_asof(idx, f, on="time", direction="backward")
-    out.rename(columns={col: "value"}, inplace=True)
-    return out
+    times = price_df["time"]
+    if not times.is_monotonic_increasing:
+        times = times.sort_values(kind="stable")
+    f = fdf[["time", col]].dropna()
+    if not f["time"].is_monotonic_increasing:
+        f = f.sort_values("time", kind="stable")
+    value = corr.asof_values(corr.time_ms(times), corr.time_ms(f["time"]), f[col])
+    return pd.DataFrame({"time": times.reset_index(drop=True), "value": value})
 
 
 def _forward_return(price_df: pd.DataFrame, k: int) -> pd.DataFrame:
@@ -115,8 +112,11 @@ def _quantile_conditional_return(price_df: pd.DataFrame,
 
     # 미래 수익률
     fr = _forward_return(price_df, k)
-    df = price_df[["time"]].merge(feat.rename(columns={"value": "feat"}), on="time", how="left")
-    df = df.merge(fr, on="time", how="left").dropna(subset=["feat", "fwd_ret"])
+    # 가격 축(정렬·유일 time)에 위치로 맞춤 — datetime 키 병합 대신 int64 탐색
+    value = np.full(len(price_df), np.nan)
+    ip, jf = corr.join_indices(corr.time_ms(price_df["time"]), corr.time_ms(feat["time"]))
+    value[ip] = feat["value"].to_numpy()[jf]
+    df = pd.DataFrame({"feat": value, "fwd_ret": fr["fwd_ret"].to_numpy()}).dropna(subset=["feat", "fwd_ret"])
 
     cats = pd.qcut(df["feat"], q=q, duplicates="drop")  # 라벨 지정 X
     codes = cats.cat.codes  # 0..(k-1), 없는 값은 -1
@@ -204,7 +204,7 @@ def _coverage_range(price_df: pd.DataFrame, feats_aligned: dict[str, pd.DataFram
     return cov_start, cov_end
 
 
-def _stacked_chart(price_df: pd.DataFrame, feats_aligned: dict[str, pd.DataFrame]):
+def _stacked_chart(price_df: pd.DataFrame, feats_aligned: dict[str, pd.DataFrame], key: str | None = None):
     cov_start, cov_end = _coverage_range(price_df, feats_aligned)
 
     # 시각화
@@ -254,12 +254,12 @@ def _stacked_chart(price_df: pd.DataFrame, feats_aligned: dict[str, pd.DataFrame
     # Funding 패널은 %로 표시
     fig.update_yaxes(ticksuffix="%", row=2, col=1)
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key=key)
 
 
 
-def _corr_table(price_df: pd.DataFrame, feats: dict[str, pd.DataFrame], interval: str, symbol: str):
-    st.markdown("### 🔗 상관관계 분석 (1개월)")
+def _corr_table(price_df: pd.DataFrame, feats: dict[str, pd.DataFrame], interval: str, symbol: str, months: int = 1):
+    st.markdown(f"### 🔗 상관관계 분석 ({months}개월)")
     lags = list(range(-24, 25))  # ±24 스텝
 
     def _one(name: str, fdf: pd.DataFrame, col: str):
@@ -276,9 +276,9 @@ def _corr_table(price_df: pd.DataFrame, feats: dict[str, pd.DataFrame], interval
         row0 = df[df["lag"] == 0].iloc[0]
         k_max = df.loc[df["pearson"].abs().idxmax()]
         cur_val = float(tmp[name].dropna().iloc[-1])
-        # 'current' 칸만 60s 캐시된 라이브 값 우선 사용
+        # 'current' 칸만 라이브 값(피드/캐시) 우선 사용
         if name == "fundingRate":
-            live = load_live_funding_pct(symbol)
+            live = _current_funding_pct(symbol)
             current_out = f"{live:.4f}%" if live is not None else f"{cur_val*100.0:.4f}%"
         elif name == "openInterest":
             live = load_live_oi(symbol)
@@ -421,14 +421,9 @@ def _event_indices_from_times(price_df: pd.DataFrame, event_times: pd.Series, L:
     """event_times(UTC)을 가격 그리드 인덱스로 매핑. 좌/우 L 스텝 범위가 넘치는 이벤트는 제외."""
     if event_times is None or len(event_times) == 0:
         return []
-    times = price_df["time"].to_numpy()
-    idxs: list[int] = []
-    for t in pd.to_datetime(event_times).to_numpy():
-        i = int(np.searchsorted(times, t, side="left"))
-        if i - L < 0 or i + L >= len(times):
-            continue
-        idxs.append(i)
-    return idxs
+    times = corr.time_ms(price_df["time"])
+    i = np.searchsorted(times, corr.time_ms(event_times), side="left")
+    return i[(i - L >= 0) & (i + L < len(times))].tolist()
 
 
 def _cumret_window(logp: np.ndarray, center: int, L: int) -> np.ndarray | None:
@@ -867,35 +862,61 @@ def _quick_signal_tester_ui(price_df: pd.DataFrame, feats_raw: dict[str, pd.Data
 
 
 
+# ── 병렬 로드 ───────────────────────────────────────────────────────────────
+# 여섯 시리즈를 동시에 받아 콜드 탭 지연을 "합"이 아닌 "가장 느린 하나"로 줄이고,
+# 도착하는 대로 스택 차트를 다시 그림 (로더는 shared_cache라 스레드에서 호출해도 안전)
+_FEATURE_COLS = {
+    "funding": "fundingRate",
+    "oi": "openInterest",
+    "top_acc": "longShortRatio",
+    "top_pos": "longShortRatio",
+    "taker_ratio": "buySellRatio",
+}
+_SERIES_LABELS = {"price": "가격", "funding": "펀딩", "oi": "OI", "top_acc": "탑 L/S(계정)",
+                  "top_pos": "탑 L/S(포지션)", "taker_ratio": "테이커"}
+
+
+def _align_all(price_df: pd.DataFrame, feats_raw: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """가격 타임스탬프에 asof로 정렬한 버전(시각화/상관 모두 동일 축 사용). 아직 안 온 시리즈는 제외."""
+    out = {k: _align_asof(price_df, feats_raw[k], col) for k, col in _FEATURE_COLS.items() if k in feats_raw}
+    # Funding은 시각화용으로 % 단위로 변환 (거래소 표기와 일치)
+    if out.get("funding") is not None and not out["funding"].empty:
+        out["funding"]["value"] = out["funding"]["value"] * 100
+    return out
+
+
 def view(inputs: Inputs):
-    st.subheader("📊 가격 & 파생지표 스택 차트 (1개월)")
-    price_df = load_price_1m(inputs.symbol, inputs.interval)
-
-    # 원본 로드
-    feats_raw = {
-        "funding": load_funding(inputs.symbol),
-        "oi": load_oi(inputs.symbol, inputs.interval),
-        "top_acc": load_top_ls(inputs.symbol, inputs.interval, metric="accounts"),
-        "top_pos": load_top_ls(inputs.symbol, inputs.interval, metric="positions"),
-        "taker_ratio": load_taker_ratio(inputs.symbol, inputs.interval),
-    }
+    months = inputs.corr_months
+    st.subheader(f"📊 가격 & 파생지표 스택 차트 ({months}개월)")
+    status = st.empty()
+    chart = st.empty()
+
+    # 원본 로드 (동시) — 가격이 오면 차트를 그리고, 파생 시리즈가 도착할 때마다 다시 그림
+    price_df: pd.DataFrame | None = None
+    feats_raw: dict[str, pd.DataFrame] = {}
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        futures = ld.submit_loads(ex, inputs.symbol, inputs.interval, months)
+        pending = set(futures.values())
+        for n, fut in enumerate(as_completed(futures), 1):
+            name = futures[fut]
+            pending.discard(name)
+            if name == "price":
+                price_df = fut.result()
+            else:
+                feats_raw[name] = fut.result()
+            if pending:
+                status.caption(f"불러오는 중 ({n}/{len(futures)}): " + ", ".join(_SERIES_LABELS[k] for k in pending))
+            if price_df is not None and not price_df.empty and pending:
+                with chart.container():
+                    _stacked_chart(price_df, _align_all(price_df, feats_raw), key=f"corr_stack_{n}")
+    status.empty()
 
     if price_df.empty:
+        chart.empty()
         st.error("가격 데이터가 없습니다.")
         return
 
-    # 가격 타임스탬프에 asof로 정렬한 버전(시각화/상관 모두 동일 축 사용)
-    feats_aligned = {
-        "funding": _align_asof(price_df, feats_raw.get("funding"), "fundingRate"),
-        "oi": _align_asof(price_df, feats_raw.get("oi"), "openInterest"),
-        "top_acc": _align_asof(price_df, feats_raw.get("top_acc"), "longShortRatio"),
-        "top_pos": _align_asof(price_df, feats_raw.get("top_pos"), "longShortRatio"),
-        "taker_ratio": _align_asof(price_df, feats_raw.get("taker_ratio"), "buySellRatio"),
-    }
-
-    # Funding은 시각화용으로 % 단위로 변환 (거래소 표기와 일치)
-    if feats_aligned["funding"] is not None and not feats_aligned["funding"].empty:
-        feats_aligned["funding"]["value"] = feats_aligned["funding"]["value"] * 100
+    feats_aligned = _align_all(price_df, feats_raw)
 
     # 지표 설명 도움말
     with st.expander("ℹ️ 지표 설명"):
@@ -933,9 +954,10 @@ def view(inputs: Inputs):
             _row(k, v)
         st.dataframe(pd.DataFrame(rows), use_container_width=True)
 
-    _stacked_chart(price_df, feats_aligned)
+    with chart.container():
+        _stacked_chart(price_df, feats_aligned, key="corr_stack")
     # 상관은 원본을 align해서 계산
-    _corr_table(price_df, feats_raw, inputs.interval, inputs.symbol)
+    _corr_table(price_df, feats_raw, inputs.interval, inputs.symbol, months)
 
     _quantile_analysis_ui(price_df, feats_raw, inputs.interval)
 